@@ -0,0 +1,76 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the per-step setup overhead of agents and bound LLMs.
+
+"before" compiles the react agent, binds the coordinator tools and builds the
+planner structured output on every call, "after" goes through the caches of
+create_agent, get_llm_with_tools and get_llm_with_structured_output. No LLM is
+called, the model only needs to be constructible.
+
+Usage:
+    uv run python -m benchmarks.agent_setup_benchmark --iterations 200
+"""
+
+import argparse
+import time
+
+from langchain_openai import ChatOpenAI
+
+from src.agents import create_agent
+from src.agents.agents import _build_agent
+from src.graph.nodes import handoff_to_planner
+from src.llms.llm import (
+    _llm_cache,
+    get_llm_with_structured_output,
+    get_llm_with_tools,
+)
+from src.prompts.planner_model import Plan
+from src.tools import crawl_tool, python_repl_tool
+
+
+def _measure(iterations: int, setup) -> float:
+    setup()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        setup()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    llm = ChatOpenAI(model="gpt-4o", api_key="benchmark")
+    for llm_type in ("basic", "reasoning", "vision"):
+        _llm_cache[llm_type] = llm
+    tools = [crawl_tool, python_repl_tool]
+
+    cases = {
+        "researcher agent": (
+            lambda: _build_agent("researcher", "researcher", tools, "researcher"),
+            lambda: create_agent("researcher", "researcher", tools, "researcher"),
+        ),
+        "coordinator bind_tools": (
+            lambda: llm.bind_tools([handoff_to_planner]),
+            lambda: get_llm_with_tools("basic", [handoff_to_planner]),
+        ),
+        "planner structured output": (
+            lambda: llm.with_structured_output(Plan, method="json_mode"),
+            lambda: get_llm_with_structured_output("basic", Plan, method="json_mode"),
+        ),
+    }
+    print(f"{'setup':<28} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name, (before, after) in cases.items():
+        before_ms = _measure(args.iterations, before)
+        after_ms = _measure(args.iterations, after)
+        print(
+            f"{name:<28} {before_ms:>10.3f} {after_ms:>10.3f} "
+            f"{before_ms / after_ms:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the checkpoint bytes written by a simulated research run.
+
+"before" returns the whole observation list from every step and stores it
+with MemorySaver, "after" returns only the new observation through the
+append-only reducer and stores it with DeltaMemorySaver.
+
+Usage:
+    uv run python -m benchmarks.checkpoint_size_benchmark --steps 5 10 20
+"""
+
+import argparse
+from typing import Annotated
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from src.graph.checkpointer import DeltaMemorySaver
+from src.graph.types import append_list
+
+
+class BeforeState(MessagesState):
+    observations: list[str]
+
+
+class AfterState(MessagesState):
+    observations: Annotated[list[str], append_list]
+
+
+def _finding(step: int, size: int) -> str:
+    return f"## Finding {step}\n\n" + "lorem ipsum " * (size // 12)
+
+
+def build_graph(delta: bool, steps: int, size: int):
+    def make_step(step: int):
+        def run(state):
+            finding = _finding(step, size)
+            return {
+                "messages": [HumanMessage(content=finding, name="researcher")],
+                "observations": (
+                    [finding] if delta else state["observations"] + [finding]
+                ),
+            }
+
+        return run
+
+    builder = StateGraph(AfterState if delta else BeforeState)
+    previous = START
+    for step in range(steps):
+        builder.add_node(f"step_{step}", make_step(step))
+        builder.add_edge(previous, f"step_{step}")
+        previous = f"step_{step}"
+    builder.add_edge(previous, END)
+    return builder.compile(checkpointer=DeltaMemorySaver() if delta else MemorySaver())
+
+
+def bytes_written(saver: MemorySaver) -> int:
+    total = sum(len(blob[1]) for blob in saver.blobs.values())
+    for namespaces in saver.storage.values():
+        for checkpoints in namespaces.values():
+            for checkpoint, metadata, _ in checkpoints.values():
+                total += len(checkpoint[1]) + len(metadata[1])
+    for writes in saver.writes.values():
+        total += sum(len(write[2][1]) for write in writes.values())
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--finding-size", type=int, default=4000)
+    args = parser.parse_args()
+
+    config = {"configurable": {"thread_id": "benchmark"}}
+    print(f"{'steps':>5} {'before':>12} {'after':>12} {'ratio':>7}")
+    for steps in args.steps:
+        sizes = []
+        for delta in (False, True):
+            graph = build_graph(delta, steps, args.finding_size)
+            graph.invoke({"messages": [], "observations": []}, config)
+            sizes.append(bytes_written(graph.checkpointer))
+        print(
+            f"{steps:>5} {sizes[0]:>12,} {sizes[1]:>12,} {sizes[0] / sizes[1]:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
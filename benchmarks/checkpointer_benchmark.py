@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Compare checkpoint write and read latency of MemorySaver and SQLiteSaver.
+
+Usage:
+    uv run python -m benchmarks.checkpointer_benchmark --threads 200 --steps 10
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.graph.checkpointer import SQLiteSaver
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    return sorted(samples)[min(int(len(samples) * q), len(samples) - 1)]
+
+
+def run(saver, threads: int, steps: int, payload_size: int) -> dict[str, list[float]]:
+    """Write ``steps`` checkpoints for every thread, then read the latest ones."""
+    writes, reads = [], []
+    payload = "x" * payload_size
+    for t in range(threads):
+        config = {"configurable": {"thread_id": f"thread-{t}", "checkpoint_ns": ""}}
+        checkpoint = empty_checkpoint()
+        version = None
+        for step in range(steps):
+            version = saver.get_next_version(version, None)
+            checkpoint = {
+                **checkpoint,
+                "id": f"{step:08}-{t:08}",
+                "channel_values": {"observations": [payload] * (step + 1)},
+                "channel_versions": {"observations": version},
+            }
+            start = time.perf_counter()
+            config = saver.put(
+                config,
+                checkpoint,
+                {"source": "loop", "step": step, "writes": {}},
+                {"observations": version},
+            )
+            writes.append(time.perf_counter() - start)
+    for t in range(threads):
+        start = time.perf_counter()
+        saver.get_tuple({"configurable": {"thread_id": f"thread-{t}"}})
+        reads.append(time.perf_counter() - start)
+    return {"write": writes, "read": reads}
+
+
+def report(name: str, results: dict[str, list[float]]) -> None:
+    for op, samples in results.items():
+        print(
+            f"{name:<12} {op:<6} p50={_percentile(samples, 0.5) * 1e6:8.1f}us"
+            f" p95={_percentile(samples, 0.95) * 1e6:8.1f}us"
+            f" mean={statistics.mean(samples) * 1e6:8.1f}us"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--payload-size", type=int, default=2048)
+    args = parser.parse_args()
+
+    report("memory", run(MemorySaver(), args.threads, args.steps, args.payload_size))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with SQLiteSaver(os.path.join(tmp_dir, "checkpoints.sqlite")) as saver:
+            report("sqlite", run(saver, args.threads, args.steps, args.payload_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure article extraction throughput over a corpus of saved HTML pages.
+
+"inline" extracts and converts every page in the event loop, as the async
+crawl path did before. "pool" goes through ReadabilityExtractor.aextract_article,
+i.e. the simple-page fast path and the worker processes. Besides pages per
+second, the longest stall of the event loop is reported, which is what
+concurrent research threads feel. Without --corpus, a synthetic corpus of
+simple and cluttered pages is generated.
+
+Usage:
+    uv run python -m benchmarks.extraction_benchmark --corpus ./saved_pages --workers 4
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import random
+import time
+
+from markdownify import markdownify as md
+from readabilipy import simple_json_from_html_string
+
+from src.crawler import extraction_pool, readability_extractor
+from src.crawler.extraction_pool import ExtractionPool
+from src.crawler.readability_extractor import ReadabilityExtractor
+
+WORDS = (
+    "research agents crawl pages extract readable articles convert them to "
+    "markdown and summarize the findings for the final report"
+).split()
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return "".join(
+        f"<p>{' '.join(rng.choices(WORDS, k=60))}.</p>" for _ in range(count)
+    )
+
+
+def generate_corpus(pages: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(pages):
+        navigation = "".join(f"<li><a href='/{j}'>Link {j}</a></li>" for j in range(50))
+        if i % 2:
+            body = f"<article><h1>Page {i}</h1>{_paragraphs(rng, 80)}</article>"
+        else:
+            body = "".join(
+                f"<div class='block'><h2>Section {j}</h2>{_paragraphs(rng, 8)}</div>"
+                for j in range(10)
+            )
+        corpus.append(
+            f"<html><head><title>Page {i}</title><script>var x = 1;</script></head>"
+            f"<body><nav><ul>{navigation}</ul></nav>{body}"
+            f"<aside>{_paragraphs(rng, 2)}</aside><footer>Footer</footer></body></html>"
+        )
+    return corpus
+
+
+def load_corpus(directory: str) -> list[str]:
+    corpus = []
+    for path in sorted(
+        glob.glob(os.path.join(directory, "**", "*.htm*"), recursive=True)
+    ):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            corpus.append(f.read())
+    return corpus
+
+
+async def _run(corpus: list[str], extract) -> tuple[float, float]:
+    """Extract the corpus concurrently, return the seconds taken and the longest loop stall."""
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal stall
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - start - 0.005)
+
+    monitor = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(extract(html) for html in corpus))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await monitor
+    return elapsed, stall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument(
+        "--pages", type=int, default=40, help="size of the synthetic corpus"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--no-readability-js",
+        action="store_true",
+        help="use the Python readabilipy mode instead of the Node.js readability.js",
+    )
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else generate_corpus(args.pages)
+    use_readability = not args.no_readability_js
+    megabytes = sum(len(html) for html in corpus) / 1024 / 1024
+    print(f"{len(corpus)} pages, {megabytes:.1f} MB, {args.workers} workers")
+
+    async def inline(html: str):
+        article = simple_json_from_html_string(html, use_readability=use_readability)
+        md(article.get("content") or "")
+
+    pool = ExtractionPool(max_workers=args.workers, use_readability=use_readability)
+    extraction_pool._extraction_pool = pool
+    readability_extractor.CRAWLER_READABILITY_JS = use_readability
+
+    async def pooled(html: str):
+        article = await ReadabilityExtractor().aextract_article(html)
+        article.to_markdown()
+
+    # start the workers before measuring
+    asyncio.run(pool.extract(corpus[0]))
+    print(f"{'mode':<8} {'seconds':>8} {'pages/s':>8} {'max loop stall ms':>18}")
+    try:
+        for name, extract in (("inline", inline), ("pool", pooled)):
+            elapsed, stall = asyncio.run(_run(corpus, extract))
+            print(
+                f"{name:<8} {elapsed:>8.2f} {len(corpus) / elapsed:>8.1f} "
+                f"{stall * 1000:>18.0f}"
+            )
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
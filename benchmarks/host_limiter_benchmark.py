@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure sustained crawl throughput against a throttling origin.
+
+The simulated origin serves --origin-rate requests per second and answers
+429 beyond that. Clients that keep coming while throttled are banned for
+--ban-seconds, as many sites do. "unlimited" sends every crawl at once and
+retries failed ones after a second, "limited" goes through the HostLimiter
+transport with the same number of concurrent crawls.
+
+Usage:
+    uv run python -m benchmarks.host_limiter_benchmark --crawls 100 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from src.crawler.host_limiter import HostLimiter
+from src.crawler.http_client import AsyncLimitedTransport
+
+
+class ThrottlingOrigin:
+    def __init__(self, rate: float, ban_seconds: float, latency: float):
+        self.rate = rate
+        self.ban_seconds = ban_seconds
+        self.latency = latency
+        self.tokens = rate
+        self.refilled = time.monotonic()
+        self.banned_until = 0.0
+        self.strikes = 0
+        self.throttled = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        if now < self.banned_until:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": "1"})
+        if self.tokens < 1:
+            self.throttled += 1
+            self.strikes += 1
+            if self.strikes > 10:
+                self.banned_until = now + self.ban_seconds
+                self.strikes = 0
+            return httpx.Response(429, headers={"Retry-After": "1"})
+        self.tokens -= 1
+        self.strikes = 0
+        return httpx.Response(200, text="page")
+
+
+async def _run(
+    client: httpx.AsyncClient, crawls: int, concurrency: int, retry: bool
+) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def crawl(i: int):
+        nonlocal done
+        async with semaphore:
+            while True:
+                response = await client.get(f"https://origin.test/{i}")
+                if response.is_success:
+                    done += 1
+                    return
+                if not retry:
+                    return
+                await asyncio.sleep(1)
+
+    await asyncio.gather(*(crawl(i) for i in range(crawls)))
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--crawls", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--origin-rate", type=float, default=5)
+    parser.add_argument("--ban-seconds", type=float, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{args.crawls} crawls of one host, {args.concurrency} at a time")
+    print(f"{'mode':<10} {'seconds':>8} {'pages/s':>8} {'429s':>6}")
+    for mode in ("unlimited", "limited"):
+        origin = ThrottlingOrigin(args.origin_rate, args.ban_seconds, args.latency)
+        transport = httpx.MockTransport(origin.handle)
+        if mode == "limited":
+            limiter = HostLimiter(
+                host_concurrency=args.concurrency,
+                host_rate=args.origin_rate,
+                host_burst=1,
+                host_limits={},
+                queue_timeout=600,
+            )
+            transport = AsyncLimitedTransport(transport, limiter, max_retries=5)
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await _run(client, args.crawls, args.concurrency, retry=True)
+
+        start = time.perf_counter()
+        done = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:<10} {elapsed:>8.1f} {done / elapsed:>8.1f} {origin.throttled:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
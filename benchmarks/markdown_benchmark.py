@@ -0,0 +1,76 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Compare markdownify with the single-pass MarkdownConverter on article HTML.
+
+"to_markdown" converts each page to Markdown. "to_message" also splits the
+Markdown into text and image blocks, which took a regex pass over the
+markdownify output and comes out of the same traversal with the converter.
+Without --corpus, a synthetic corpus of long articles is generated.
+
+Usage:
+    uv run python -m benchmarks.markdown_benchmark --corpus ./saved_pages --repeat 3
+"""
+
+import argparse
+import re
+import time
+
+from markdownify import markdownify as md
+
+from benchmarks.extraction_benchmark import generate_corpus, load_corpus
+from src.crawler.article import Article
+
+IMAGE_PATTERN = r"!\[.*?\]\((.*?)\)"
+
+
+def markdownify_message(html: str) -> list[str]:
+    return re.split(IMAGE_PATTERN, md(html))
+
+
+def converter_message(html: str) -> list[dict]:
+    article = Article("Title", html)
+    article.url = "https://example.com/"
+    return article.to_message()
+
+
+def _measure(corpus: list[str], convert, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in corpus:
+            convert(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument(
+        "--pages", type=int, default=40, help="size of the synthetic corpus"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else generate_corpus(args.pages)
+    # articles come with images in between their paragraphs
+    corpus = [
+        html.replace("</p><p>", "</p><img src='figure.png'><p>", 5) for html in corpus
+    ]
+    megabytes = sum(len(html) for html in corpus) / 1024 / 1024
+    print(f"{len(corpus)} pages, {megabytes:.1f} MB, best of {args.repeat}")
+
+    print(f"{'task':<12} {'markdownify s':>14} {'converter s':>12} {'speedup':>8}")
+    for name, baseline, converter in (
+        ("to_markdown", md, lambda html: Article("Title", html).to_markdown()),
+        ("to_message", markdownify_message, converter_message),
+    ):
+        before = _measure(corpus, baseline, args.repeat)
+        after = _measure(corpus, converter, args.repeat)
+        print(f"{name:<12} {before:>14.2f} {after:>12.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
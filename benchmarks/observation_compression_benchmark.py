@@ -0,0 +1,70 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the extractive compression of reporter observations.
+
+The reports in examples/ stand in for the observations of a research run.
+For every budget the benchmark prints the tokens kept, the compression
+latency, the share of the distinctive terms of each report that survive and
+whether two runs produce the same output.
+
+Usage:
+    uv run python -m benchmarks.observation_compression_benchmark --budgets 2000 4000 8000
+"""
+
+import argparse
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+
+from src.utils.compressor import compress_texts
+from src.utils.text_utils import estimate_tokens, tokenize_words
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _key_terms(document: str, others: list[str], top: int = 30) -> set[str]:
+    """Return the terms that are frequent in a document but rare in the others."""
+    counts = Counter(tokenize_words(document))
+    elsewhere = Counter(word for other in others for word in set(tokenize_words(other)))
+    ranked = sorted(counts, key=lambda w: (-counts[w] / (1 + elsewhere[w]), w))
+    return set(ranked[:top])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budgets", type=int, nargs="+", default=[2000, 4000, 8000])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = sorted(EXAMPLES_DIR.glob("*.md"))
+    documents = [path.read_text(encoding="utf-8") for path in paths]
+    total_tokens = sum(estimate_tokens(document) for document in documents)
+    key_terms = [
+        _key_terms(document, documents[:i] + documents[i + 1 :])
+        for i, document in enumerate(documents)
+    ]
+    print(f"{len(documents)} reports, {total_tokens} tokens")
+    print(f"{'budget':>8} {'tokens':>8} {'ratio':>7} {'p50 ms':>8} {'terms':>7} stable")
+    for budget in args.budgets:
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            compressed = compress_texts(documents, budget)
+            timings.append((time.perf_counter() - start) * 1000)
+        tokens = sum(estimate_tokens(document) for document in compressed)
+        coverage = statistics.mean(
+            len(terms & set(tokenize_words(document))) / len(terms)
+            for terms, document in zip(key_terms, compressed)
+        )
+        stable = compressed == compress_texts(documents, budget)
+        print(
+            f"{budget:>8} {tokens:>8} {tokens / total_tokens:>7.1%} "
+            f"{statistics.median(timings):>8.1f} {coverage:>7.1%} {stable}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the latency of repeated Tavily searches with and without pooled sessions.
+
+A local search API answers after --latency-ms, and adds --handshake-ms to
+the first request of every connection, standing in for the DNS lookup, TCP
+and TLS handshakes of a remote API. "per-request" opens a session for every
+search, as the Tavily wrapper did before, "pooled" goes through the wrapper
+and its keep-alive sessions. Searches run --concurrency at a time.
+
+Usage:
+    uv run python -m benchmarks.search_session_benchmark --searches 200 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import requests
+
+from src.tools.tavily_search import http_session, tavily_search_api_wrapper
+from src.tools.tavily_search.tavily_search_api_wrapper import (
+    EnhancedTavilySearchAPIWrapper,
+)
+
+
+def _serve(latency: float, handshake: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # headers and body are sent apart, which Nagle would delay
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            # the handler lives as long as its connection
+            time.sleep(handshake)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(latency)
+            body = json.dumps({"results": [], "images": []}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentiles(latencies: list[float]) -> tuple[float, float]:
+    quantiles = statistics.quantiles(latencies, n=20)
+    return statistics.median(latencies) * 1000, quantiles[18] * 1000
+
+
+def _run_sync(search, searches: int, concurrency: int) -> list[float]:
+    def timed(i: int) -> float:
+        start = time.perf_counter()
+        search(f"query {i}")
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(timed, range(searches)))
+
+
+async def _run_async(search, searches: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(i: int) -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            await search(f"query {i}")
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(timed(i) for i in range(searches)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=60)
+    args = parser.parse_args()
+
+    server = _serve(args.latency_ms / 1000, args.handshake_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_port}"
+    tavily_search_api_wrapper.TAVILY_API_URL = url
+    os.environ.setdefault("TAVILY_API_KEY", "tvly-benchmark")
+    wrapper = EnhancedTavilySearchAPIWrapper()
+
+    def search_per_request(query: str) -> dict:
+        response = requests.post(f"{url}/search", json={"query": query})
+        response.raise_for_status()
+        return response.json()
+
+    async def asearch_per_request(query: str) -> dict:
+        async with aiohttp.ClientSession(trust_env=True) as session:
+            async with session.post(f"{url}/search", json={"query": query}) as res:
+                return json.loads(await res.text())
+
+    async def run_async(search) -> list[float]:
+        try:
+            return await _run_async(search, args.searches, args.concurrency)
+        finally:
+            await http_session.close_sessions()
+
+    print(f"{args.searches} searches, {args.concurrency} at a time")
+    print(f"{'path':<6} {'session':<12} {'p50 ms':>8} {'p95 ms':>8}")
+    runs = [
+        ("sync", "per-request", lambda: _run_sync(search_per_request, args.searches, args.concurrency)),
+        ("sync", "pooled", lambda: _run_sync(wrapper.raw_results, args.searches, args.concurrency)),
+        ("async", "per-request", lambda: asyncio.run(run_async(asearch_per_request))),
+        ("async", "pooled", lambda: asyncio.run(run_async(wrapper.raw_results_async))),
+    ]  # fmt: skip
+    for path, session, run in runs:
+        p50, p95 = _percentiles(run())
+        print(f"{path:<6} {session:<12} {p50:>8.1f} {p95:>8.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .agents import create_agent
+from .agents import clear_agent_cache, create_agent, release_agents
 
-__all__ = ["create_agent"]
+__all__ = ["create_agent", "release_agents", "clear_agent_cache"]
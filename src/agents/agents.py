@@ -1,19 +1,83 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import logging
+import threading
+from collections import OrderedDict
+
 from langgraph.prebuilt import create_react_agent
 
 from src.prompts import apply_prompt_template
-from src.llms.llm import get_llm_by_type
+from src.llms.llm import get_llm_by_type, get_tool_set_signature
 from src.config.agents import AGENT_LLM_MAP
 
+logger = logging.getLogger(__name__)
 
-# Create agents using configured LLM types
-def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template: str):
-    """Factory function to create agents with consistent configuration."""
+# Cache for compiled agents, keyed by agent, LLM and tool-set signature
+_agent_cache: OrderedDict[tuple, tuple[tuple, object]] = OrderedDict()
+_agent_cache_lock = threading.Lock()
+_AGENT_CACHE_SIZE = 32
+
+
+def _build_agent(agent_name: str, agent_type: str, tools: list, prompt_template: str):
     return create_react_agent(
         name=agent_name,
         model=get_llm_by_type(AGENT_LLM_MAP[agent_type]),
         tools=tools,
         prompt=lambda state: apply_prompt_template(prompt_template, state),
     )
+
+
+# Create agents using configured LLM types
+def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template: str):
+    """Factory function to create agents with consistent configuration.
+
+    Compiled agents are cached and reused by later steps with the same agent,
+    LLM and tool set. Tools are part of the key by identity, so a changed tool
+    set, e.g. a new tool list of an MCP server, builds a new agent.
+    """
+    llm_type = AGENT_LLM_MAP[agent_type]
+    llm = get_llm_by_type(llm_type)
+    key = (
+        agent_name,
+        agent_type,
+        prompt_template,
+        llm_type,
+        id(llm),
+        get_tool_set_signature(tools),
+    )
+    with _agent_cache_lock:
+        if key in _agent_cache:
+            _agent_cache.move_to_end(key)
+            return _agent_cache[key][1]
+
+    agent = _build_agent(agent_name, agent_type, tools, prompt_template)
+    with _agent_cache_lock:
+        # the tools and the LLM are kept alive so their ids are not reused
+        _agent_cache[key] = ((llm, *tools), agent)
+        if len(_agent_cache) > _AGENT_CACHE_SIZE:
+            _agent_cache.popitem(last=False)
+    logger.debug(f"Compiled agent {agent_name} with {len(tools)} tools")
+    return agent
+
+
+def release_agents(tools: list) -> None:
+    """Drop the cached agents that use any of the tools.
+
+    Called when the tools are replaced or stop working, e.g. when an MCP
+    server of the session pool changes its tool list or the pool is closed.
+    """
+    released = {id(tool) for tool in tools}
+    with _agent_cache_lock:
+        for key in [
+            key
+            for key, (pinned, _) in _agent_cache.items()
+            if any(id(obj) in released for obj in pinned[1:])
+        ]:
+            del _agent_cache[key]
+
+
+def clear_agent_cache() -> None:
+    """Drop all cached agents."""
+    with _agent_cache_lock:
+        _agent_cache.clear()
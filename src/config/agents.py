@@ -19,3 +19,10 @@ AGENT_LLM_MAP: dict[str, LLMType] = {
     "prose_writer": "basic",
     "prompt_enhancer": "basic",
 }
+
+# Token budget of the existing research findings passed to the agent of a step
+AGENT_CONTEXT_BUDGET: dict[str, int] = {
+    "researcher": 4000,
+    "coder": 6000,
+    "image_generator": 1000,
+}
@@ -0,0 +1,37 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import enum
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class CheckpointerBackend(enum.Enum):
+    MEMORY = "memory"
+    BOUNDED_MEMORY = "bounded_memory"
+    SQLITE = "sqlite"
+
+
+# Checkpointer configuration
+SELECTED_CHECKPOINTER = os.getenv("CHECKPOINTER", CheckpointerBackend.MEMORY.value)
+SQLITE_CHECKPOINTER_PATH = os.getenv("SQLITE_CHECKPOINTER_PATH", "checkpoints.sqlite")
+# Keep only the latest N checkpoints of every thread, 0 keeps all of them
+CHECKPOINTER_MAX_CHECKPOINTS_PER_THREAD = int(
+    os.getenv("CHECKPOINTER_MAX_CHECKPOINTS_PER_THREAD", "20")
+)
+# Drop threads that have not been updated for this many seconds, 0 disables it
+CHECKPOINTER_THREAD_TTL_SECONDS = int(
+    os.getenv("CHECKPOINTER_THREAD_TTL_SECONDS", str(7 * 24 * 3600))
+)
+# Bounded in-memory checkpointer limits, see BoundedMemorySaver
+CHECKPOINTER_MAX_THREADS = int(os.getenv("CHECKPOINTER_MAX_THREADS", "1000"))
+CHECKPOINTER_IDLE_TTL_SECONDS = int(os.getenv("CHECKPOINTER_IDLE_TTL_SECONDS", "3600"))
+CHECKPOINTER_INTERRUPT_TTL_SECONDS = int(
+    os.getenv("CHECKPOINTER_INTERRUPT_TTL_SECONDS", str(24 * 3600))
+)
+CHECKPOINTER_FINISHED_TTL_SECONDS = int(
+    os.getenv("CHECKPOINTER_FINISHED_TTL_SECONDS", "1800")
+)
@@ -23,6 +23,9 @@ class Configuration:
     max_search_results: int = 3  # Maximum number of search results
     mcp_settings: dict = None  # MCP settings, including dynamic loaded tools
     report_style: str = ReportStyle.ACADEMIC.value  # Report style
+    enable_parallel_steps: bool = False  # Run independent research steps in parallel
+    max_parallel_steps: int = 3  # Maximum number of steps running at the same time
+    max_observation_tokens: int = 16000  # Reporter observations budget, 0 keeps all
 
     @classmethod
     def from_runnable_config(
@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+import re
+import tempfile
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# HTTP client configuration of the crawler, see src/crawler/http_client.py
+# Seconds to wait for a crawl request to finish
+CRAWLER_TIMEOUT_SECONDS = float(os.getenv("CRAWLER_TIMEOUT_SECONDS", "30"))
+# Seconds to wait for a connection to be established
+CRAWLER_CONNECT_TIMEOUT_SECONDS = float(
+    os.getenv("CRAWLER_CONNECT_TIMEOUT_SECONDS", "10")
+)
+# Maximum number of open connections of the shared connection pool
+CRAWLER_MAX_CONNECTIONS = int(os.getenv("CRAWLER_MAX_CONNECTIONS", "100"))
+# Maximum number of idle connections kept alive for reuse
+CRAWLER_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("CRAWLER_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+# Negotiate HTTP/2 when the server supports it
+CRAWLER_HTTP2 = os.getenv("CRAWLER_HTTP2", "true").lower() == "true"
+# Maximum number of bytes of a page downloaded, longer pages are truncated
+CRAWLER_MAX_BYTES = int(os.getenv("CRAWLER_MAX_BYTES", str(5 * 1024 * 1024)))
+# Maximum number of bytes of a PDF or text document downloaded
+CRAWLER_DOCUMENT_MAX_BYTES = int(
+    os.getenv("CRAWLER_DOCUMENT_MAX_BYTES", str(20 * 1024 * 1024))
+)
+
+# Politeness of the crawl requests, see src/crawler/host_limiter.py
+# Maximum number of crawl requests in flight over all hosts
+CRAWLER_MAX_IN_FLIGHT = int(os.getenv("CRAWLER_MAX_IN_FLIGHT", "64"))
+# Maximum number of concurrent requests per host
+CRAWLER_HOST_CONCURRENCY = int(os.getenv("CRAWLER_HOST_CONCURRENCY", "4"))
+# Requests per second per host, 0 for no rate limit
+CRAWLER_HOST_RATE = float(os.getenv("CRAWLER_HOST_RATE", "2"))
+# Requests a host may get at once after being idle
+CRAWLER_HOST_BURST = int(os.getenv("CRAWLER_HOST_BURST", "4"))
+# Limits of specific hosts as host=rate:concurrency, comma separated
+CRAWLER_HOST_LIMITS = {
+    host.strip(): (float(rate), int(concurrency))
+    for host, rate, concurrency in (
+        re.split(r"[=:]", limit)
+        for limit in os.getenv("CRAWLER_HOST_LIMITS", "r.jina.ai=8:32").split(",")
+        if limit.strip()
+    )
+}
+# Maximum seconds a host is paused after a 429 or 503 response
+CRAWLER_MAX_BACKOFF_SECONDS = float(os.getenv("CRAWLER_MAX_BACKOFF_SECONDS", "60"))
+# Seconds a request waits for its turn on a host before failing
+CRAWLER_HOST_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("CRAWLER_HOST_QUEUE_TIMEOUT_SECONDS", "60")
+)
+# Times a request answered with 429 or 503 is retried after the backoff
+CRAWLER_MAX_RETRIES = int(os.getenv("CRAWLER_MAX_RETRIES", "2"))
+# Let crawl requests reach private, loopback and link-local addresses, e.g. to
+# crawl an intranet, off by default so the urls of the LLM stay on the internet
+CRAWLER_ALLOW_PRIVATE_ADDRESSES = (
+    os.getenv("CRAWLER_ALLOW_PRIVATE_ADDRESSES", "false").lower() == "true"
+)
+
+# Where pages are fetched from, see src/crawler/crawler.py: "jina" through the
+# Jina reader, "direct" from the origin, or "hedged" from the origin and from
+# Jina when the origin is slow or fails, keeping the first page to arrive
+CRAWLER_BACKEND = os.getenv("CRAWLER_BACKEND", "jina").lower()
+# Seconds the hedged backend waits for the origin before also asking Jina
+CRAWLER_HEDGE_DELAY_SECONDS = float(os.getenv("CRAWLER_HEDGE_DELAY_SECONDS", "2"))
+
+# Batch crawl tool configuration, see src/tools/crawl.py
+# Maximum number of pages crawled at the same time by one batch
+CRAWLER_BATCH_CONCURRENCY = int(os.getenv("CRAWLER_BATCH_CONCURRENCY", "5"))
+# Maximum number of urls crawled by one batch, the others are skipped
+CRAWLER_BATCH_MAX_URLS = int(os.getenv("CRAWLER_BATCH_MAX_URLS", "10"))
+# Token budget of the passages of a page returned by crawl_tool
+CRAWLER_PAGE_TOKEN_BUDGET = int(os.getenv("CRAWLER_PAGE_TOKEN_BUDGET", "800"))
+# Token budget of the page digests returned by one batch
+CRAWLER_BATCH_TOKEN_BUDGET = int(os.getenv("CRAWLER_BATCH_TOKEN_BUDGET", "4000"))
+
+# Disk cache of crawled pages, see src/crawler/crawl_cache.py
+# Directory of the cache, empty disables it
+CRAWL_CACHE_DIR = os.getenv(
+    "CRAWL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "deer-flow", "crawl_cache")
+)
+# Serve cached pages without revalidating them for this many seconds
+CRAWL_CACHE_TTL_SECONDS = int(os.getenv("CRAWL_CACHE_TTL_SECONDS", str(24 * 3600)))
+# Evict the least recently used pages beyond this size
+CRAWL_CACHE_MAX_BYTES = int(os.getenv("CRAWL_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Article extraction, see src/crawler/extraction_pool.py
+# Number of worker processes extracting articles for the async crawl path
+CRAWLER_EXTRACTION_WORKERS = int(
+    os.getenv("CRAWLER_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Maximum number of pages waiting for a worker, later pages wait for a slot
+CRAWLER_EXTRACTION_QUEUE_DEPTH = int(os.getenv("CRAWLER_EXTRACTION_QUEUE_DEPTH", "32"))
+# Seconds a page waits for a slot in the extraction queue before failing
+CRAWLER_EXTRACTION_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("CRAWLER_EXTRACTION_QUEUE_TIMEOUT_SECONDS", "60")
+)
+# Extract pages with a single article or main element without readability
+CRAWLER_EXTRACTION_FAST_PATH = (
+    os.getenv("CRAWLER_EXTRACTION_FAST_PATH", "true").lower() == "true"
+)
+# Use the Node.js readability.js, the pure Python readabilipy mode otherwise
+CRAWLER_READABILITY_JS = os.getenv("CRAWLER_READABILITY_JS", "true").lower() == "true"
+# Maximum length of the Markdown of an article, longer articles are cut off
+CRAWLER_MARKDOWN_MAX_CHARS = int(os.getenv("CRAWLER_MARKDOWN_MAX_CHARS", "200000"))
+# Maximum number of pages of a PDF the text is extracted from
+CRAWLER_PDF_MAX_PAGES = int(os.getenv("CRAWLER_PDF_MAX_PAGES", "30"))
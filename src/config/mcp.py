@@ -0,0 +1,26 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# MCP session pool configuration, see MCPSessionPool
+# Maximum number of concurrent tool calls per MCP server
+MCP_POOL_MAX_CONCURRENCY = int(os.getenv("MCP_POOL_MAX_CONCURRENCY", "4"))
+# Stop MCP servers that have not been used for this many seconds
+MCP_POOL_IDLE_TIMEOUT_SECONDS = int(os.getenv("MCP_POOL_IDLE_TIMEOUT_SECONDS", "300"))
+# Ping running MCP servers every N seconds and restart the unresponsive ones
+MCP_POOL_HEALTH_CHECK_SECONDS = int(os.getenv("MCP_POOL_HEALTH_CHECK_SECONDS", "30"))
+
+# MCP tool discovery cache of the server metadata endpoint, see MCPToolCache
+# Serve cached tool lists without revalidating them for this many seconds
+MCP_TOOL_CACHE_TTL_SECONDS = int(os.getenv("MCP_TOOL_CACHE_TTL_SECONDS", "300"))
+# Serve expired tool lists while they are revalidated for this many more seconds
+MCP_TOOL_CACHE_MAX_STALE_SECONDS = int(
+    os.getenv("MCP_TOOL_CACHE_MAX_STALE_SECONDS", str(24 * 3600))
+)
+# Persist the cache to this JSON file, empty keeps it in memory only
+MCP_TOOL_CACHE_PATH = os.getenv("MCP_TOOL_CACHE_PATH", "")
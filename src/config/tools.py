@@ -13,10 +13,57 @@ class SearchEngine(enum.Enum):
     DUCKDUCKGO = "duckduckgo"
     BRAVE_SEARCH = "brave_search"
     ARXIV = "arxiv"
+    # several of the engines above at once, see META_SEARCH_ENGINES
+    META = "meta"
 
 
 # Tool configuration
 SELECTED_SEARCH_ENGINE = os.getenv("SEARCH_API", SearchEngine.TAVILY.value)
+# Engines the meta search queries concurrently, separated by commas
+META_SEARCH_ENGINES = [
+    engine.strip()
+    for engine in os.getenv("META_SEARCH_ENGINES", "tavily,duckduckgo").split(",")
+    if engine.strip()
+]
+# The meta search returns once this many engines answered, or after the
+# deadline once any of them did
+META_SEARCH_QUORUM = int(os.getenv("META_SEARCH_QUORUM", "2"))
+META_SEARCH_DEADLINE_SECONDS = float(os.getenv("META_SEARCH_DEADLINE_SECONDS", "5"))
+# Maximum number of queries of one call of the batch search tool
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "5"))
+
+# Search results and crawled pages repeating a page the research thread has
+# already seen, e.g. syndicated articles, are collapsed to a reference to it.
+# Maximum Hamming distance of the 64-bit SimHash fingerprints of near
+# duplicates, -1 disables the filter
+NEAR_DUPLICATE_MAX_DISTANCE = int(os.getenv("NEAR_DUPLICATE_MAX_DISTANCE", "8"))
+# Pages remembered per research thread
+NEAR_DUPLICATE_MAX_PAGES_PER_THREAD = int(
+    os.getenv("NEAR_DUPLICATE_MAX_PAGES_PER_THREAD", "2000")
+)
+
+# Seconds to wait for a Tavily search, and for a connection to the API
+TAVILY_TIMEOUT_SECONDS = float(os.getenv("TAVILY_TIMEOUT_SECONDS", "30"))
+TAVILY_CONNECT_TIMEOUT_SECONDS = float(os.getenv("TAVILY_CONNECT_TIMEOUT_SECONDS", "5"))
+# Maximum number of pooled keep-alive connections to the Tavily API
+TAVILY_MAX_CONNECTIONS = int(os.getenv("TAVILY_MAX_CONNECTIONS", "20"))
+# Seconds an idle connection to the Tavily API is kept open
+TAVILY_KEEPALIVE_SECONDS = float(os.getenv("TAVILY_KEEPALIVE_SECONDS", "60"))
+
+
+class SearchCacheBackend(enum.Enum):
+    NONE = "none"
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+# Search results cache, shared by the research threads of the process
+SELECTED_SEARCH_CACHE = os.getenv("SEARCH_CACHE", SearchCacheBackend.MEMORY.value)
+SQLITE_SEARCH_CACHE_PATH = os.getenv("SQLITE_SEARCH_CACHE_PATH", "search_cache.sqlite")
+# Serve cached search results for this many seconds
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+# Evict the least recently used search results beyond this many
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "10000"))
 
 
 class RAGProvider(enum.Enum):
@@ -2,36 +2,105 @@
 # SPDX-License-Identifier: MIT
 
 import re
+from typing import Iterator
 from urllib.parse import urljoin
 
-from markdownify import markdownify as md
+from src.config.crawler import CRAWLER_MARKDOWN_MAX_CHARS
+
+from .markdown_converter import Image, MarkdownConverter, parse_fragment
+
+_IMAGE_PATTERN = re.compile(r"!\[.*?\]\((.*?)\)")
 
 
 class Article:
     url: str
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(self, title: str, html_content: str, markdown: str | None = None):
         self.title = title
         self.html_content = html_content
+        # Markdown of the content, converted once on first use
+        self.markdown = markdown
 
     def to_markdown(self, including_title: bool = True) -> str:
+        if self.markdown is None:
+            self.markdown = "\n\n".join(
+                _block_markdown(block) for block in self._iter_converted()
+            )
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
+        markdown += self.markdown
         return markdown
 
-    def to_message(self) -> list[dict]:
-        image_pattern = r"!\[.*?\]\((.*?)\)"
+    def to_text(self) -> str:
+        """Get the plain text of the content."""
+        root = self._parse()
+        if root is None:
+            return ""
+        return " ".join(" ".join(root.itertext()).split())
+
+    def iter_markdown_blocks(self) -> Iterator[str]:
+        """
+        Convert the content to Markdown block by block, e.g. per paragraph.
 
+        Consumers that only need the first blocks stop the conversion early.
+        """
+        if self.markdown is not None:
+            yield from (b.strip() for b in self.markdown.split("\n\n") if b.strip())
+            return
+        for block in self._iter_converted():
+            yield _block_markdown(block)
+
+    def _parse(self):
+        return parse_fragment(self.html_content)
+
+    def _iter_converted(self) -> Iterator["str | Image"]:
+        converter = MarkdownConverter(max_chars=CRAWLER_MARKDOWN_MAX_CHARS)
+        return converter.iter_blocks(self._parse())
+
+    def to_message(self) -> list[dict]:
         content: list[dict[str, str]] = []
-        parts = re.split(image_pattern, self.to_markdown())
+        text: list[str] = []
 
-        for i, part in enumerate(parts):
-            if i % 2 == 1:
-                image_url = urljoin(self.url, part.strip())
+        def add_text():
+            if text or not content:
+                content.append({"type": "text", "text": "\n\n".join(text).strip()})
+            text.clear()
+
+        for part in self._iter_message_parts():
+            if isinstance(part, Image):
+                add_text()
+                image_url = urljoin(self.url, part.src.strip())
                 content.append({"type": "image_url", "image_url": {"url": image_url}})
+            elif part.strip():
+                text.append(part.strip())
+        add_text()
+        return content
+
+    def _iter_message_parts(self) -> Iterator["str | Image"]:
+        """Split the Markdown into text and images, converting it on the way if needed."""
+        yield f"# {self.title}"
+        if self.markdown is not None:
+            yield from _split_images(self.markdown)
+            return
+        blocks = []
+        for block in self._iter_converted():
+            blocks.append(_block_markdown(block))
+            if isinstance(block, Image):
+                yield block
             else:
-                content.append({"type": "text", "text": part.strip()})
+                # images nested in lists, tables or links stay in the text block
+                yield from _split_images(block)
+        self.markdown = "\n\n".join(blocks)
 
-        return content
+
+def _block_markdown(block: "str | Image") -> str:
+    return block.markdown if isinstance(block, Image) else block
+
+
+def _split_images(markdown: str) -> Iterator["str | Image"]:
+    if "![" not in markdown:
+        yield markdown
+        return
+    for i, part in enumerate(_IMAGE_PATTERN.split(markdown)):
+        yield Image(src=part) if i % 2 == 1 else part
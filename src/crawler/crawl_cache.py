@@ -0,0 +1,268 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.config.crawler import (
+    CRAWL_CACHE_DIR,
+    CRAWL_CACHE_MAX_BYTES,
+    CRAWL_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# query parameters that only track the visitor and never change the page
+_TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "mc_cid", "mc_eid", "spm")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_MAX_TRACKED_THREADS = 1024
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a url so that trivially different spellings share a cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, and sorts the query.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+@dataclass
+class CachedPage:
+    """A crawled page with its raw HTML and extracted article."""
+
+    url: str
+    html: str
+    title: Optional[str] = None
+    content: Optional[str] = None
+    markdown: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = dataclasses.field(default_factory=time.time)
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class CrawlCache:
+    """A disk cache of crawled pages keyed by canonical url.
+
+    Entries are JSON files named after the hash of the canonical url. Pages
+    younger than ``ttl`` are served as they are. Older pages are handed to the
+    loader, which revalidates them with their ETag or Last-Modified or crawls
+    them again. The least recently used entries are evicted once the cache
+    holds more than ``max_bytes``. Concurrent crawls of the same url share
+    one load, and the outcome of every lookup is counted per research thread.
+
+    Args:
+        root_dir: Directory of the cache entries.
+        ttl: Seconds a page is served without revalidating it.
+        max_bytes: Maximum size of the cache on disk.
+    """
+
+    def __init__(self, root_dir: str, ttl: float, max_bytes: int) -> None:
+        self.root_dir = root_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # key -> size of the entry file, least recently used first
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._ainflight: dict[str, asyncio.Future] = {}
+        self._stats: OrderedDict[str, dict[str, int]] = OrderedDict()
+        self._load_index()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Get the cached page of a url, however old it is."""
+        key = self._key(url)
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                page = CachedPage(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Dropping unreadable crawl cache entry of {url}: {e!r}")
+            self._remove(key)
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            # the modification time orders the entries again after a restart
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return page
+
+    def put(self, page: CachedPage) -> None:
+        """Store a page, evicting the least recently used ones beyond the size cap."""
+        key = self._key(page.url)
+        path = self._path(key)
+        data = json.dumps(dataclasses.asdict(page), ensure_ascii=False).encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._total_bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            evicted = []
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, size = self._index.popitem(last=False)
+                self._total_bytes -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._remove_file(old_key)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.fetched_at < self.ttl
+
+    def fetch(
+        self,
+        url: str,
+        load: Callable[[Optional[CachedPage]], CachedPage],
+        thread_id: str = "default",
+    ) -> CachedPage:
+        """Get a fresh page of a url, calling ``load`` with the expired page if needed."""
+        page = self.get(url)
+        if page is not None and self.is_fresh(page):
+            self.record(thread_id, "hit")
+            return page
+        key = self._key(url)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            self.record(thread_id, "coalesced")
+            return future.result()
+        self.record(thread_id, "expired" if page else "miss")
+        try:
+            result = load(page)
+            self.put(result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def afetch(
+        self,
+        url: str,
+        load: Callable[[Optional[CachedPage]], Awaitable[CachedPage]],
+        thread_id: str = "default",
+    ) -> CachedPage:
+        """Like :meth:`fetch`, without blocking the event loop."""
+        page = await asyncio.to_thread(self.get, url)
+        if page is not None and self.is_fresh(page):
+            self.record(thread_id, "hit")
+            return page
+        key = self._key(url)
+        future = self._ainflight.get(key)
+        if future is not None:
+            self.record(thread_id, "coalesced")
+            return await asyncio.shield(future)
+        self.record(thread_id, "expired" if page else "miss")
+        future = self._ainflight[key] = asyncio.ensure_future(self._aload(page, load))
+        future.add_done_callback(lambda _: self._ainflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _aload(
+        self,
+        page: Optional[CachedPage],
+        load: Callable[[Optional[CachedPage]], Awaitable[CachedPage]],
+    ) -> CachedPage:
+        result = await load(page)
+        await asyncio.to_thread(self.put, result)
+        return result
+
+    def record(self, thread_id: str, outcome: str) -> None:
+        """Count the outcome of a lookup, e.g. hit or miss, for a research thread."""
+        with self._lock:
+            stats = self._stats.setdefault(thread_id, {})
+            stats[outcome] = stats.get(outcome, 0) + 1
+            self._stats.move_to_end(thread_id)
+            if len(self._stats) > _MAX_TRACKED_THREADS:
+                self._stats.popitem(last=False)
+
+    def stats(self, thread_id: Optional[str] = None) -> dict:
+        """Get the lookup outcomes of one research thread, or of all of them."""
+        with self._lock:
+            if thread_id is not None:
+                return dict(self._stats.get(thread_id, {}))
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "threads": {key: dict(value) for key, value in self._stats.items()},
+            }
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], f"{key}.json")
+
+    def _load_index(self) -> None:
+        entries = []
+        if os.path.isdir(self.root_dir):
+            for dirpath, _, filenames in os.walk(self.root_dir):
+                for filename in filenames:
+                    if not filename.endswith(".json"):
+                        continue
+                    stat = os.stat(os.path.join(dirpath, filename))
+                    entries.append((stat.st_mtime, filename[:-5], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+        self._remove_file(key)
+
+    def _remove_file(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+_crawl_cache: Optional[CrawlCache] = None
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Return the process-wide crawl cache, or None when it is disabled."""
+    global _crawl_cache
+    if _crawl_cache is None and CRAWL_CACHE_DIR:
+        _crawl_cache = CrawlCache(
+            CRAWL_CACHE_DIR, CRAWL_CACHE_TTL_SECONDS, CRAWL_CACHE_MAX_BYTES
+        )
+    return _crawl_cache
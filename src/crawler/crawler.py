@@ -1,14 +1,98 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import sys
+import asyncio
+import dataclasses
+import functools
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Mapping, Optional
+
+import httpx
+
+from src.config.crawler import CRAWLER_BACKEND, CRAWLER_HEDGE_DELAY_SECONDS
 
 from .article import Article
+from .crawl_cache import CachedPage, CrawlCache
+from .direct_client import DirectClient
+from .document_extractor import document_kind, guess_document_kind
+from .html_stream import UnsupportedContentError
+from .http_client import get_async_http_client, get_http_client
 from .jina_client import JinaClient
 from .readability_extractor import ReadabilityExtractor
 
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the origin when revalidating a cached page
+_REVALIDATION_TIMEOUT_SECONDS = 5
+# jina crawls through the Jina reader, direct fetches from the origin and
+# hedged fetches from the origin, asking Jina too when the origin is slow
+BACKENDS = ("jina", "direct", "hedged")
+
+
+def _conditional_headers(page: Optional[CachedPage]) -> dict[str, str]:
+    headers = {}
+    if page is not None and page.etag:
+        headers["If-None-Match"] = page.etag
+    if page is not None and page.last_modified:
+        headers["If-Modified-Since"] = page.last_modified
+    return headers
+
+
+def _is_not_modified(response: httpx.Response, page: CachedPage) -> bool:
+    if response.status_code == 304:
+        return True
+    # servers ignoring conditional HEAD requests still send the validators
+    return response.is_success and (
+        (page.etag is not None and response.headers.get("ETag") == page.etag)
+        or (
+            page.etag is None
+            and page.last_modified is not None
+            and response.headers.get("Last-Modified") == page.last_modified
+        )
+    )
+
+
+def _validators(response: httpx.Response) -> Optional[Mapping[str, str]]:
+    """
+    Get the validators of the origin from a revalidation request.
+
+    Jina does not forward the validators of the origin, so pages crawled
+    through it by the hedged backend only get them once they expired and
+    were revalidated.
+    """
+    return response.headers if response.is_success else None
+
 
 class Crawler:
+    """
+    Crawl pages and extract their articles.
+
+    Args:
+        cache: Optional cache of crawled pages, see :class:`CrawlCache`.
+        thread_id: Research thread the cache hits and misses are counted for.
+        backend: Where pages are fetched from, one of :data:`BACKENDS`.
+        hedge_delay: Seconds the hedged backend waits for the origin before
+            also asking Jina, the first page to arrive is kept.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[CrawlCache] = None,
+        thread_id: str = "default",
+        backend: str = CRAWLER_BACKEND,
+        hedge_delay: float = CRAWLER_HEDGE_DELAY_SECONDS,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown crawler backend {backend!r}, use one of {BACKENDS}"
+            )
+        self.cache = cache
+        self.thread_id = thread_id
+        self.backend = backend
+        self.hedge_delay = hedge_delay
+
     def crawl(self, url: str) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
@@ -20,9 +104,248 @@ class Crawler:
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
-        jina_client = JinaClient()
-        html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
+        #
+        # Simple static pages are fetched directly from their origin
+        # by the direct and hedged backends, saving the hop to Jina.
+        #
+        # PDFs, plain text and JSON skip the HTML pipeline, their text
+        # is extracted locally into an article of the same shape.
+        if self.cache is None:
+            html, _ = self._fetch(url)
+            return self._extract(url, html)
+        page = self.cache.fetch(
+            url, lambda stale: self._load(url, stale), self.thread_id
+        )
+        return self._to_article(url, page)
+
+    async def acrawl(self, url: str) -> Article:
+        """Crawl a url without blocking the event loop, see :meth:`crawl`."""
+        if self.cache is None:
+            html, _ = await self._afetch(url)
+            return await self._aextract(url, html)
+        page = await self.cache.afetch(
+            url, lambda stale: self._aload(url, stale), self.thread_id
+        )
+        return self._to_article(url, page)
+
+    def _load(self, url: str, stale: Optional[CachedPage]) -> CachedPage:
+        validators = None
+        if self._should_revalidate(stale):
+            try:
+                response = get_http_client().head(
+                    url,
+                    headers=_conditional_headers(stale),
+                    timeout=_REVALIDATION_TIMEOUT_SECONDS,
+                )
+                if _is_not_modified(response, stale):
+                    return self._revalidated(stale)
+                validators = _validators(response)
+            except httpx.HTTPError as e:
+                logger.debug(f"Revalidating {url} failed: {e!r}")
+        html, headers = self._fetch(url)
+        article = self._extract(url, html)
+        return self._to_page(url, html, article, headers or validators)
+
+    async def _aload(self, url: str, stale: Optional[CachedPage]) -> CachedPage:
+        validators = None
+        if self._should_revalidate(stale):
+            try:
+                response = await get_async_http_client().head(
+                    url,
+                    headers=_conditional_headers(stale),
+                    timeout=_REVALIDATION_TIMEOUT_SECONDS,
+                )
+                if _is_not_modified(response, stale):
+                    return self._revalidated(stale)
+                validators = _validators(response)
+            except httpx.HTTPError as e:
+                logger.debug(f"Revalidating {url} failed: {e!r}")
+        html, headers = await self._afetch(url)
+        article = await self._aextract(url, html)
+        return await asyncio.to_thread(
+            self._to_page, url, html, article, headers or validators
+        )
+
+    def _fetch(self, url: str) -> tuple["str | Article", Optional[Mapping[str, str]]]:
+        """
+        Fetch the HTML of a page, with the headers of the origin when it sent it.
+
+        PDFs and text documents are fetched from their origin whatever the
+        backend and returned as an extracted :class:`Article`.
+        """
+        documents = True
+        if guess_document_kind(url) is not None:
+            try:
+                return DirectClient().crawl_document(url)
+            except Exception as e:
+                logger.debug(f"Fetching the document {url} failed: {e!r}")
+                documents = False
+        crawl_direct = functools.partial(_crawl_direct, documents=documents)
+        if self.backend == "jina":
+            return _crawl_jina(url)
+        if self.backend == "direct":
+            return crawl_direct(url)
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedged-crawl")
+        futures = {executor.submit(crawl_direct, url): "direct"}
+        wait(futures, timeout=self.hedge_delay)
+        errors = []
+        hedged = False
+        try:
+            while True:
+                for future in [future for future in futures if future.done()]:
+                    backend = futures.pop(future)
+                    try:
+                        fetched = future.result()
+                    except Exception as e:
+                        logger.debug(f"Fetching {url} with {backend} failed: {e!r}")
+                        errors.append(e)
+                        continue
+                    logger.debug(f"Fetched {url} with {backend}")
+                    return fetched
+                if not hedged:
+                    # the origin is slow or failed, ask Jina as well
+                    futures[executor.submit(_crawl_jina, url)] = "jina"
+                    hedged = True
+                elif not futures:
+                    raise errors[-1]
+                wait(futures, return_when=FIRST_COMPLETED)
+        finally:
+            # the slower request is left to finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _afetch(
+        self, url: str
+    ) -> tuple["str | Article", Optional[Mapping[str, str]]]:
+        """Like :meth:`_fetch`, without blocking the event loop."""
+        documents = True
+        if guess_document_kind(url) is not None:
+            try:
+                return await DirectClient().acrawl_document(url)
+            except Exception as e:
+                logger.debug(f"Fetching the document {url} failed: {e!r}")
+                documents = False
+        if self.backend == "jina":
+            return await _acrawl_jina(url)
+        if self.backend == "direct":
+            return await _acrawl_direct(url, documents)
+        tasks = {asyncio.ensure_future(_acrawl_direct(url, documents)): "direct"}
+        await asyncio.wait(tasks, timeout=self.hedge_delay)
+        errors = []
+        hedged = False
+        try:
+            while True:
+                for task in [task for task in tasks if task.done()]:
+                    backend = tasks.pop(task)
+                    try:
+                        fetched = task.result()
+                    except Exception as e:
+                        logger.debug(f"Fetching {url} with {backend} failed: {e!r}")
+                        errors.append(e)
+                        continue
+                    logger.debug(f"Fetched {url} with {backend}")
+                    return fetched
+                if not hedged:
+                    tasks[asyncio.ensure_future(_acrawl_jina(url))] = "jina"
+                    hedged = True
+                elif not tasks:
+                    raise errors[-1]
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _should_revalidate(self, stale: Optional[CachedPage]) -> bool:
+        """
+        Decide whether to ask the origin about an expired page before crawling it.
+
+        The request goes to the origin, through the address guard of the
+        shared clients. On the Jina backend it is only sent for pages with
+        validators, so the origin is not contacted just to learn them.
+        """
+        if stale is None:
+            return False
+        return stale.has_validators or self.backend != "jina"
+
+    def _revalidated(self, stale: CachedPage) -> CachedPage:
+        self.cache.record(self.thread_id, "revalidated")
+        return dataclasses.replace(stale, fetched_at=time.time())
+
+    @staticmethod
+    def _to_page(
+        url: str,
+        html: "str | Article",
+        article: Article,
+        headers: Optional[Mapping[str, str]],
+    ) -> CachedPage:
+        headers = headers or {}
+        return CachedPage(
+            url=url,
+            # without the parsed tree of an HTMLDocument, documents have no HTML
+            html="" if isinstance(html, Article) else str(html),
+            title=article.title,
+            content=article.html_content,
+            # only when already converted, e.g. by an extraction worker, the
+            # others are converted on use, as far as their digest needs
+            markdown=article.markdown,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+
+    @staticmethod
+    def _to_article(url: str, page: CachedPage) -> Article:
+        article = Article(page.title, page.content, markdown=page.markdown)
+        article.url = url
+        return article
+
+    def _extract(self, url: str, html: "str | Article") -> Article:
+        if isinstance(html, Article):
+            # a document, extracted while it was fetched
+            article = html
+        else:
+            article = ReadabilityExtractor().extract_article(html)
+        article.url = url
+        return article
+
+    async def _aextract(self, url: str, html: "str | Article") -> Article:
+        if isinstance(html, Article):
+            article = html
+        else:
+            # readability runs a Node.js subprocess, keep it off the event loop
+            article = await ReadabilityExtractor().aextract_article(html)
         article.url = url
         return article
+
+
+def _crawl_jina(url: str) -> tuple[str, None]:
+    return JinaClient().crawl(url, return_format="html"), None
+
+
+async def _acrawl_jina(url: str) -> tuple[str, None]:
+    return await JinaClient().acrawl(url, return_format="html"), None
+
+
+def _crawl_direct(
+    url: str, documents: bool = True
+) -> tuple["str | Article", Optional[Mapping[str, str]]]:
+    client = DirectClient()
+    try:
+        html = client.crawl(url)
+    except UnsupportedContentError as e:
+        # a PDF or text document behind a url which does not look like one
+        if not documents or document_kind(e.content_type, e.head) is None:
+            raise
+        return client.crawl_document(url)
+    return html, html.headers
+
+
+async def _acrawl_direct(
+    url: str, documents: bool = True
+) -> tuple["str | Article", Optional[Mapping[str, str]]]:
+    client = DirectClient()
+    try:
+        html = await client.acrawl(url)
+    except UnsupportedContentError as e:
+        if not documents or document_kind(e.content_type, e.head) is None:
+            raise
+        return await client.acrawl_document(url)
+    return html, html.headers
@@ -0,0 +1,85 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from typing import Mapping, Optional
+
+import lxml.html
+from lxml.etree import ParserError
+
+from .article import Article
+from .document_extractor import afetch_document, fetch_document
+from .html_stream import HTMLDocument, afetch_html, fetch_html
+from .http_client import get_async_http_client, get_http_client
+
+logger = logging.getLogger(__name__)
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (compatible; DeerFlow/1.0; +https://github.com/bytedance/deer-flow)"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+}
+# pages with less text than this are likely rendered by JavaScript
+_MIN_TEXT_LENGTH = 200
+_TEXT_XPATH = "//body//text()[not(ancestor::script) and not(ancestor::style)]"
+
+
+class NoContentError(ValueError):
+    """Raised when a fetched page has barely any text, e.g. before JavaScript ran."""
+
+
+class DirectClient:
+    """
+    Fetch pages from their origin, without going through the Jina reader.
+
+    The returned :class:`HTMLDocument` carries the headers of the origin,
+    which hold the validators used to revalidate cached pages. PDFs and text
+    documents are fetched with :meth:`crawl_document` instead. Urls of
+    private, loopback or link-local addresses, or redirecting to one, are
+    refused by the transport of the shared clients, see ``LimitedTransport``.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        # Per-request timeout in seconds, the client default when not set
+        self.timeout = timeout
+
+    def crawl(self, url: str) -> HTMLDocument:
+        document = fetch_html(get_http_client(), "GET", url, **self._request_options())
+        return _check_content(url, document)
+
+    async def acrawl(self, url: str) -> HTMLDocument:
+        document = await afetch_html(
+            get_async_http_client(), "GET", url, **self._request_options()
+        )
+        # the page was not parsed while it downloaded, parse it off the event loop
+        return await asyncio.to_thread(_check_content, url, document)
+
+    def crawl_document(self, url: str) -> tuple[Article, Mapping[str, str]]:
+        """Fetch a PDF, text or JSON document and extract its text locally."""
+        return fetch_document(get_http_client(), url, **self._request_options())
+
+    async def acrawl_document(self, url: str) -> tuple[Article, Mapping[str, str]]:
+        return await afetch_document(
+            get_async_http_client(), url, **self._request_options()
+        )
+
+    def _request_options(self) -> dict:
+        options = {"headers": _HEADERS}
+        if self.timeout is not None:
+            options["timeout"] = self.timeout
+        return options
+
+
+def _check_content(url: str, document: HTMLDocument) -> HTMLDocument:
+    tree = document.tree
+    if tree is None:
+        try:
+            tree = lxml.html.fromstring(document)
+        except (ParserError, ValueError):
+            return document
+    length = sum(len(text.strip()) for text in tree.xpath(_TEXT_XPATH))
+    if length < _MIN_TEXT_LENGTH:
+        raise NoContentError(f"{url} has only {length} characters of text")
+    return document
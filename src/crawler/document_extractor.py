@@ -0,0 +1,248 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import html
+import io
+import json
+import logging
+import re
+from typing import Iterable, Iterator, Mapping, Optional
+from urllib.parse import unquote, urlsplit
+
+import httpx
+from pypdf import PdfReader
+
+from src.config.crawler import (
+    CRAWLER_DOCUMENT_MAX_BYTES,
+    CRAWLER_MARKDOWN_MAX_CHARS,
+    CRAWLER_PDF_MAX_PAGES,
+)
+
+from .article import Article
+from .html_stream import UnsupportedContentError
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KINDS = {
+    ".pdf": "pdf",
+    ".txt": "text",
+    ".md": "text",
+    ".markdown": "text",
+    ".csv": "text",
+    ".rst": "text",
+    ".json": "json",
+}
+_TEXT_TYPES = ("text/plain", "text/markdown", "text/x-markdown", "text/csv")
+# paragraphs are split into blocks of about this many characters
+_BLOCK_CHARS = 600
+_SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def document_kind(content_type: str, head: bytes = b"") -> Optional[str]:
+    """Get the kind of document of a response: pdf, text or json, None for other content."""
+    media_type = content_type.split(";")[0].strip().lower()
+    if head.startswith(b"%PDF") or media_type == "application/pdf":
+        return "pdf"
+    if media_type == "application/json" or media_type.endswith("+json"):
+        return "json"
+    if media_type in _TEXT_TYPES:
+        return "text"
+    return None
+
+
+def guess_document_kind(url: str) -> Optional[str]:
+    """Guess from its url whether a page is a PDF or a text document."""
+    parts = urlsplit(url)
+    path = parts.path.lower()
+    if parts.hostname in ("arxiv.org", "www.arxiv.org") and path.startswith("/pdf/"):
+        return "pdf"
+    extension = path[path.rfind(".") :] if "." in path.rsplit("/", 1)[-1] else ""
+    return _EXTENSION_KINDS.get(extension)
+
+
+class _DocumentStream:
+    """Collect a document body up to ``max_bytes``, sniffing its kind first."""
+
+    def __init__(self, url: str, content_type: str, max_bytes: int):
+        self.url = url
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        self.kind: Optional[str] = None
+        self.truncated = False
+        self._chunks: list[bytes] = []
+        self._size = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        if self._size + len(chunk) > self.max_bytes:
+            chunk = chunk[: self.max_bytes - self._size]
+            self.truncated = True
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self.kind is None and (self._size >= 8 or self.truncated):
+            self._sniff()
+        return not self.truncated
+
+    def close(self) -> bytes:
+        if self.kind is None:
+            self._sniff()
+        if self.truncated:
+            logger.warning(f"Truncated {self.url} after {self.max_bytes} bytes")
+        return b"".join(self._chunks)
+
+    def _sniff(self) -> None:
+        head = b"".join(self._chunks)[:8]
+        self.kind = document_kind(self.content_type, head)
+        if self.kind is None:
+            raise UnsupportedContentError(self.url, self.content_type, head)
+
+
+def fetch_document(
+    client: httpx.Client,
+    url: str,
+    max_bytes: int = CRAWLER_DOCUMENT_MAX_BYTES,
+    **kwargs,
+) -> tuple[Article, Mapping[str, str]]:
+    """
+    Fetch a PDF or text document from its origin and extract it locally.
+
+    Raises :class:`UnsupportedContentError` as soon as the response turns out
+    to be something else, e.g. an HTML page.
+    """
+    with client.stream("GET", url, **kwargs) as response:
+        response.raise_for_status()
+        stream = _DocumentStream(
+            url, response.headers.get("Content-Type", ""), max_bytes
+        )
+        for chunk in response.iter_bytes():
+            if not stream.feed(chunk):
+                break
+        data = stream.close()
+    article = extract_document(url, stream.kind, data, stream.content_type)
+    return article, response.headers
+
+
+async def afetch_document(
+    client: httpx.AsyncClient,
+    url: str,
+    max_bytes: int = CRAWLER_DOCUMENT_MAX_BYTES,
+    **kwargs,
+) -> tuple[Article, Mapping[str, str]]:
+    """Like :func:`fetch_document`, extracting in a thread off the event loop."""
+    async with client.stream("GET", url, **kwargs) as response:
+        response.raise_for_status()
+        stream = _DocumentStream(
+            url, response.headers.get("Content-Type", ""), max_bytes
+        )
+        async for chunk in response.aiter_bytes():
+            if not stream.feed(chunk):
+                break
+        data = stream.close()
+    article = await asyncio.to_thread(
+        extract_document, url, stream.kind, data, stream.content_type
+    )
+    return article, response.headers
+
+
+def extract_document(
+    url: str,
+    kind: str,
+    data: bytes,
+    content_type: str = "",
+    max_pages: int = CRAWLER_PDF_MAX_PAGES,
+) -> Article:
+    """Extract a PDF, text or JSON document into an article of Markdown blocks."""
+    if kind == "pdf":
+        title, blocks = _extract_pdf(data, max_pages)
+    elif kind == "json":
+        title, blocks = None, _limit(_extract_json(_decode(data, content_type)))
+    else:
+        title = None
+        blocks = _limit(_split_paragraphs(_decode(data, content_type)))
+    return _to_article(title or _url_title(url), blocks)
+
+
+def _extract_pdf(data: bytes, max_pages: int) -> tuple[Optional[str], list[str]]:
+    reader = PdfReader(io.BytesIO(data), strict=False)
+    title = reader.metadata.title if reader.metadata else None
+    blocks = []
+    size = 0
+    page_count = len(reader.pages)
+    extracted = 0
+    while extracted < min(page_count, max_pages) and size < CRAWLER_MARKDOWN_MAX_CHARS:
+        # pages are parsed lazily, the ones past the limits are never read
+        text = reader.pages[extracted].extract_text() or ""
+        extracted += 1
+        paragraphs = list(_split_paragraphs(text))
+        if paragraphs:
+            blocks.append(f"### Page {extracted}")
+            blocks.extend(paragraphs)
+        size += sum(len(paragraph) for paragraph in paragraphs)
+    blocks = _limit(blocks)
+    if extracted < page_count:
+        blocks.append(f"[{page_count - extracted} more pages not extracted]")
+    return (title.strip() if title and title.strip() else None), blocks
+
+
+def _extract_json(text: str) -> list[str]:
+    try:
+        text = json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+    except ValueError:
+        pass
+    # a cut off document is still worth a look, unlike an empty one
+    text = text[: CRAWLER_MARKDOWN_MAX_CHARS - 16]
+    return [f"```json\n{text.strip()}\n```"] if text.strip() else []
+
+
+def _split_paragraphs(text: str) -> Iterator[str]:
+    """Split text into paragraphs, re-joining lines wrapped by the layout."""
+    for paragraph in re.split(r"\n\s*\n", text):
+        # words hyphenated at the end of a line are joined again
+        paragraph = re.sub(r"(\w)-\n(\w)", r"\1\2", paragraph)
+        paragraph = " ".join(paragraph.split())
+        while len(paragraph) > _BLOCK_CHARS * 2:
+            sentences = _SENTENCE_END_PATTERN.split(paragraph[_BLOCK_CHARS:], 1)
+            if len(sentences) < 2:
+                break
+            cut = len(paragraph) - len(sentences[1])
+            yield paragraph[:cut].strip()
+            paragraph = paragraph[cut:]
+        if paragraph:
+            yield paragraph
+
+
+def _limit(blocks: Iterable[str]) -> list[str]:
+    limited, size = [], 0
+    for block in blocks:
+        if size + len(block) > CRAWLER_MARKDOWN_MAX_CHARS:
+            break
+        limited.append(block)
+        size += len(block) + 2
+    return limited
+
+
+def _decode(data: bytes, content_type: str) -> str:
+    match = re.search(r"charset=[\"']?([\w\-]+)", content_type, re.I)
+    try:
+        return data.decode(match.group(1) if match else "utf-8", errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+def _url_title(url: str) -> str:
+    path = urlsplit(url).path.rstrip("/")
+    return unquote(path.rsplit("/", 1)[-1]) or url
+
+
+def _to_article(title: str, blocks: list[str]) -> Article:
+    content = []
+    for block in blocks:
+        if block.startswith("### "):
+            content.append(f"<h3>{html.escape(block[4:])}</h3>")
+        elif block.startswith("```"):
+            code = block.split("\n", 1)[1].rsplit("\n", 1)[0]
+            content.append(f"<pre>{html.escape(code)}</pre>")
+        else:
+            content.append(f"<p>{html.escape(block)}</p>")
+    # the blocks are Markdown already, no conversion is needed
+    return Article(title, "".join(content), markdown="\n\n".join(blocks))
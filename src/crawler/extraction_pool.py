@@ -0,0 +1,134 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from readabilipy import simple_json_from_html_string
+
+from src.config.crawler import (
+    CRAWLER_EXTRACTION_QUEUE_DEPTH,
+    CRAWLER_EXTRACTION_QUEUE_TIMEOUT_SECONDS,
+    CRAWLER_EXTRACTION_WORKERS,
+    CRAWLER_MARKDOWN_MAX_CHARS,
+    CRAWLER_READABILITY_JS,
+)
+
+from .article import Article
+from .markdown_converter import html_to_markdown
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionQueueFull(RuntimeError):
+    """Raised when a page waited too long for a slot in the extraction queue."""
+
+
+def extract_in_worker(html: str, use_readability: bool) -> tuple[str, str, str]:
+    """Extract the article of a page and convert it to Markdown in a worker process."""
+    article = simple_json_from_html_string(html, use_readability=use_readability)
+    content = article.get("content") or ""
+    return (
+        article.get("title"),
+        content,
+        html_to_markdown(content, CRAWLER_MARKDOWN_MAX_CHARS),
+    )
+
+
+class ExtractionPool:
+    """
+    A pool of worker processes extracting articles off the event loop.
+
+    readability.js runs as a Node.js subprocess per page and Markdown conversion is
+    CPU bound on long pages, so both run in worker processes. At most
+    ``max_workers + max_queue_depth`` pages are in the pool at a time, the
+    others wait up to ``queue_timeout`` seconds for a slot, which bounds the
+    memory held by queued pages under load.
+
+    Args:
+        max_workers: Number of worker processes, started on first use.
+        max_queue_depth: Number of pages waiting for a worker.
+        queue_timeout: Seconds a page waits for a slot before failing.
+        use_readability: Use readability.js rather than the Python readabilipy mode.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = CRAWLER_EXTRACTION_WORKERS,
+        max_queue_depth: int = CRAWLER_EXTRACTION_QUEUE_DEPTH,
+        queue_timeout: float = CRAWLER_EXTRACTION_QUEUE_TIMEOUT_SECONDS,
+        use_readability: bool = CRAWLER_READABILITY_JS,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.queue_timeout = queue_timeout
+        self.use_readability = use_readability
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue_depth)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of pages being extracted or waiting for a worker."""
+        return self._pending
+
+    async def extract(self, html: str) -> Article:
+        """Extract the article of a page in a worker process."""
+        if not self._slots.acquire(blocking=False):
+            acquired = await asyncio.to_thread(
+                self._slots.acquire, True, self.queue_timeout
+            )
+            if not acquired:
+                raise ExtractionQueueFull(
+                    f"No extraction slot within {self.queue_timeout} seconds"
+                )
+        self._pending += 1
+        try:
+            # a plain str, the parsed tree of an HTMLDocument does not pickle
+            future = self._get_executor().submit(
+                extract_in_worker, str(html), self.use_readability
+            )
+            title, content, markdown = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # a worker died, start new ones for the next pages
+            self.shutdown()
+            raise
+        finally:
+            self._pending -= 1
+            self._slots.release()
+        return Article(title=title, html_content=content, markdown=markdown)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, they are started again on next use."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # forking a process running threads and an event loop is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"Started {self.max_workers} article extraction workers")
+            return self._executor
+
+
+_extraction_pool: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Return the process-wide article extraction pool."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ExtractionPool()
+    return _extraction_pool
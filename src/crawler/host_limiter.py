@@ -0,0 +1,282 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from src.config.crawler import (
+    CRAWLER_HOST_BURST,
+    CRAWLER_HOST_CONCURRENCY,
+    CRAWLER_HOST_LIMITS,
+    CRAWLER_HOST_QUEUE_TIMEOUT_SECONDS,
+    CRAWLER_HOST_RATE,
+    CRAWLER_MAX_BACKOFF_SECONDS,
+    CRAWLER_MAX_IN_FLIGHT,
+)
+
+logger = logging.getLogger(__name__)
+
+# responses asking us to slow down
+BACKOFF_STATUS_CODES = frozenset([429, 503])
+# idle hosts are forgotten beyond this many tracked hosts
+_MAX_IDLE_HOSTS = 1024
+
+
+class HostQueueTimeout(httpx.TimeoutException):
+    """Raised when a request waited too long for its turn on a host."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _Host:
+    """The politeness state of one host."""
+
+    def __init__(self, concurrency: int, rate: float, burst: int):
+        self.concurrency = concurrency
+        # concurrency limit, halved on 429 and 503 and regrown on success
+        self.limit = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled = time.monotonic()
+        self.in_flight = 0
+        self.waiting = 0
+        self.backoff_until = 0.0
+        self.failures = 0
+
+    def refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.refilled) * self.rate
+            )
+        self.refilled = now
+
+    def is_idle(self, now: float) -> bool:
+        return (
+            not self.in_flight
+            and not self.waiting
+            and self.backoff_until <= now
+            and (self.rate <= 0 or self.tokens >= self.burst)
+        )
+
+
+class HostLimiter:
+    """
+    Schedule requests politely: per host and in total.
+
+    Every host gets a concurrency limit and a token bucket of ``rate``
+    requests per second with bursts of ``burst``. 429 and 503 responses
+    pause the host for its Retry-After, or an exponential backoff, and halve
+    its concurrency limit, which grows back by one with every successful
+    response. At most ``max_in_flight`` requests run at a time over all hosts.
+
+    The limiter is shared by threads and event loops, requests wait for
+    their turn up to ``queue_timeout`` seconds.
+
+    Args:
+        max_in_flight: Maximum number of requests over all hosts.
+        host_concurrency: Maximum number of requests per host.
+        host_rate: Requests per second per host, 0 for no rate limit.
+        host_burst: Requests a host may get at once after being idle.
+        max_backoff: Maximum seconds a host is paused after a 429 or 503.
+        queue_timeout: Seconds a request waits for its turn before failing.
+        host_limits: (requests per second, concurrency) of specific hosts,
+            e.g. of the Jina reader every crawl goes through.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = CRAWLER_MAX_IN_FLIGHT,
+        host_concurrency: int = CRAWLER_HOST_CONCURRENCY,
+        host_rate: float = CRAWLER_HOST_RATE,
+        host_burst: int = CRAWLER_HOST_BURST,
+        max_backoff: float = CRAWLER_MAX_BACKOFF_SECONDS,
+        queue_timeout: float = CRAWLER_HOST_QUEUE_TIMEOUT_SECONDS,
+        host_limits: Optional[dict[str, tuple[float, int]]] = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.host_concurrency = host_concurrency
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.max_backoff = max_backoff
+        self.queue_timeout = queue_timeout
+        self.host_limits = CRAWLER_HOST_LIMITS if host_limits is None else host_limits
+        self._hosts: dict[str, _Host] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def acquire(self, host: str) -> None:
+        """Wait for the turn of a request to a host."""
+        deadline = time.monotonic() + self.queue_timeout
+        with self._condition:
+            state = self._get_host(host)
+            state.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._try_acquire(state, now)
+                    if delay == 0:
+                        return
+                    self._condition.wait(self._wait_time(host, delay, deadline, now))
+            finally:
+                state.waiting -= 1
+
+    async def aacquire(self, host: str) -> None:
+        """Like :meth:`acquire`, without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + self.queue_timeout
+        with self._lock:
+            state = self._get_host(host)
+            state.waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    delay = self._try_acquire(state, now)
+                    if delay == 0:
+                        return
+                    timeout = self._wait_time(host, delay, deadline, now)
+                    # woken up by release, or when the delay is over
+                    released = loop.create_future()
+                    self._async_waiters.append((loop, released))
+                await asyncio.wait([released], timeout=timeout)
+                with self._lock:
+                    if (loop, released) in self._async_waiters:
+                        self._async_waiters.remove((loop, released))
+        finally:
+            with self._lock:
+                state.waiting -= 1
+
+    def release(
+        self,
+        host: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """End a request to a host, adapting the host to the response status."""
+        with self._condition:
+            now = time.monotonic()
+            state = self._get_host(host)
+            state.in_flight -= 1
+            self._in_flight -= 1
+            if status_code in BACKOFF_STATUS_CODES:
+                state.failures += 1
+                if retry_after is None:
+                    retry_after = 2 ** (state.failures - 1) * random.uniform(0.5, 1)
+                delay = min(retry_after, self.max_backoff)
+                state.backoff_until = max(state.backoff_until, now + delay)
+                state.limit = max(1, state.limit // 2)
+                logger.warning(
+                    f"{host} answered {status_code}, pausing it for {delay:.1f}s "
+                    f"with {state.limit} concurrent requests"
+                )
+            elif status_code is not None and status_code < 500:
+                state.failures = 0
+                state.limit = min(state.concurrency, state.limit + 1)
+            self._prune(now)
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, released in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, released)
+            except RuntimeError:
+                # the loop of the waiter is closed
+                pass
+
+    def stats(self) -> dict:
+        """Get the requests in flight and waiting, per host."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "waiting": sum(state.waiting for state in self._hosts.values()),
+                "hosts": {
+                    host: {
+                        "in_flight": state.in_flight,
+                        "waiting": state.waiting,
+                        "limit": state.limit,
+                        "backoff_seconds": round(
+                            max(0.0, state.backoff_until - now), 3
+                        ),
+                    }
+                    for host, state in self._hosts.items()
+                },
+            }
+
+    def _get_host(self, host: str) -> _Host:
+        state = self._hosts.get(host)
+        if state is None:
+            rate, concurrency = self.host_limits.get(
+                host, (self.host_rate, self.host_concurrency)
+            )
+            state = self._hosts[host] = _Host(concurrency, rate, self.host_burst)
+        return state
+
+    def _try_acquire(self, state: _Host, now: float) -> Optional[float]:
+        """Take a slot, returns 0 when taken, else the seconds to wait or None until a release."""
+        if now < state.backoff_until:
+            return state.backoff_until - now
+        if self._in_flight >= self.max_in_flight or state.in_flight >= state.limit:
+            return None
+        state.refill(now)
+        if state.rate > 0 and state.tokens < 1:
+            return (1 - state.tokens) / state.rate
+        if state.rate > 0:
+            state.tokens -= 1
+        state.in_flight += 1
+        self._in_flight += 1
+        return 0
+
+    def _wait_time(
+        self, host: str, delay: Optional[float], deadline: float, now: float
+    ) -> float:
+        if now >= deadline:
+            raise HostQueueTimeout(
+                f"No turn for a request to {host} within {self.queue_timeout} seconds"
+            )
+        return deadline - now if delay is None else min(delay, deadline - now)
+
+    def _prune(self, now: float) -> None:
+        if len(self._hosts) > _MAX_IDLE_HOSTS:
+            for host in [h for h, s in self._hosts.items() if s.is_idle(now)]:
+                del self._hosts[host]
+
+
+def _wake(released: asyncio.Future) -> None:
+    if not released.done():
+        released.set_result(None)
+
+
+_host_limiter: Optional[HostLimiter] = None
+_host_limiter_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostLimiter:
+    """Return the process-wide limiter of crawl requests."""
+    global _host_limiter
+    with _host_limiter_lock:
+        if _host_limiter is None:
+            _host_limiter = HostLimiter()
+        return _host_limiter
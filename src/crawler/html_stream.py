@@ -0,0 +1,202 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import codecs
+import logging
+import re
+from typing import Optional
+
+import httpx
+import lxml.html
+from lxml.etree import LxmlError
+
+from src.config.crawler import CRAWLER_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# bytes looked at to decide whether a body is HTML
+_SNIFF_BYTES = 1024
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+# types a mislabeled HTML page is served as
+_GENERIC_TYPES = ("", "text/plain", "application/octet-stream")
+_HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body")
+_BINARY_SIGNATURES = (
+    b"%PDF",
+    b"\x89PNG",
+    b"GIF8",
+    b"\xff\xd8\xff",
+    b"PK\x03\x04",
+    b"\x1f\x8b",
+    b"RIFF",
+    b"OggS",
+    b"ID3",
+)
+_META_CHARSET_PATTERN = re.compile(rb"<meta[^>]+charset=[\"']?([a-zA-Z0-9_\-]+)", re.I)
+
+
+class UnsupportedContentError(ValueError):
+    """Raised when a response is not an HTML page, e.g. a PDF or an image."""
+
+    def __init__(self, url: str, content_type: str, head: bytes = b""):
+        super().__init__(f"{url} is not an HTML page but {content_type or 'unknown'}")
+        self.url = url
+        self.content_type = content_type
+        # the first bytes of the body, to tell what it is instead
+        self.head = head
+
+
+class HTMLDocument(str):
+    """
+    The HTML of a page, parsed while it was downloaded.
+
+    It is the HTML string itself, so it can be used wherever the HTML is
+    expected, and carries the parsed ``tree`` for extractors that use it.
+    """
+
+    tree: Optional[lxml.html.HtmlElement] = None
+    truncated: bool = False
+    content_type: str = ""
+    # headers of the response, e.g. the cache validators of the origin
+    headers: Optional[httpx.Headers] = None
+
+
+def is_html(content_type: str, head: bytes) -> bool:
+    """Decide from its Content-Type and first bytes whether a body is HTML."""
+    if head.startswith(_BINARY_SIGNATURES) or b"\x00" in head[:_SNIFF_BYTES]:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in _HTML_TYPES:
+        return True
+    lowered = head[:_SNIFF_BYTES].lower()
+    return media_type in _GENERIC_TYPES and any(m in lowered for m in _HTML_MARKERS)
+
+
+class HTMLStream:
+    """
+    Decode and parse an HTML body chunk by chunk, up to ``max_bytes``.
+
+    The first bytes are sniffed before anything is parsed, so non-HTML
+    bodies are rejected before they are downloaded. Without ``parse`` the
+    body is only decoded, and the document has no ``tree``.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        content_type: str,
+        max_bytes: int = CRAWLER_MAX_BYTES,
+        parse: bool = True,
+    ):
+        self.url = url
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.truncated = False
+        self._head = b""
+        self._decoder = None
+        self._parser = lxml.html.HTMLParser() if parse else None
+        self._parts: list[str] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a chunk of the body, returns False once no more bytes are wanted."""
+        if self.bytes_read + len(chunk) > self.max_bytes:
+            chunk = chunk[: self.max_bytes - self.bytes_read]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) < _SNIFF_BYTES and not self.truncated:
+                return True
+            self._start()
+            chunk, self._head = self._head, b""
+        self._write(self._decoder.decode(chunk))
+        return not self.truncated
+
+    def close(self) -> HTMLDocument:
+        """Finish the body and return the parsed document."""
+        if self._decoder is None:
+            if not self._head:
+                raise UnsupportedContentError(self.url, self.content_type)
+            self._start()
+            self._write(self._decoder.decode(self._head))
+        self._write(self._decoder.decode(b"", final=True))
+        if self.truncated:
+            logger.warning(f"Truncated {self.url} after {self.max_bytes} bytes")
+        document = HTMLDocument("".join(self._parts))
+        if self._parser is not None:
+            try:
+                document.tree = self._parser.close()
+            except LxmlError:
+                document.tree = None
+        document.truncated = self.truncated
+        document.content_type = self.content_type
+        return document
+
+    def _start(self) -> None:
+        if not is_html(self.content_type, self._head):
+            raise UnsupportedContentError(self.url, self.content_type, self._head)
+        self._decoder = codecs.getincrementaldecoder(self._charset())(errors="replace")
+
+    def _write(self, text: str) -> None:
+        if text:
+            self._parts.append(text)
+            if self._parser is not None:
+                self._parser.feed(text)
+
+    def _charset(self) -> str:
+        match = re.search(r"charset=[\"']?([\w\-]+)", self.content_type, re.I)
+        charset = match.group(1) if match else None
+        if charset is None:
+            match = _META_CHARSET_PATTERN.search(self._head)
+            charset = match.group(1).decode("ascii") if match else "utf-8"
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            charset = "utf-8"
+        return charset
+
+
+def fetch_html(
+    client: httpx.Client,
+    method: str,
+    url: str,
+    max_bytes: int = CRAWLER_MAX_BYTES,
+    **kwargs,
+) -> HTMLDocument:
+    """Stream an HTML page, reading at most ``max_bytes`` of it."""
+    with client.stream(method, url, **kwargs) as response:
+        response.raise_for_status()
+        stream = HTMLStream(url, response.headers.get("Content-Type", ""), max_bytes)
+        # the chunks as they arrive, nothing is buffered ahead of the parser
+        for chunk in response.iter_bytes():
+            if not stream.feed(chunk):
+                break
+        document = stream.close()
+        document.headers = response.headers
+        return document
+
+
+async def afetch_html(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    max_bytes: int = CRAWLER_MAX_BYTES,
+    **kwargs,
+) -> HTMLDocument:
+    """
+    Like :func:`fetch_html`, without blocking the event loop.
+
+    The page is not parsed while it downloads, as parsing would run on the
+    event loop, and the extraction workers parse the HTML string anyway.
+    """
+    async with client.stream(method, url, **kwargs) as response:
+        response.raise_for_status()
+        stream = HTMLStream(
+            url, response.headers.get("Content-Type", ""), max_bytes, parse=False
+        )
+        async for chunk in response.aiter_bytes():
+            if not stream.feed(chunk):
+                break
+        document = stream.close()
+        document.headers = response.headers
+        return document
@@ -0,0 +1,328 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import functools
+import importlib.util
+import ipaddress
+import itertools
+import logging
+import socket
+import threading
+import weakref
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+import httpx
+
+from src.config.crawler import (
+    CRAWLER_ALLOW_PRIVATE_ADDRESSES,
+    CRAWLER_CONNECT_TIMEOUT_SECONDS,
+    CRAWLER_HTTP2,
+    CRAWLER_MAX_CONNECTIONS,
+    CRAWLER_MAX_KEEPALIVE_CONNECTIONS,
+    CRAWLER_MAX_RETRIES,
+    CRAWLER_TIMEOUT_SECONDS,
+)
+
+from .host_limiter import (
+    BACKOFF_STATUS_CODES,
+    HostLimiter,
+    get_host_limiter,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package, see httpx[http2]
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_sync_client: Optional[httpx.Client] = None
+_sync_client_lock = threading.Lock()
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+) = weakref.WeakKeyDictionary()
+
+
+class BlockedAddressError(httpx.ConnectError):
+    """Raised when a request is sent to a private, loopback or reserved address."""
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _check_addresses(request: httpx.Request, addresses: list[str]) -> None:
+    for address in addresses:
+        if not _is_public_address(address):
+            raise BlockedAddressError(
+                f"{request.url.host} resolves to the non-public address {address}",
+                request=request,
+            )
+
+
+def _literal_address(host: str) -> Optional[list[str]]:
+    try:
+        return [str(ipaddress.ip_address(host))]
+    except ValueError:
+        return None
+
+
+def _addresses(infos: list) -> list[str]:
+    return [info[4][0] for info in infos]
+
+
+def _port(request: httpx.Request) -> int:
+    return request.url.port or (443 if request.url.scheme == "https" else 80)
+
+
+def _check_host(request: httpx.Request) -> None:
+    """
+    Refuse a request to a host resolving to a non-public address.
+
+    Hosts that do not resolve are left to the transport, which fails to
+    connect to them.
+    """
+    addresses = _literal_address(request.url.host)
+    if addresses is None:
+        try:
+            infos = socket.getaddrinfo(
+                request.url.host, _port(request), type=socket.SOCK_STREAM
+            )
+        except OSError:
+            return
+        addresses = _addresses(infos)
+    _check_addresses(request, addresses)
+
+
+async def _acheck_host(request: httpx.Request) -> None:
+    """Like :func:`_check_host`, resolving the host without blocking."""
+    addresses = _literal_address(request.url.host)
+    if addresses is None:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                request.url.host, _port(request), type=socket.SOCK_STREAM
+            )
+        except OSError:
+            return
+        addresses = _addresses(infos)
+    _check_addresses(request, addresses)
+
+
+class _ReleasingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """A response body giving the request slot back once it is closed."""
+
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._give_back()
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._give_back()
+
+    def _give_back(self) -> None:
+        if not self._released:
+            self._released = True
+            self._release()
+
+
+def _hold_until_closed(
+    response: httpx.Response, release: Callable[[], None]
+) -> httpx.Response:
+    if response.is_closed:
+        # the body was read already, e.g. by a mock transport
+        release()
+    else:
+        response.stream = _ReleasingStream(response.stream, release)
+    return response
+
+
+def _should_retry(
+    limiter: HostLimiter, response: httpx.Response, attempt: int, max_retries: int
+) -> tuple[bool, Optional[float]]:
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    retry = (
+        response.status_code in BACKOFF_STATUS_CODES
+        and attempt < max_retries
+        and (retry_after is None or retry_after <= limiter.max_backoff)
+    )
+    return retry, retry_after
+
+
+class LimitedTransport(httpx.BaseTransport):
+    """
+    Send requests when the host limiter gives them their turn.
+
+    Requests answered with 429 or 503 are retried, up to ``max_retries``
+    times, once the host is no longer paused. The turn of a request ends
+    when its response is closed.
+
+    Unless ``allow_private_addresses`` is set, requests to hosts resolving to
+    private, loopback, link-local or reserved addresses are refused with a
+    :class:`BlockedAddressError`. Every redirect is a request of its own, so
+    redirects to such addresses are refused too.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        limiter: HostLimiter,
+        max_retries: int = CRAWLER_MAX_RETRIES,
+        allow_private_addresses: bool = CRAWLER_ALLOW_PRIVATE_ADDRESSES,
+    ):
+        self.transport = transport
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.allow_private_addresses = allow_private_addresses
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.allow_private_addresses:
+            _check_host(request)
+        host = request.url.host
+        for attempt in itertools.count():
+            self.limiter.acquire(host)
+            try:
+                response = self.transport.handle_request(request)
+            except BaseException:
+                self.limiter.release(host)
+                raise
+            retry, retry_after = _should_retry(
+                self.limiter, response, attempt, self.max_retries
+            )
+            if not retry:
+                return _hold_until_closed(
+                    response,
+                    functools.partial(
+                        self.limiter.release, host, response.status_code, retry_after
+                    ),
+                )
+            response.close()
+            self.limiter.release(host, response.status_code, retry_after)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncLimitedTransport(httpx.AsyncBaseTransport):
+    """Like :class:`LimitedTransport`, for the async clients."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        limiter: HostLimiter,
+        max_retries: int = CRAWLER_MAX_RETRIES,
+        allow_private_addresses: bool = CRAWLER_ALLOW_PRIVATE_ADDRESSES,
+    ):
+        self.transport = transport
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.allow_private_addresses = allow_private_addresses
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.allow_private_addresses:
+            await _acheck_host(request)
+        host = request.url.host
+        for attempt in itertools.count():
+            await self.limiter.aacquire(host)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except BaseException:
+                self.limiter.release(host)
+                raise
+            retry, retry_after = _should_retry(
+                self.limiter, response, attempt, self.max_retries
+            )
+            if not retry:
+                return _hold_until_closed(
+                    response,
+                    functools.partial(
+                        self.limiter.release, host, response.status_code, retry_after
+                    ),
+                )
+            await response.aclose()
+            self.limiter.release(host, response.status_code, retry_after)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _transport_options() -> dict:
+    return {
+        "http2": CRAWLER_HTTP2 and _HTTP2_AVAILABLE,
+        "limits": httpx.Limits(
+            max_connections=CRAWLER_MAX_CONNECTIONS,
+            max_keepalive_connections=CRAWLER_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    }
+
+
+def _client_options() -> dict:
+    return {
+        "timeout": httpx.Timeout(
+            CRAWLER_TIMEOUT_SECONDS, connect=CRAWLER_CONNECT_TIMEOUT_SECONDS
+        ),
+        "follow_redirects": True,
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide HTTP client of the blocking crawl path."""
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(
+                transport=LimitedTransport(
+                    httpx.HTTPTransport(**_transport_options()), get_host_limiter()
+                ),
+                **_client_options(),
+            )
+        return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the HTTP client of the running event loop.
+
+    Connections of an async client belong to the event loop that opened them,
+    so every loop gets its own pooled client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            transport=AsyncLimitedTransport(
+                httpx.AsyncHTTPTransport(**_transport_options()), get_host_limiter()
+            ),
+            **_client_options(),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the HTTP client of the running event loop and the blocking one."""
+    global _sync_client
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+    with _sync_client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
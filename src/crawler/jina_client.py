@@ -3,14 +3,41 @@
 
 import logging
 import os
+from typing import Optional
 
-import requests
+from .html_stream import afetch_html, fetch_html
+from .http_client import get_async_http_client, get_http_client
 
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+
 
 class JinaClient:
+    def __init__(self, timeout: Optional[float] = None):
+        # Per-request timeout in seconds, the client default when not set
+        self.timeout = timeout
+
     def crawl(self, url: str, return_format: str = "html") -> str:
+        options = self._request_options(url, return_format)
+        if return_format == "html":
+            # streamed and parsed as it arrives, up to CRAWLER_MAX_BYTES
+            return fetch_html(get_http_client(), "POST", JINA_READER_URL, **options)
+        response = get_http_client().post(JINA_READER_URL, **options)
+        response.raise_for_status()
+        return response.text
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
+        options = self._request_options(url, return_format)
+        if return_format == "html":
+            return await afetch_html(
+                get_async_http_client(), "POST", JINA_READER_URL, **options
+            )
+        response = await get_async_http_client().post(JINA_READER_URL, **options)
+        response.raise_for_status()
+        return response.text
+
+    def _request_options(self, url: str, return_format: str) -> dict:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
@@ -21,6 +48,7 @@ class JinaClient:
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
-        data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
-        return response.text
+        options = {"headers": headers, "json": {"url": url}}
+        if self.timeout is not None:
+            options["timeout"] = self.timeout
+        return options
@@ -0,0 +1,384 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import re
+from typing import Iterator, NamedTuple, Optional
+
+import lxml.html
+from lxml import etree
+from lxml.etree import ParserError
+
+# elements dropped with their content
+_SKIP_TAGS = frozenset(["script", "style", "noscript", "head", "template"])
+# elements starting and ending a block
+_BLOCK_TAGS = frozenset(
+    [
+        "p", "div", "section", "article", "main", "header", "footer", "aside",
+        "nav", "figure", "figcaption", "body", "html", "address", "details",
+        "summary", "form", "fieldset", "center", "dl", "dt", "dd",
+    ]
+)  # fmt: skip
+_HEADING_TAGS = frozenset(["h1", "h2", "h3", "h4", "h5", "h6"])
+# inline elements and their Markdown markers
+_EMPHASIS_MARKERS = {
+    "b": "**",
+    "strong": "**",
+    "i": "*",
+    "em": "*",
+    "code": "`",
+    "kbd": "`",
+    "samp": "`",
+    "del": "~~",
+    "s": "~~",
+    "strike": "~~",
+}
+_BULLETS = "*+-"
+_ESCAPE_PATTERN = re.compile(r"([*_])")
+
+
+class Image(NamedTuple):
+    """An image of the content, emitted as a block of its own."""
+
+    src: str
+    alt: str = ""
+    title: str = ""
+
+    @property
+    def markdown(self) -> str:
+        title = f' "{self.title}"' if self.title else ""
+        return f"![{self.alt}]({self.src}{title})"
+
+
+class _Frame:
+    """An element whose blocks are rendered together, e.g. a list item."""
+
+    def __init__(self, tag: str, **attributes):
+        self.tag = tag
+        # (markdown, whether it is a list) of each block
+        self.blocks: list[tuple[str, bool]] = []
+        self.__dict__.update(attributes)
+
+
+class MarkdownConverter:
+    """
+    Convert HTML to Markdown in a single pass over the lxml tree.
+
+    The output follows markdownify, which it replaces for crawled articles,
+    but blocks are emitted as soon as they are complete, images at the top
+    level as :class:`Image` blocks of their own, so consumers can stop early
+    and tell text and images apart without parsing the Markdown again.
+
+    Args:
+        max_chars: Stop converting once the Markdown reaches this length.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+
+    def convert(self, html: str) -> str:
+        """Convert an HTML fragment or document to Markdown."""
+        return "\n\n".join(
+            block.markdown if isinstance(block, Image) else block
+            for block in self.iter_blocks(parse_fragment(html))
+        )
+
+    def iter_blocks(self, root) -> Iterator["str | Image"]:
+        """Convert an element to Markdown blocks, e.g. paragraphs, lists and images."""
+        if root is None:
+            return
+        state = _Conversion()
+        remaining = self.max_chars
+        walker = etree.iterwalk(root, events=("start", "end", "comment", "pi"))
+        for event, element in walker:
+            if event == "start":
+                if state.start(element):
+                    walker.skip_subtree()
+            elif event == "end":
+                state.end(element)
+            else:
+                # the text after a comment belongs to the enclosing element
+                state.text(element.tail)
+            while state.output:
+                block = state.output.pop(0)
+                if remaining is not None:
+                    size = len(block.markdown if isinstance(block, Image) else block)
+                    if size > remaining:
+                        if isinstance(block, str) and remaining > 0:
+                            yield _truncate(block, remaining)
+                        return
+                    remaining -= size + 2
+                yield block
+        state.flush()
+        yield from state.output
+
+
+class _Conversion:
+    """The state of converting one tree, fed with the events of lxml."""
+
+    def __init__(self):
+        self.frames = [_Frame("root")]
+        self.output: list["str | Image"] = []
+        # inline text of the current block
+        self.inline: list[str] = []
+        # (marker, position in inline) of the open inline elements
+        self.open_inline: list[tuple[str, int]] = []
+        self.pre_depth = 0
+        self.code_depth = 0
+        self.link_depth = 0
+
+    def start(self, element) -> bool:
+        """Handle an element opening, returns True when its content is skipped."""
+        tag = element.tag.lower() if isinstance(element.tag, str) else None
+        if tag is None or tag in _SKIP_TAGS:
+            return True
+        if self.pre_depth:
+            if tag == "br":
+                self.inline.append("\n")
+        elif tag in _EMPHASIS_MARKERS:
+            self.open_inline.append((tag, len(self.inline)))
+            if tag in ("code", "kbd", "samp"):
+                self.code_depth += 1
+        elif tag == "a":
+            self.open_inline.append((tag, len(self.inline)))
+            self.link_depth += 1
+        elif tag == "br":
+            self.inline.append("\n")
+        elif tag == "img":
+            self._image(element)
+        elif tag in _BLOCK_TAGS or tag in _HEADING_TAGS:
+            self.flush()
+        elif tag in ("ul", "ol"):
+            self.flush()
+            depth = sum(frame.tag in ("ul", "ol") for frame in self.frames)
+            start = element.get("start", "1")
+            self.frames.append(
+                _Frame(
+                    tag,
+                    depth=depth,
+                    number=int(start) if start.isdigit() else 1,
+                )
+            )
+        elif tag == "li":
+            self.flush()
+            self.frames.append(_Frame(tag, bullet=self._bullet()))
+        elif tag == "blockquote":
+            self.flush()
+            self.frames.append(_Frame(tag))
+        elif tag == "pre":
+            self.flush()
+            self.pre_depth += 1
+        elif tag == "table":
+            self.flush()
+            self.frames.append(_Frame(tag, rows=[], header=False))
+        elif tag == "tr":
+            table = self._table()
+            if table is not None:
+                table.rows.append([])
+        elif tag in ("td", "th"):
+            self.flush()
+            table = self._table()
+            if tag == "th" and table is not None and len(table.rows) == 1:
+                table.header = True
+        elif tag == "hr":
+            self.flush()
+            self._add_block("---")
+        self.text(element.text)
+        return False
+
+    def end(self, element) -> None:
+        tag = element.tag.lower() if isinstance(element.tag, str) else None
+        if tag is None or tag in _SKIP_TAGS:
+            pass
+        elif tag == "pre":
+            self.pre_depth -= 1
+            if not self.pre_depth:
+                code = "".join(self.inline).strip("\n")
+                self.inline.clear()
+                self._add_block(f"```\n{code}\n```")
+        elif self.pre_depth:
+            pass
+        elif tag in _EMPHASIS_MARKERS:
+            self._close_inline(_EMPHASIS_MARKERS[tag])
+            if tag in ("code", "kbd", "samp"):
+                self.code_depth -= 1
+        elif tag == "a":
+            self._close_link(element.get("href"), element.get("title"))
+            self.link_depth -= 1
+        elif tag in _HEADING_TAGS:
+            text = " ".join(self._take_inline().split())
+            if tag == "h1" and text:
+                self._add_block(f"{text}\n{'=' * len(text)}")
+            elif tag == "h2" and text:
+                self._add_block(f"{text}\n{'-' * len(text)}")
+            elif text:
+                self._add_block(f"{'#' * int(tag[1])} {text}")
+        elif tag in _BLOCK_TAGS:
+            self.flush()
+        elif tag in ("ul", "ol") and self.frames[-1].tag == tag:
+            self.flush()
+            frame = self.frames.pop()
+            self._add_block("\n".join(text for text, _ in frame.blocks), True)
+        elif tag == "li" and self.frames[-1].tag == "li":
+            self.flush()
+            self._end_list_item(self.frames.pop())
+        elif tag == "blockquote" and self.frames[-1].tag == "blockquote":
+            self.flush()
+            frame = self.frames.pop()
+            text = "\n\n".join(text for text, _ in frame.blocks)
+            self._add_block(
+                "\n".join(f"> {line}" if line else ">" for line in text.split("\n"))
+            )
+        elif tag in ("td", "th"):
+            table = self._table()
+            cell = " ".join(self._take_inline().split()).replace("|", "\\|")
+            if table is not None and table.rows:
+                table.rows[-1].append(cell)
+        elif tag == "table" and self.frames[-1].tag == "table":
+            self.flush()
+            self._add_block(_render_table(self.frames.pop()))
+        self.text(element.tail)
+
+    def flush(self) -> None:
+        """End the inline text of the current block."""
+        text = self._take_inline()
+        lines = [" ".join(line.split()) for line in text.split("\n")]
+        self._add_block("  \n".join(line for line in lines if line))
+
+    def text(self, text: Optional[str]) -> None:
+        if not text:
+            return
+        if not self.pre_depth:
+            text = re.sub(r"\s+", " ", text)
+            if not self.code_depth:
+                text = _ESCAPE_PATTERN.sub(r"\\\1", text)
+        self.inline.append(text)
+
+    def _take_inline(self) -> str:
+        text = "".join(self.inline)
+        self.inline.clear()
+        self.open_inline = []
+        return text
+
+    def _close_inline(self, marker: str) -> None:
+        if not self.open_inline:
+            return
+        _, position = self.open_inline.pop()
+        content = "".join(self.inline[position:])
+        del self.inline[position:]
+        stripped = content.strip()
+        if not stripped:
+            self.inline.append(content)
+            return
+        leading = content[: len(content) - len(content.lstrip())]
+        trailing = content[len(content.rstrip()) :]
+        self.inline.append(f"{leading}{marker}{stripped}{marker}{trailing}")
+
+    def _close_link(self, href: Optional[str], title: Optional[str]) -> None:
+        if not self.open_inline:
+            return
+        _, position = self.open_inline.pop()
+        content = "".join(self.inline[position:])
+        del self.inline[position:]
+        stripped = content.strip()
+        if not href or not stripped:
+            self.inline.append(content)
+        elif stripped.replace("\\_", "_") == href and not title:
+            self.inline.append(f"<{href}>")
+        else:
+            title = f' "{title}"' if title else ""
+            self.inline.append(f"[{stripped}]({href}{title})")
+
+    def _image(self, element) -> None:
+        image = Image(
+            src=element.get("src") or "",
+            alt=" ".join((element.get("alt") or "").split()),
+            title=element.get("title") or "",
+        )
+        if not image.src:
+            return
+        if len(self.frames) == 1 and not self.link_depth and not self.code_depth:
+            # a block of its own, the text around it continues in a new block
+            self.flush()
+            self.output.append(image)
+        else:
+            self.inline.append(image.markdown)
+
+    def _add_block(self, text: str, is_list: bool = False) -> None:
+        if not text:
+            return
+        if len(self.frames) == 1:
+            self.output.append(text)
+        else:
+            self.frames[-1].blocks.append((text, is_list))
+
+    def _bullet(self) -> str:
+        frame = self.frames[-1]
+        if frame.tag == "ol":
+            frame.number += 1
+            return f"{frame.number - 1}. "
+        if frame.tag == "ul":
+            return f"{_BULLETS[frame.depth % len(_BULLETS)]} "
+        return f"{_BULLETS[0]} "
+
+    def _end_list_item(self, frame: _Frame) -> None:
+        text = ""
+        for i, (block, is_list) in enumerate(frame.blocks):
+            if i:
+                text += "\n" if is_list else "\n\n"
+            text += block
+        if not text:
+            return
+        indent = " " * len(frame.bullet)
+        lines = text.split("\n")
+        item = "\n".join(
+            [frame.bullet + lines[0]]
+            + [indent + line if line else "" for line in lines[1:]]
+        )
+        if self.frames[-1].tag in ("ul", "ol"):
+            self.frames[-1].blocks.append((item, True))
+        else:
+            self._add_block(item, True)
+
+    def _table(self) -> Optional[_Frame]:
+        for frame in reversed(self.frames):
+            if frame.tag == "table":
+                return frame
+        return None
+
+
+def _render_table(frame: _Frame) -> str:
+    rows = [row for row in frame.rows if row]
+    if not rows:
+        return ""
+    columns = max(len(row) for row in rows)
+    rows = [row + [""] * (columns - len(row)) for row in rows]
+    # markdownify writes an empty header for tables without one
+    header = rows.pop(0) if frame.header else [""] * columns
+    lines = [
+        f"| {' | '.join(header)} |",
+        f"| {' | '.join(['---'] * columns)} |",
+    ]
+    lines.extend(f"| {' | '.join(row)} |" for row in rows)
+    return "\n".join(lines)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    cut = text[:max_chars]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + "..."
+
+
+def parse_fragment(html: str):
+    """Parse an HTML fragment into a ``div`` element, None when there is none."""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fragment_fromstring(html, create_parent="div")
+    except (ParserError, ValueError):
+        return None
+
+
+def html_to_markdown(html: str, max_chars: Optional[int] = None) -> str:
+    """Convert HTML to Markdown, see :class:`MarkdownConverter`."""
+    return MarkdownConverter(max_chars).convert(html)
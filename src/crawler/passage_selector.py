@@ -0,0 +1,187 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Iterable, NamedTuple, Optional
+
+from src.utils.text_utils import estimate_tokens, tokenize_words, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# ATX headings and the setext headings written for h1 and h2
+_HEADING_PATTERN = re.compile(r"^#{1,6}\s|\n[=\-]{2,}$")
+_GAP = "[...]"
+
+
+class Passage(NamedTuple):
+    index: int
+    heading: Optional[str]
+    text: str
+    tokens: int
+
+
+class PassageSelector:
+    """
+    Select the passages of a page most relevant to a query within a token budget.
+
+    The Markdown blocks of a page are grouped into passages of about
+    ``passage_tokens`` under their section heading and ranked with BM25
+    against the query. The best passages that fit the budget are returned in
+    page order, with gaps marked. Without query terms, the leading passages
+    are kept. Blocks are consumed lazily: the conversion stops once the
+    budget is full without a query, or after ``scan_factor`` times the budget
+    with one.
+
+    Args:
+        passage_tokens: Target size of a passage.
+        scan_factor: How many times the budget is read from a page at most.
+        k1: BM25 term frequency saturation.
+        b: BM25 length normalization.
+    """
+
+    def __init__(
+        self,
+        passage_tokens: int = 150,
+        scan_factor: int = 20,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.passage_tokens = passage_tokens
+        self.scan_factor = scan_factor
+        self.k1 = k1
+        self.b = b
+
+    def select(self, blocks: Iterable[str], query: str, token_budget: int) -> str:
+        """Select passages from the Markdown blocks of a page."""
+        query_terms = set(tokenize_words(query or ""))
+        scan_limit = token_budget * (self.scan_factor if query_terms else 1)
+        passages, complete = self._split(blocks, scan_limit)
+        if complete and sum(p.tokens for p in passages) <= token_budget:
+            return "\n\n".join(p.text for p in passages)
+
+        scores = self._score(passages, query_terms) if query_terms else []
+        if not any(scores):
+            return self._lead(passages, token_budget)
+        order = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+        return self._assemble(passages, order, scores, token_budget)
+
+    def _split(
+        self, blocks: Iterable[str], scan_limit: int
+    ) -> tuple[list[Passage], bool]:
+        passages: list[Passage] = []
+        heading: Optional[str] = None
+        buffer: list[str] = []
+        buffer_tokens = 0
+        scanned = 0
+
+        def flush():
+            nonlocal buffer, buffer_tokens
+            if buffer:
+                passages.append(
+                    Passage(len(passages), heading, "\n\n".join(buffer), buffer_tokens)
+                )
+            buffer, buffer_tokens = [], 0
+
+        complete = True
+        for block in blocks:
+            if scanned >= scan_limit:
+                complete = False
+                break
+            tokens = estimate_tokens(block)
+            scanned += tokens
+            if _HEADING_PATTERN.search(block):
+                flush()
+                heading = block
+            elif buffer_tokens and buffer_tokens + tokens > self.passage_tokens:
+                flush()
+            buffer.append(block)
+            buffer_tokens += tokens
+        flush()
+        return passages, complete
+
+    def _score(self, passages: list[Passage], query_terms: set[str]) -> list[float]:
+        term_counts = [Counter(tokenize_words(p.text)) for p in passages]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        average_length = (sum(lengths) / len(lengths)) or 1
+        document_frequency = Counter(
+            term for counts in term_counts for term in query_terms if term in counts
+        )
+        scores = []
+        for counts, length in zip(term_counts, lengths):
+            score = 0.0
+            for term in query_terms:
+                frequency = counts.get(term, 0)
+                if not frequency:
+                    continue
+                df = document_frequency[term]
+                idf = math.log((len(passages) - df + 0.5) / (df + 0.5) + 1)
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                score += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+    def _lead(self, passages: list[Passage], token_budget: int) -> str:
+        texts = []
+        remaining = token_budget
+        for passage in passages:
+            if passage.tokens > remaining:
+                if remaining > self.passage_tokens // 3:
+                    texts.append(truncate_to_tokens(passage.text, remaining))
+                break
+            texts.append(passage.text)
+            remaining -= passage.tokens
+        return "\n\n".join(texts)
+
+    def _assemble(
+        self,
+        passages: list[Passage],
+        order: list[int],
+        scores: list[float],
+        token_budget: int,
+    ) -> str:
+        selected: set[int] = set()
+        remaining = token_budget
+        for i in order:
+            if remaining < self.passage_tokens // 3 or not scores[i]:
+                break
+            passage = passages[i]
+            # the section heading is kept when the passage does not start with it
+            heading_tokens = (
+                estimate_tokens(passage.heading) + 1
+                if passage.heading and not passage.text.startswith(passage.heading)
+                else 0
+            )
+            if passage.tokens + heading_tokens <= remaining:
+                selected.add(i)
+                remaining -= passage.tokens + heading_tokens
+
+        if not selected:
+            # even the most relevant passage is over the budget
+            return truncate_to_tokens(passages[order[0]].text, token_budget)
+
+        texts = []
+        previous = -1
+        shown_headings = set()
+        for i in sorted(selected):
+            passage = passages[i]
+            if i != previous + 1:
+                texts.append(_GAP)
+            if (
+                passage.heading
+                and passage.heading not in shown_headings
+                and not passage.text.startswith(passage.heading)
+            ):
+                texts.append(passage.heading)
+            shown_headings.add(passage.heading)
+            texts.append(passage.text)
+            previous = i
+        if previous != len(passages) - 1:
+            texts.append(_GAP)
+        logger.debug(
+            f"Selected {len(selected)} of {len(passages)} passages, "
+            f"{token_budget - remaining} of {token_budget} tokens"
+        )
+        return "\n\n".join(texts)
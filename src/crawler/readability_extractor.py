@@ -1,15 +1,48 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+from typing import Optional
+
 from readabilipy import simple_json_from_html_string
 
+from src.config.crawler import CRAWLER_EXTRACTION_FAST_PATH, CRAWLER_READABILITY_JS
+
 from .article import Article
+from .extraction_pool import get_extraction_pool
+from .simple_extractor import extract_simple_article
+
+
+def _extract_simple_article_markdown(html: str) -> Optional[Article]:
+    article = extract_simple_article(html)
+    if article is not None:
+        # convert while off the event loop, the Markdown is memoized
+        article.to_markdown()
+    return article
 
 
 class ReadabilityExtractor:
     def extract_article(self, html: str) -> Article:
-        article = simple_json_from_html_string(html, use_readability=True)
+        if CRAWLER_EXTRACTION_FAST_PATH:
+            article = extract_simple_article(html)
+            if article is not None:
+                return article
+        article = simple_json_from_html_string(
+            html, use_readability=CRAWLER_READABILITY_JS
+        )
         return Article(
             title=article.get("title"),
             html_content=article.get("content"),
         )
+
+    async def aextract_article(self, html: str) -> Article:
+        """Extract an article without blocking the event loop.
+
+        Simple pages are extracted in a thread, the others by the worker
+        processes of the extraction pool.
+        """
+        if CRAWLER_EXTRACTION_FAST_PATH:
+            article = await asyncio.to_thread(_extract_simple_article_markdown, html)
+            if article is not None:
+                return article
+        return await get_extraction_pool().extract(html)
@@ -0,0 +1,71 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from typing import Optional
+
+import lxml.html
+from lxml.etree import ParserError
+
+from .article import Article
+
+# elements that never belong to the article text
+_BOILERPLATE_XPATH = (
+    ".//script|.//style|.//noscript|.//nav|.//aside|.//footer|.//form"
+    "|.//iframe|.//button|.//svg"
+)
+# an article shorter than this is left to readability
+_MIN_TEXT_LENGTH = 200
+# share of the paragraph text of the page the article must hold
+_MIN_PARAGRAPH_SHARE = 0.8
+
+
+def _paragraph_text_length(element) -> int:
+    return sum(len(p.text_content().strip()) for p in element.iter("p"))
+
+
+def _find_title(tree) -> Optional[str]:
+    for xpath in (
+        "//meta[@property='og:title']/@content",
+        "//title/text()",
+        "//h1//text()",
+    ):
+        values = [value.strip() for value in tree.xpath(xpath) if value.strip()]
+        if values:
+            return values[0]
+    return None
+
+
+def extract_simple_article(html: str) -> Optional[Article]:
+    """
+    Extract the article of a simple page without readability.
+
+    A page is simple when it has exactly one ``<article>``, or else exactly one
+    ``<main>``, element that holds nearly all of the paragraph text of the page.
+    Returns None for every other page, which is then left to readability.
+    The tree of an :class:`HTMLDocument` parsed while it downloaded is used
+    rather than parsing the page again.
+    """
+    tree = getattr(html, "tree", None)
+    if tree is None:
+        try:
+            tree = lxml.html.fromstring(html)
+        except (ParserError, ValueError):
+            return None
+    candidates = tree.xpath("//article")
+    if len(candidates) != 1:
+        candidates = tree.xpath("//main")
+        if len(candidates) != 1:
+            return None
+    root = candidates[0]
+
+    total = _paragraph_text_length(tree)
+    if total and _paragraph_text_length(root) < total * _MIN_PARAGRAPH_SHARE:
+        return None
+    for element in root.xpath(_BOILERPLATE_XPATH):
+        element.drop_tree()
+    if len(root.text_content().strip()) < _MIN_TEXT_LENGTH:
+        return None
+    return Article(
+        title=_find_title(tree),
+        html_content=lxml.html.tostring(root, encoding="unicode"),
+    )
@@ -1,10 +1,15 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
-from src.prompts.planner_model import StepType
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.types import Send
 
+from src.config.configuration import Configuration
+from src.prompts.planner_model import Plan, StepType
+
+from .checkpointer import build_checkpointer
 from .types import State
 from .nodes import (
     coordinator_node,
@@ -23,13 +28,39 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def continue_to_running_research_team(state: State):
+def get_parallel_step_batch(current_plan: Plan, max_parallel_steps: int) -> list[int]:
+    """Return the indexes of the pending research steps that can run together.
+
+    Research steps only gather information, so consecutive pending research
+    steps do not depend on each other. Processing and image generation steps
+    usually build on earlier findings and keep running one at a time.
+    """
+    batch = []
+    for index, step in enumerate(current_plan.steps):
+        if step.execution_res:
+            continue
+        if step.step_type != StepType.RESEARCH or len(batch) >= max_parallel_steps:
+            break
+        batch.append(index)
+    return batch
+
+
+def continue_to_running_research_team(state: State, config: RunnableConfig = None):
     current_plan = state.get("current_plan")
     if not current_plan or isinstance(current_plan, str) or not hasattr(current_plan, 'steps') or not current_plan.steps:
         return "planner"
     if all(step.execution_res for step in current_plan.steps):
         return "planner"
-    
+
+    configurable = Configuration.from_runnable_config(config)
+    if configurable.enable_parallel_steps:
+        batch = get_parallel_step_batch(
+            current_plan, max(int(configurable.max_parallel_steps), 1)
+        )
+        if len(batch) > 1:
+            logger.info(f"Fanning out research steps {batch} in parallel")
+            return [Send("researcher", {**state, "step_index": i}) for i in batch]
+
     # Check for image generation handoff
     for step in current_plan.steps:
         if not step.execution_res:
@@ -70,11 +101,15 @@ def _build_base_graph():
     return builder
 
 
-def build_graph_with_memory():
-    """Build and return the agent workflow graph with memory."""
+def build_graph_with_memory(checkpointer: BaseCheckpointSaver = None):
+    """Build and return the agent workflow graph with memory.
+
+    Args:
+        checkpointer: The checkpointer to save conversation history with,
+            defaults to the backend selected by the ``CHECKPOINTER`` setting.
+    """
     # use persistent memory to save conversation history
-    # TODO: be compatible with SQLite / PostgreSQL
-    memory = MemorySaver()
+    memory = checkpointer or build_checkpointer()
 
     # build state graph
     builder = _build_base_graph()
@@ -0,0 +1,58 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from src.config.checkpointer import (
+    CHECKPOINTER_FINISHED_TTL_SECONDS,
+    CHECKPOINTER_IDLE_TTL_SECONDS,
+    CHECKPOINTER_INTERRUPT_TTL_SECONDS,
+    CHECKPOINTER_MAX_CHECKPOINTS_PER_THREAD,
+    CHECKPOINTER_MAX_THREADS,
+    CHECKPOINTER_THREAD_TTL_SECONDS,
+    SELECTED_CHECKPOINTER,
+    SQLITE_CHECKPOINTER_PATH,
+    CheckpointerBackend,
+)
+
+from ..finding_store import get_finding_store
+from .delta import DeltaCodec
+from .memory import BoundedMemorySaver, DeltaMemorySaver
+from .sqlite import SQLiteSaver
+
+
+def build_checkpointer(backend: str = SELECTED_CHECKPOINTER) -> BaseCheckpointSaver:
+    """
+    Build the checkpointer selected by the ``CHECKPOINTER`` setting.
+
+    The findings of a thread are removed together with its checkpoints.
+    """
+    on_delete_thread = get_finding_store().delete_thread
+    if backend == CheckpointerBackend.MEMORY.value:
+        return DeltaMemorySaver(on_delete_thread=on_delete_thread)
+    elif backend == CheckpointerBackend.BOUNDED_MEMORY.value:
+        return BoundedMemorySaver(
+            max_threads=CHECKPOINTER_MAX_THREADS,
+            idle_ttl=CHECKPOINTER_IDLE_TTL_SECONDS,
+            interrupt_ttl=CHECKPOINTER_INTERRUPT_TTL_SECONDS,
+            finished_ttl=CHECKPOINTER_FINISHED_TTL_SECONDS,
+            on_delete_thread=on_delete_thread,
+        )
+    elif backend == CheckpointerBackend.SQLITE.value:
+        return SQLiteSaver(
+            SQLITE_CHECKPOINTER_PATH,
+            max_checkpoints_per_thread=CHECKPOINTER_MAX_CHECKPOINTS_PER_THREAD,
+            thread_ttl_seconds=CHECKPOINTER_THREAD_TTL_SECONDS,
+            on_delete_thread=on_delete_thread,
+        )
+    else:
+        raise ValueError(f"Unsupported checkpointer: {backend}")
+
+
+__all__ = [
+    "BoundedMemorySaver",
+    "DeltaCodec",
+    "DeltaMemorySaver",
+    "SQLiteSaver",
+    "build_checkpointer",
+]
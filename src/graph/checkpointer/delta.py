@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+DELTA_PREFIX = "delta:"
+
+# (thread_id, checkpoint_ns, channel)
+BlobKey = tuple[str, str, str]
+
+
+class DeltaCodec:
+    """Delta encoding for list channel values stored by a checkpointer.
+
+    Append-only channels such as ``observations`` and ``messages`` grow by a
+    few items per superstep, yet every new channel version used to store the
+    whole list again, so checkpoint size grew quadratically with the number
+    of steps. The codec remembers the latest list written for each channel,
+    and when a new version extends it, only stores the appended tail and a
+    reference to the base version. A full snapshot is written every
+    ``max_chain`` versions to bound the cost of decoding.
+
+    Only values that really start with the previous list are delta encoded,
+    anything else (a reset, a removed message) falls back to a full blob.
+    """
+
+    def __init__(
+        self, serde: SerializerProtocol, max_chain: int = 32, cache_size: int = 1024
+    ) -> None:
+        self.serde = serde
+        self.max_chain = max_chain
+        self.cache_size = cache_size
+        # blob key -> (version, value, chain length) of the latest written list
+        self._latest: OrderedDict[BlobKey, tuple[str, list, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def dumps(self, key: BlobKey, version: Any, value: Any) -> tuple[str, bytes]:
+        """Serialize a channel value, as a delta against the latest list if possible."""
+        if not isinstance(value, list):
+            with self._lock:
+                self._latest.pop(key, None)
+            return self.serde.dumps_typed(value)
+
+        with self._lock:
+            latest = self._latest.pop(key, None)
+            delta = None
+            chain = 0
+            if latest is not None:
+                base_version, base, base_chain = latest
+                if (
+                    base_chain < self.max_chain
+                    and len(base) <= len(value)
+                    and value[: len(base)] == base
+                ):
+                    chain = base_chain + 1
+                    delta = (base_version, len(base), value[len(base) :])
+            self._latest[key] = (str(version), list(value), chain)
+            if len(self._latest) > self.cache_size:
+                self._latest.popitem(last=False)
+
+        if delta is None:
+            return self.serde.dumps_typed(value)
+        type_, data = self.serde.dumps_typed(list(delta))
+        return f"{DELTA_PREFIX}{type_}", data
+
+    def loads(
+        self,
+        typed: tuple[str, bytes],
+        load_blob: Callable[[str], Optional[tuple[str, bytes]]],
+    ) -> Any:
+        """Deserialize a channel value, resolving delta blobs through ``load_blob``.
+
+        Args:
+            typed: The stored ``(type, bytes)`` pair.
+            load_blob: Returns the stored pair of another version of the same channel.
+        """
+        tails = []
+        while typed[0].startswith(DELTA_PREFIX):
+            base_version, length, tail = self._loads_delta(typed)
+            tails.append((length, tail))
+            typed = load_blob(base_version)
+            if typed is None:
+                raise ValueError(f"Missing base version {base_version} of a delta blob")
+        value = self.serde.loads_typed(typed)
+        for length, tail in reversed(tails):
+            value = value[:length] + tail
+        return value
+
+    def base_version(self, typed: tuple[str, bytes]) -> Optional[str]:
+        """Return the version a delta blob is based on, ``None`` for full blobs."""
+        if not typed[0].startswith(DELTA_PREFIX):
+            return None
+        return self._loads_delta(typed)[0]
+
+    def forget(self, thread_id: str) -> None:
+        """Drop the cached lists of a thread, e.g. once its blobs are deleted."""
+        with self._lock:
+            for key in [k for k in self._latest if k[0] == thread_id]:
+                del self._latest[key]
+
+    def _loads_delta(self, typed: tuple[str, bytes]) -> tuple[str, int, list]:
+        base_version, length, tail = self.serde.loads_typed(
+            (typed[0][len(DELTA_PREFIX) :], typed[1])
+        )
+        return base_version, length, list(tail)
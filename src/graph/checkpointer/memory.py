@@ -0,0 +1,294 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import INTERRUPT, RESUME
+
+from .delta import DeltaCodec
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+INTERRUPTED = "interrupted"
+FINISHED = "finished"
+
+
+@dataclass
+class _ThreadInfo:
+    status: str = RUNNING
+    last_access: float = 0.0
+
+
+class DeltaMemorySaver(MemorySaver):
+    """An in-memory checkpoint saver that stores list channels as deltas.
+
+    See :class:`DeltaCodec`, append-only channels such as ``observations`` only
+    store the items appended since their previous version.
+
+    Args:
+        serde: The serializer to use for checkpoints, blobs and writes.
+        on_delete_thread: Called with the id of every deleted or evicted
+            thread, e.g. to remove the data kept beside its checkpoints.
+    """
+
+    def __init__(
+        self,
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        on_delete_thread: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.codec = DeltaCodec(self.serde)
+        self.on_delete_thread = on_delete_thread
+
+    def _load_blobs(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        channel_values: dict[str, Any] = {}
+        for k, v in versions.items():
+            blob = self.blobs.get((thread_id, checkpoint_ns, k, v))
+            if blob is not None and blob[0] != "empty":
+                channel_values[k] = self.codec.loads(
+                    blob,
+                    lambda base: self.blobs.get((thread_id, checkpoint_ns, k, base)),
+                )
+        return channel_values
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        c.pop("pending_sends")  # type: ignore[misc]
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+        for k, v in new_versions.items():
+            self.blobs[(thread_id, checkpoint_ns, k, v)] = (
+                self.codec.dumps((thread_id, checkpoint_ns, k), v, values[k])
+                if k in values
+                else ("empty", b"")
+            )
+        self.storage[thread_id][checkpoint_ns].update(
+            {
+                checkpoint["id"]: (
+                    self.serde.dumps_typed(c),
+                    self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+                    config["configurable"].get("checkpoint_id"),  # parent
+                )
+            }
+        )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self.codec.forget(thread_id)
+        self._thread_deleted(thread_id)
+
+    def _thread_deleted(self, thread_id: str) -> None:
+        if self.on_delete_thread is not None:
+            self.on_delete_thread(thread_id)
+
+
+class BoundedMemorySaver(DeltaMemorySaver):
+    """An in-memory checkpoint saver that evicts threads to keep memory bounded.
+
+    Every thread is tracked as running, interrupted (waiting on human feedback)
+    or finished, and is evicted once it has been idle for longer than the TTL
+    of its status. On top of that, at most ``max_threads`` threads are kept:
+    when the cap is exceeded the least recently used threads are evicted down
+    to ``low_watermark`` of the cap. Interrupted threads are never evicted by
+    the cap, only by their own timeout, so a pending plan review survives
+    bursts of traffic.
+
+    The graph cannot tell the saver that a run reached ``END``, so the caller
+    reports it with :meth:`mark_finished`.
+
+    Args:
+        max_threads: Maximum number of threads kept in memory, 0 disables the cap.
+        idle_ttl: Seconds a running thread may stay idle before it is evicted.
+        interrupt_ttl: Seconds an interrupted thread waits for feedback.
+        finished_ttl: Seconds a finished thread is kept for follow-up requests.
+        sweep_interval: Minimum number of seconds between two TTL sweeps.
+        low_watermark: Fraction of ``max_threads`` the cap eviction shrinks to.
+        serde: The serializer to use for checkpoints, blobs and writes.
+        on_delete_thread: Called with the id of every deleted or evicted thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_threads: int = 1000,
+        idle_ttl: float = 3600,
+        interrupt_ttl: float = 24 * 3600,
+        finished_ttl: float = 1800,
+        sweep_interval: float = 60,
+        low_watermark: float = 0.9,
+        serde: Optional[SerializerProtocol] = None,
+        on_delete_thread: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        super().__init__(serde=serde, on_delete_thread=on_delete_thread)
+        self.max_threads = max_threads
+        self.ttls = {
+            RUNNING: idle_ttl,
+            INTERRUPTED: interrupt_ttl,
+            FINISHED: finished_ttl,
+        }
+        self.sweep_interval = sweep_interval
+        self.low_watermark = low_watermark
+        self.evictions: Counter[str] = Counter()
+        self.threads: OrderedDict[str, _ThreadInfo] = OrderedDict()
+        self.lock = threading.RLock()
+        self._last_sweep = time.monotonic()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of live threads per status and the eviction counters."""
+        with self.lock:
+            statuses = Counter(info.status for info in self.threads.values())
+            return {
+                "threads": len(self.threads),
+                "running": statuses[RUNNING],
+                "interrupted": statuses[INTERRUPTED],
+                "finished": statuses[FINISHED],
+                "evictions": dict(self.evictions),
+            }
+
+    def mark_finished(self, thread_id: str) -> None:
+        """Mark a thread whose run has reached the end of the graph."""
+        self._touch(thread_id, FINISHED)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Evict expired threads, then enforce the thread cap.
+
+        Args:
+            keep: A thread that must survive the cap eviction, e.g. the one
+                that is being written right now.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._last_sweep = now
+            expired = [
+                (thread_id, info.status)
+                for thread_id, info in self.threads.items()
+                if now - info.last_access > self.ttls[info.status]
+            ]
+            for thread_id, status in expired:
+                self.evictions[f"{status}_ttl"] += 1
+            self._evict_threads([thread_id for thread_id, _ in expired])
+
+            if self.max_threads and len(self.threads) > self.max_threads:
+                target = int(self.max_threads * self.low_watermark)
+                excess = len(self.threads) - target
+                # threads are kept in least recently used order
+                victims = [
+                    thread_id
+                    for thread_id, info in self.threads.items()
+                    if info.status != INTERRUPTED and thread_id != keep
+                ][:excess]
+                self.evictions["lru"] += len(victims)
+                self._evict_threads(victims)
+                if len(self.threads) > self.max_threads:
+                    logger.warning(
+                        f"{len(self.threads)} threads exceed the checkpointer cap "
+                        f"of {self.max_threads}, most of them wait for feedback"
+                    )
+
+    def _evict_threads(self, thread_ids: list[str]) -> None:
+        if not thread_ids:
+            return
+        evicted = set(thread_ids)
+        for thread_id in evicted:
+            self.threads.pop(thread_id, None)
+            self.storage.pop(thread_id, None)
+            self.codec.forget(thread_id)
+        # one pass over the writes and blobs for the whole batch
+        for key in [k for k in self.writes if k[0] in evicted]:
+            del self.writes[key]
+        for key in [k for k in self.blobs if k[0] in evicted]:
+            del self.blobs[key]
+        for thread_id in evicted:
+            self._thread_deleted(thread_id)
+        logger.debug(f"Evicted {len(evicted)} checkpoint threads")
+
+    def _touch(self, thread_id: str, status: Optional[str] = None) -> None:
+        with self.lock:
+            info = self.threads.get(thread_id)
+            if info is None:
+                info = self.threads[thread_id] = _ThreadInfo()
+            else:
+                self.threads.move_to_end(thread_id)
+            if status:
+                info.status = status
+            info.last_access = time.monotonic()
+            if (
+                self.max_threads and len(self.threads) > self.max_threads
+            ) or info.last_access - self._last_sweep >= self.sweep_interval:
+                self.evict(keep=thread_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        with self.lock:
+            if thread_id not in self.threads:
+                # avoid creating empty entries in the storage defaultdict
+                return super().get_tuple(config) if thread_id in self.storage else None
+            self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self.lock:
+            self._touch(config["configurable"]["thread_id"], RUNNING)
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        channels = {channel for channel, _ in writes}
+        status = None
+        if INTERRUPT in channels:
+            status = INTERRUPTED
+        elif RESUME in channels:
+            status = RUNNING
+        with self.lock:
+            self._touch(config["configurable"]["thread_id"], status)
+            return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock:
+            self.threads.pop(thread_id, None)
+            super().delete_thread(thread_id)
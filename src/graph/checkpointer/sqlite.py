@@ -0,0 +1,591 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
+
+from .delta import DeltaCodec
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE INDEX IF NOT EXISTS checkpoints_updated_at ON checkpoints (updated_at);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class SQLiteSaver(BaseCheckpointSaver[str]):
+    """A durable checkpoint saver backed by a local SQLite database.
+
+    The database runs in WAL mode so readers never block the writer. Writes
+    are buffered in memory and committed in one transaction once ``batch_size``
+    rows are pending or ``flush_interval`` seconds have passed, and any read
+    flushes the buffer first so the graph always sees its own writes.
+
+    List channels are stored as deltas against their previous version, see
+    :class:`DeltaCodec`.
+
+    A retention policy keeps the database (and the page cache) from growing
+    without bound: only the latest ``max_checkpoints_per_thread`` checkpoints
+    of every thread are kept, and threads that have not been updated for
+    ``thread_ttl_seconds`` are dropped entirely.
+
+    Args:
+        path: Path of the SQLite database file, ``:memory:`` is supported.
+        batch_size: Number of pending rows that triggers a flush.
+        flush_interval: Maximum number of seconds a write stays buffered.
+        max_checkpoints_per_thread: Checkpoints kept per thread, 0 keeps all.
+        thread_ttl_seconds: Idle time after which a thread is deleted, 0 disables it.
+        prune_interval: Minimum number of seconds between two retention passes.
+        serde: The serializer to use for checkpoints, blobs and writes.
+        on_delete_thread: Called with the id of every deleted or pruned
+            thread, e.g. to remove the data kept beside its checkpoints.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+        max_checkpoints_per_thread: int = 20,
+        thread_ttl_seconds: float = 7 * 24 * 3600,
+        prune_interval: float = 60.0,
+        serde: Optional[SerializerProtocol] = None,
+        on_delete_thread: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.codec = DeltaCodec(self.serde)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.thread_ttl_seconds = thread_ttl_seconds
+        self.prune_interval = prune_interval
+        self.on_delete_thread = on_delete_thread
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+        self.lock = threading.RLock()
+        self._pending_checkpoints: list[tuple] = []
+        self._pending_blobs: list[tuple] = []
+        self._pending_writes: list[tuple] = []
+        self._pending_special_writes: list[tuple] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        self._last_prune = time.monotonic()
+
+    def __enter__(self) -> "SQLiteSaver":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "SQLiteSaver":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await asyncio.to_thread(self.close)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of rows waiting to be flushed."""
+        return (
+            len(self._pending_checkpoints)
+            + len(self._pending_blobs)
+            + len(self._pending_writes)
+            + len(self._pending_special_writes)
+        )
+
+    def close(self) -> None:
+        """Flush pending writes and close the database connection."""
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+    def flush(self) -> None:
+        """Commit all buffered rows in a single transaction."""
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self.pending_count:
+                with self._transaction():
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        self._pending_checkpoints,
+                    )
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                        self._pending_blobs,
+                    )
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        self._pending_writes,
+                    )
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        self._pending_special_writes,
+                    )
+                self._pending_checkpoints.clear()
+                self._pending_blobs.clear()
+                self._pending_writes.clear()
+                self._pending_special_writes.clear()
+            if time.monotonic() - self._last_prune >= self.prune_interval:
+                self.prune()
+
+    def prune(self) -> None:
+        """Apply the retention policy to the stored threads."""
+        expired = []
+        with self.lock, self._transaction():
+            self._last_prune = time.monotonic()
+            if self.thread_ttl_seconds > 0:
+                expired = [
+                    row[0]
+                    for row in self.conn.execute(
+                        "SELECT thread_id FROM checkpoints GROUP BY thread_id"
+                        " HAVING MAX(updated_at) < ?",
+                        (time.time() - self.thread_ttl_seconds,),
+                    )
+                ]
+                for thread_id in expired:
+                    self._delete_thread(thread_id)
+                if expired:
+                    logger.info(f"Pruned {len(expired)} expired checkpoint threads")
+            if self.max_checkpoints_per_thread > 0:
+                oversized = self.conn.execute(
+                    "SELECT thread_id, checkpoint_ns FROM checkpoints"
+                    " GROUP BY thread_id, checkpoint_ns HAVING COUNT(*) > ?",
+                    (self.max_checkpoints_per_thread,),
+                ).fetchall()
+                for thread_id, checkpoint_ns in oversized:
+                    self._trim_thread(thread_id, checkpoint_ns)
+        # once the deletion is committed
+        for thread_id in expired:
+            self._thread_deleted(thread_id)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _schedule_flush(self) -> None:
+        if self.pending_count >= self.batch_size:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _thread_deleted(self, thread_id: str) -> None:
+        if self.on_delete_thread is not None:
+            self.on_delete_thread(thread_id)
+
+    def _delete_thread(self, thread_id: str) -> None:
+        for table in ("checkpoints", "blobs", "writes"):
+            self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+        self.codec.forget(thread_id)
+
+    def _trim_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        rows = self.conn.execute(
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint"
+            " FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " ORDER BY checkpoint_id DESC",
+            (thread_id, checkpoint_ns),
+        ).fetchall()
+        kept = rows[: self.max_checkpoints_per_thread]
+        dropped = [(thread_id, checkpoint_ns, row[0]) for row in rows[len(kept) :]]
+        # writes of a parent are needed to rebuild the pending sends of its child
+        kept_ids = {row[0] for row in kept} | {row[1] for row in kept if row[1]}
+        self.conn.executemany(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " AND checkpoint_id = ?",
+            dropped,
+        )
+        self.conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ?"
+            " AND checkpoint_id = ?",
+            [row for row in dropped if row[2] not in kept_ids],
+        )
+        referenced = set()
+        for _, _, type_, checkpoint in kept:
+            versions = self.serde.loads_typed((type_, checkpoint))["channel_versions"]
+            for channel, version in versions.items():
+                # keep the whole chain of versions a delta blob is based on
+                version = str(version)
+                while version and (channel, version) not in referenced:
+                    referenced.add((channel, version))
+                    blob = self._get_blob(thread_id, checkpoint_ns, channel, version)
+                    version = blob and self.codec.base_version(blob)
+        stale_blobs = [
+            (thread_id, checkpoint_ns, channel, version)
+            for channel, version in self.conn.execute(
+                "SELECT channel, version FROM blobs"
+                " WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            )
+            if (channel, version) not in referenced
+        ]
+        self.conn.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?"
+            " AND channel = ? AND version = ?",
+            stale_blobs,
+        )
+        self.codec.forget(thread_id)
+
+    def _get_blob(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str
+    ) -> Optional[tuple[str, bytes]]:
+        return self.conn.execute(
+            "SELECT type, blob FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?"
+            " AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, version),
+        ).fetchone()
+
+    def _load_blobs(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        channel_values: dict[str, Any] = {}
+        for channel, version in versions.items():
+            blob = self._get_blob(thread_id, checkpoint_ns, channel, str(version))
+            if blob and blob[0] != "empty":
+                channel_values[channel] = self.codec.loads(
+                    blob,
+                    lambda base: self._get_blob(
+                        thread_id, checkpoint_ns, channel, base
+                    ),
+                )
+        return channel_values
+
+    def _load_writes(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> list[tuple]:
+        return self.conn.execute(
+            "SELECT task_id, channel, type, value, task_path, idx FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+    def _make_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple):
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata = row
+        if parent_checkpoint_id:
+            sends = sorted(
+                (
+                    w
+                    for w in self._load_writes(
+                        thread_id, checkpoint_ns, parent_checkpoint_id
+                    )
+                    if w[1] == TASKS
+                ),
+                key=lambda w: (w[4], w[0], w[5]),
+            )
+        else:
+            sends = []
+        checkpoint_: Checkpoint = self.serde.loads_typed((type_, checkpoint))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint_,
+                "channel_values": self._load_blobs(
+                    thread_id, checkpoint_ns, checkpoint_["channel_versions"]
+                ),
+                "pending_sends": [self.serde.loads_typed((s[2], s[3])) for s in sends],
+            },
+            metadata=metadata,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, value)))
+                for task_id, channel, type_, value, _, _ in self._load_writes(
+                    thread_id, checkpoint_ns, checkpoint_id
+                )
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get the requested checkpoint tuple, or the latest one of the thread."""
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint,"
+            " metadata_type, metadata FROM checkpoints"
+            " WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        with self.lock:
+            self.flush()
+            row = self.conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            metadata = self.serde.loads_typed((row[4], row[5]))
+            return self._make_tuple(thread_id, checkpoint_ns, (*row[:4], metadata))
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints matching the given criteria, newest first."""
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+            " type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (
+                checkpoint_ns := config["configurable"].get("checkpoint_ns")
+            ) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self.lock:
+            self.flush()
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row, metadata_type, metadata_b in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                metadata = self.serde.loads_typed((metadata_type, metadata_b))
+                if filter and not all(
+                    value == metadata.get(key) for key, value in filter.items()
+                ):
+                    continue
+                results.append(
+                    self._make_tuple(thread_id, checkpoint_ns, (*row, metadata))
+                )
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Buffer a checkpoint and the channel values that changed with it."""
+        c = checkpoint.copy()
+        c.pop("pending_sends")  # type: ignore[misc]
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+        blobs = [
+            (
+                thread_id,
+                checkpoint_ns,
+                k,
+                str(v),
+                *(
+                    self.codec.dumps((thread_id, checkpoint_ns, k), v, values[k])
+                    if k in values
+                    else ("empty", b"")
+                ),
+            )
+            for k, v in new_versions.items()
+        ]
+        row = (
+            thread_id,
+            checkpoint_ns,
+            checkpoint["id"],
+            config["configurable"].get("checkpoint_id"),  # parent
+            *self.serde.dumps_typed(c),
+            *self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+            time.time(),
+        )
+        with self.lock:
+            self._pending_blobs.extend(blobs)
+            self._pending_checkpoints.append(row)
+            self._schedule_flush()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Buffer the intermediate writes of a task."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self.lock:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                row = (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    write_idx,
+                    channel,
+                    *self.serde.dumps_typed(value),
+                    task_path,
+                )
+                # regular writes keep their first value, special writes are replaced
+                if write_idx >= 0:
+                    self._pending_writes.append(row)
+                else:
+                    self._pending_special_writes.append(row)
+            self._schedule_flush()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints, blobs and writes of a thread."""
+        with self.lock:
+            self.flush()
+            with self._transaction():
+                self._delete_thread(thread_id)
+        self._thread_deleted(thread_id)
+
+    # the async methods run the database I/O in a thread, off the event loop
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: [*self.list(config, filter=filter, before=before, limit=limit)]
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return await asyncio.to_thread(
+            self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: ChannelProtocol) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
@@ -0,0 +1,204 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+FINDING_REF_PREFIX = "finding:"
+_FINDING_REF_PATTERN = re.compile(r"^finding:[0-9a-f]{64}$")
+_SAFE_THREAD_ID = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def is_finding_ref(value) -> bool:
+    """Check whether a value is a reference returned by :meth:`FindingStore.put`."""
+    return isinstance(value, str) and bool(_FINDING_REF_PATTERN.match(value))
+
+
+def summarize_finding(text: str, max_chars: int = 300) -> str:
+    """Return a short preview of a finding, cut at a word boundary."""
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[: cut if cut > 0 else max_chars].rstrip() + "..."
+
+
+class FindingStore:
+    """A per-thread, content-addressed store for the full text of findings.
+
+    Agent findings used to live three times in the graph state (as the step
+    ``execution_res``, in ``messages`` and in ``observations``), and therefore
+    in every checkpoint. The state now only holds ``finding:<sha256>``
+    references and short summaries, and the text is stored here once.
+
+    Findings are written through to ``root_dir`` so they survive restarts
+    together with a durable checkpointer, and the most recently used ones are
+    kept in memory up to ``max_memory_bytes``. The findings of a thread are
+    removed with its checkpoints, see ``build_checkpointer``, and threads that
+    have not been used for ``thread_ttl`` seconds are removed as well.
+
+    Args:
+        root_dir: Directory the findings are stored in, one folder per thread.
+        max_memory_bytes: Size of the in-memory cache of findings.
+        thread_ttl: Idle time after which a thread is removed, 0 disables it.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        thread_ttl: float = 7 * 24 * 3600,
+    ) -> None:
+        self.root_dir = root_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.thread_ttl = thread_ttl
+        self.memory_bytes = 0
+        # (thread directory, digest) -> text of the most recently used findings
+        self._cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self._last_sweep = time.time()
+        self._lock = threading.RLock()
+
+    def put(self, thread_id: str, text: str) -> str:
+        """Store a finding and return its reference."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        thread_dir = self._thread_dir(thread_id)
+        path = os.path.join(thread_dir, f"{digest}.md")
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(thread_dir, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+            self._cache_put((thread_dir, digest), text)
+            self._touch(thread_dir)
+        return f"{FINDING_REF_PREFIX}{digest}"
+
+    def get(self, thread_id: str, ref: str) -> str:
+        """Return the text of a finding, raise ``KeyError`` if it is unknown."""
+        if not is_finding_ref(ref):
+            raise KeyError(ref)
+        digest = ref[len(FINDING_REF_PREFIX) :]
+        thread_dir = self._thread_dir(thread_id)
+        key = (thread_dir, digest)
+        with self._lock:
+            self._touch(thread_dir)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            try:
+                with open(
+                    os.path.join(thread_dir, f"{digest}.md"), encoding="utf-8"
+                ) as f:
+                    text = f.read()
+            except FileNotFoundError:
+                raise KeyError(ref) from None
+            self._cache_put(key, text)
+            return text
+
+    def resolve(self, thread_id: str, value: Optional[str]) -> Optional[str]:
+        """Return the text behind a reference, anything else is returned as is."""
+        if not is_finding_ref(value):
+            return value
+        try:
+            return self.get(thread_id, value)
+        except KeyError:
+            logger.warning(f"Finding {value} of thread {thread_id} is not available")
+            return "[finding unavailable]"
+
+    def resolve_messages(self, thread_id: str, messages: list) -> list:
+        """Return the messages with the summary of every finding replaced by its text.
+
+        Messages of findings carry their reference in
+        ``additional_kwargs["finding"]``, see ``_record_finding``. The other
+        messages, and the messages themselves, are left untouched.
+        """
+        resolved = []
+        for message in messages:
+            ref = getattr(message, "additional_kwargs", {}).get("finding")
+            if is_finding_ref(ref):
+                message = message.model_copy(
+                    update={"content": self.resolve(thread_id, ref)}
+                )
+            resolved.append(message)
+        return resolved
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Remove all findings of a thread."""
+        with self._lock:
+            self._drop(self._thread_dir(thread_id))
+
+    def sweep(self) -> None:
+        """Remove the threads that have been idle for longer than ``thread_ttl``."""
+        with self._lock:
+            now = time.time()
+            self._last_sweep = now
+            if self.thread_ttl <= 0 or not os.path.isdir(self.root_dir):
+                return
+            for name in os.listdir(self.root_dir):
+                thread_dir = os.path.join(self.root_dir, name)
+                last_access = self._last_access.get(thread_dir)
+                if last_access is None:
+                    # written by an earlier process
+                    last_access = os.path.getmtime(thread_dir)
+                if now - last_access > self.thread_ttl:
+                    self._drop(thread_dir)
+
+    def _drop(self, thread_dir: str) -> None:
+        for key in [k for k in self._cache if k[0] == thread_dir]:
+            self.memory_bytes -= len(self._cache.pop(key))
+        self._last_access.pop(thread_dir, None)
+        shutil.rmtree(thread_dir, ignore_errors=True)
+
+    def _touch(self, thread_dir: str) -> None:
+        now = time.time()
+        self._last_access[thread_dir] = now
+        if self.thread_ttl > 0 and now - self._last_sweep > min(self.thread_ttl, 3600):
+            self.sweep()
+
+    def _cache_put(self, key: tuple[str, str], text: str) -> None:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return
+        self._cache[key] = text
+        self.memory_bytes += len(text)
+        while self.memory_bytes > self.max_memory_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def _thread_dir(self, thread_id: str) -> str:
+        safe_id = _SAFE_THREAD_ID.sub("_", thread_id)
+        if safe_id != thread_id:
+            # keep distinct thread ids apart after sanitizing them
+            safe_id += "-" + hashlib.sha256(thread_id.encode()).hexdigest()[:8]
+        return os.path.join(self.root_dir, safe_id)
+
+
+_finding_store: Optional[FindingStore] = None
+
+
+def get_finding_store() -> FindingStore:
+    """Return the process-wide finding store configured from the environment."""
+    global _finding_store
+    if _finding_store is None:
+        _finding_store = FindingStore(
+            root_dir=os.getenv(
+                "FINDING_STORE_DIR",
+                os.path.join(tempfile.gettempdir(), "deer-flow", "findings"),
+            ),
+            max_memory_bytes=int(
+                os.getenv("FINDING_STORE_MAX_MEMORY_BYTES", str(64 * 1024 * 1024))
+            ),
+        )
+    return _finding_store
@@ -10,29 +10,40 @@ from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from langgraph.types import Command, interrupt
-from langchain_mcp_adapters.client import MultiServerMCPClient
 
 from src.agents import create_agent
+from src.tools.mcp_pool import get_mcp_session_pool
 from src.tools.search import LoggedTavilySearch
 from src.tools import (
+    crawl_batch_tool,
     crawl_tool,
+    get_web_search_batch_tool,
     get_web_search_tool,
     get_retriever_tool,
     python_repl_tool,
 )
 
-from src.config.agents import AGENT_LLM_MAP
+from src.config.agents import AGENT_CONTEXT_BUDGET, AGENT_LLM_MAP
 from src.config.configuration import Configuration
-from src.llms.llm import get_llm_by_type
+from src.llms.llm import (
+    get_llm_by_type,
+    get_llm_with_structured_output,
+    get_llm_with_tools,
+)
 from src.prompts.planner_model import Plan
 from src.prompts.template import apply_prompt_template
+from src.utils.compressor import compress_texts
 from src.utils.json_utils import repair_json_output
 
+from .finding_store import get_finding_store, summarize_finding
+from .step_context import StepContextBuilder
 from .types import State
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
 
 logger = logging.getLogger(__name__)
 
+step_context_builder = StepContextBuilder()
+
 
 @tool
 def handoff_to_planner(
@@ -107,11 +118,21 @@ def planner_node(
     """Planner node that create a plan for the research task."""
     logger.info("Planner creating a plan.")
     configurable = Configuration.from_runnable_config(config)
-    messages = apply_prompt_template("planner", state)
+    # the planner decides whether there is enough context on the full findings
+    messages = apply_prompt_template(
+        "planner",
+        {
+            **state,
+            "messages": get_finding_store().resolve_messages(
+                _get_thread_id(config), state["messages"]
+            ),
+        },
+    )
     plan_iterations = state["plan_iterations"] if state.get("plan_iterations", 0) else 0
 
     if AGENT_LLM_MAP["planner"] == "basic":
-        llm = get_llm_by_type(AGENT_LLM_MAP["planner"]).with_structured_output(
+        llm = get_llm_with_structured_output(
+            AGENT_LLM_MAP["planner"],
             Plan,
             method="json_mode",
         )
@@ -247,11 +268,9 @@ def coordinator_node(
     logger.info("Coordinator talking.")
     configurable = Configuration.from_runnable_config(config)
     messages = apply_prompt_template("coordinator", state)
-    response = (
-        get_llm_by_type(AGENT_LLM_MAP["coordinator"])
-        .bind_tools([handoff_to_planner])
-        .invoke(messages)
-    )
+    response = get_llm_with_tools(
+        AGENT_LLM_MAP["coordinator"], [handoff_to_planner]
+    ).invoke(messages)
     logger.debug(f"Current state messages: {state['messages']}")
 
     goto = "__end__"
@@ -283,6 +302,27 @@ def coordinator_node(
     )
 
 
+def _get_thread_id(config: RunnableConfig) -> str:
+    return (config or {}).get("configurable", {}).get("thread_id", "default")
+
+
+def _record_finding(
+    thread_id: str, agent_name: str, content: str
+) -> tuple[str, HumanMessage]:
+    """Store a finding and return its reference and a message summarizing it.
+
+    The full text lives in the finding store, the state only keeps the
+    reference and the summary, see :class:`FindingStore`.
+    """
+    ref = get_finding_store().put(thread_id, content)
+    message = HumanMessage(
+        content=summarize_finding(content),
+        name=agent_name,
+        additional_kwargs={"finding": ref},
+    )
+    return ref, message
+
+
 def reporter_node(state: State, config: RunnableConfig):
     """Reporter node that write a final report."""
     logger.info("Reporter write final report")
@@ -297,7 +337,20 @@ def reporter_node(state: State, config: RunnableConfig):
         "locale": state.get("locale", "en-US"),
     }
     invoke_messages = apply_prompt_template("reporter", input_, configurable)
-    observations = state.get("observations", [])
+    finding_store = get_finding_store()
+    thread_id = _get_thread_id(config)
+    observations = [
+        finding_store.resolve(thread_id, observation)
+        for observation in state.get("observations", [])
+    ]
+    max_observation_tokens = int(configurable.max_observation_tokens)
+    if max_observation_tokens > 0:
+        # keep the most informative sentences within the budget of the reporter
+        observations = compress_texts(
+            observations,
+            max_observation_tokens,
+            query=f"{current_plan.title} {current_plan.thought}",
+        )
 
     # Add a reminder about the new report format, citation style, and table usage
     invoke_messages.append(
@@ -322,10 +375,38 @@ def reporter_node(state: State, config: RunnableConfig):
     return {"final_report": response_content}
 
 
-def research_team_node(state: State):
+def _join_step_results(state: State, step_results: list[dict]) -> dict:
+    """Merge the results of parallel steps back into the plan in plan order."""
+    current_plan = state.get("current_plan").model_copy(deep=True)
+    observations = []
+    messages = []
+    for result in sorted(step_results, key=lambda r: r["index"]):
+        current_plan.steps[result["index"]].execution_res = result["finding"]
+        observations.append(result["finding"])
+        messages.append(
+            HumanMessage(
+                content=result["summary"],
+                name=result["agent"],
+                additional_kwargs={"finding": result["finding"]},
+            )
+        )
+    logger.info(f"Joined {len(step_results)} parallel step results")
+    return {
+        "current_plan": current_plan,
+        "observations": observations,
+        "messages": messages,
+        "step_results": None,
+    }
+
+
+def research_team_node(state: State, config: RunnableConfig = None):
     """Research team node that collaborates on tasks."""
     logger.info("Research team is collaborating on tasks.")
-    
+
+    step_results = state.get("step_results")
+    if step_results:
+        return _join_step_results(state, step_results)
+
     # Check if the last step contains image generation handoff
     current_plan = state.get("current_plan")
     if current_plan and hasattr(current_plan, 'steps') and current_plan.steps:
@@ -341,6 +422,10 @@ def research_team_node(state: State):
     messages = state.get("messages", [])
     if messages:
         last_message = messages[-1].content if messages[-1] else ""
+        if messages[-1] and "finding" in messages[-1].additional_kwargs:
+            last_message = get_finding_store().resolve(
+                _get_thread_id(config), messages[-1].additional_kwargs["finding"]
+            )
         if "HANDOFF_TO_IMAGE_GENERATOR:" in last_message:
             logger.info("Detected image generation handoff in messages, routing to image_generator")
             return "image_generator"
@@ -349,11 +434,10 @@ def research_team_node(state: State):
 
 
 async def _execute_agent_step(
-    state: State, agent, agent_name: str
+    state: State, agent, agent_name: str, thread_id: str = "default"
 ) -> Command[Literal["research_team"]]:
     """Helper function to execute a step using the specified agent."""
     current_plan = state.get("current_plan")
-    observations = state.get("observations", [])
 
     # Check if current_plan is a valid Plan object
     if not current_plan or isinstance(current_plan, str):
@@ -365,15 +449,22 @@ async def _execute_agent_step(
         logger.warning("No steps found in current plan")
         return Command(goto="research_team")
 
-    # Find the first unexecuted step
+    # Find the step dispatched by a parallel fan-out, or the first unexecuted step
     current_step = None
     completed_steps = []
-    for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
-        else:
-            completed_steps.append(step)
+    step_index = state.get("step_index")
+    if step_index is not None:
+        current_step = current_plan.steps[step_index]
+        completed_steps = [
+            step for step in current_plan.steps[:step_index] if step.execution_res
+        ]
+    else:
+        for step in current_plan.steps:
+            if not step.execution_res:
+                current_step = step
+                break
+            else:
+                completed_steps.append(step)
 
     if not current_step:
         logger.warning("No unexecuted step found")
@@ -381,13 +472,15 @@ async def _execute_agent_step(
 
     logger.info(f"Executing step: {current_step.title}, agent: {agent_name}")
 
-    # Format completed steps information
-    completed_steps_info = ""
-    if completed_steps:
-        completed_steps_info = "# Existing Research Findings\n\n"
-        for i, step in enumerate(completed_steps):
-            completed_steps_info += f"## Existing Finding {i + 1}: {step.title}\n\n"
-            completed_steps_info += f"<finding>\n{step.execution_res}\n</finding>\n\n"
+    # Format completed steps information within the token budget of the agent
+    finding_store = get_finding_store()
+    completed_steps_info = step_context_builder.build(
+        current_step,
+        completed_steps,
+        AGENT_CONTEXT_BUDGET.get(agent_name, 4000),
+        resolve=lambda ref: finding_store.resolve(thread_id, ref),
+        agent_name=agent_name,
+    )
 
     # Prepare the input for the agent with completed steps info
     agent_input = {
@@ -445,26 +538,45 @@ async def _execute_agent_step(
 
     logger.info(f"Agent input: {agent_input}")
     result = await agent.ainvoke(
-        input=agent_input, config={"recursion_limit": recursion_limit}
+        input=agent_input,
+        config={
+            "recursion_limit": recursion_limit,
+            # lets the crawl tools pick the passages relevant to the step
+            "step_query": f"{current_step.title}\n{current_step.description}",
+        },
     )
 
     # Process the result
     response_content = result["messages"][-1].content
     logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
+    finding_ref, message = _record_finding(thread_id, agent_name, response_content)
+
+    if step_index is not None:
+        # Parallel branches must not touch the shared plan, research_team joins
+        # their results in plan order once the whole batch has finished.
+        logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
+        return Command(
+            update={
+                "step_results": [
+                    {
+                        "index": step_index,
+                        "agent": agent_name,
+                        "finding": finding_ref,
+                        "summary": message.content,
+                    }
+                ]
+            },
+            goto="research_team",
+        )
 
     # Update the step with the execution result
-    current_step.execution_res = response_content
+    current_step.execution_res = finding_ref
     logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
 
     return Command(
         update={
-            "messages": [
-                HumanMessage(
-                    content=response_content,
-                    name=agent_name,
-                )
-            ],
-            "observations": observations + [response_content],
+            "messages": [message],
+            "observations": [finding_ref],
         },
         goto="research_team",
     )
@@ -493,6 +605,7 @@ async def _setup_and_execute_agent_step(
         Command to update state and go to research_team
     """
     configurable = Configuration.from_runnable_config(config)
+    thread_id = _get_thread_id(config)
     mcp_servers = {}
     enabled_tools = {}
 
@@ -513,20 +626,19 @@ async def _setup_and_execute_agent_step(
 
     # Create and execute agent with MCP tools if available
     if mcp_servers:
-        async with MultiServerMCPClient(mcp_servers) as client:
-            loaded_tools = default_tools[:]
-            for tool in client.get_tools():
-                if tool.name in enabled_tools:
-                    tool.description = (
-                        f"Powered by '{enabled_tools[tool.name]}'.\n{tool.description}"
-                    )
+        # warm sessions shared by all steps, see MCPSessionPool
+        pool = get_mcp_session_pool()
+        loaded_tools = default_tools[:]
+        for server_name, server_config in mcp_servers.items():
+            for tool in await pool.get_tools(server_config, server_name):
+                if enabled_tools.get(tool.name) == server_name:
                     loaded_tools.append(tool)
-            agent = create_agent(agent_type, agent_type, loaded_tools, agent_type)
-            return await _execute_agent_step(state, agent, agent_type)
+        agent = create_agent(agent_type, agent_type, loaded_tools, agent_type)
+        return await _execute_agent_step(state, agent, agent_type, thread_id)
     else:
         # Use default tools if no MCP servers are configured
         agent = create_agent(agent_type, agent_type, default_tools, agent_type)
-        return await _execute_agent_step(state, agent, agent_type)
+        return await _execute_agent_step(state, agent, agent_type, thread_id)
 
 
 async def researcher_node(
@@ -547,7 +659,9 @@ async def researcher_node(
     # Create researcher agent with all necessary tools
     tools = [
         get_web_search_tool(configurable.max_search_results),
+        get_web_search_batch_tool(configurable.max_search_results),
         crawl_tool,
+        crawl_batch_tool,
         handoff_to_image_generator,  # Add image generation tool
     ]
     retriever_tool = get_retriever_tool(state.get("resources", []))
@@ -607,9 +721,10 @@ async def image_generator_node(state: State, config: RunnableConfig) -> Command[
         prompt_template="image_generator"
     )
     
+    thread_id = _get_thread_id(config)
     config = {
         "configurable": {
-            "thread_id": "default",
+            "thread_id": thread_id,
             "max_plan_iterations": 10,
             "max_step_num": 10,
             "mcp_settings": {
@@ -668,7 +783,7 @@ async def image_generator_node(state: State, config: RunnableConfig) -> Command[
                     AIMessage(content="图片生成完成，请查看结果。", name="reporter")
                 ],
                 "current_plan": current_plan,
-                "observations": state.get("observations", []) + [generation_result]
+                "observations": [get_finding_store().put(thread_id, generation_result)]
             },
             goto="reporter"
         )
@@ -692,7 +807,7 @@ async def image_generator_node(state: State, config: RunnableConfig) -> Command[
                     AIMessage(content="图片生成失败，请查看错误信息。", name="reporter")
                 ],
                 "current_plan": current_plan,
-                "observations": state.get("observations", []) + [error_message]
+                "observations": [get_finding_store().put(thread_id, error_message)]
             },
             goto="reporter"
         )
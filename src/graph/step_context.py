@@ -0,0 +1,217 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, Optional
+
+from src.prompts.planner_model import Step
+from src.utils.text_utils import (
+    estimate_tokens,
+    split_sentences,
+    tokenize_words,
+    truncate_to_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+_MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_REFERENCES_HEADING = re.compile(
+    r"^#+\s*(references|sources|key citations|参考)", re.IGNORECASE | re.MULTILINE
+)
+
+
+def _render_full(number: int, step: Step, finding: str) -> str:
+    return (
+        f"## Existing Finding {number}: {step.title}\n\n"
+        f"<finding>\n{finding}\n</finding>\n\n"
+    )
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    dot = sum(count * b[word] for word, count in a.items() if word in b)
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(c * c for c in a.values()) * sum(c * c for c in b.values()))
+    return dot / norm
+
+
+class StepContextBuilder:
+    """Builds the existing research findings passed to the agent of a step.
+
+    Concatenating the full result of every completed step makes the prompt,
+    and with it latency and cost, grow quadratically with the plan length.
+    The builder keeps the full text of the earlier steps only while they fit
+    in the token budget of the agent. Otherwise the ``max_full_steps`` steps
+    most relevant to the current one keep their full text and the others are
+    folded into a rolling summary of earlier findings.
+
+    The summary of a finding is extracted once and cached by its finding
+    reference, so every completed step only adds its own summary to the
+    rolling summary instead of the whole context being rebuilt.
+
+    Args:
+        summary_tokens: Token budget of the summary of a single finding.
+        max_full_steps: Maximum number of earlier steps included in full.
+        cache_size: Number of finding summaries kept in memory.
+    """
+
+    def __init__(
+        self,
+        summary_tokens: int = 150,
+        max_full_steps: int = 2,
+        cache_size: int = 1024,
+    ) -> None:
+        self.summary_tokens = summary_tokens
+        self.max_full_steps = max_full_steps
+        self.cache_size = cache_size
+        self._summaries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def summarize(self, key: str, finding: str) -> str:
+        """Return the cached extractive summary of a finding, creating it if needed.
+
+        Args:
+            key: A stable key of the finding, e.g. its finding reference.
+            finding: The full text of the finding.
+        """
+        with self._lock:
+            if key in self._summaries:
+                self._summaries.move_to_end(key)
+                return self._summaries[key]
+
+        summary = self._extract_summary(finding)
+        with self._lock:
+            self._summaries[key] = summary
+            if len(self._summaries) > self.cache_size:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def build(
+        self,
+        current_step: Step,
+        completed_steps: list[Step],
+        token_budget: int,
+        resolve: Optional[Callable[[str], str]] = None,
+        agent_name: str = "agent",
+    ) -> str:
+        """Build the existing research findings section of a step prompt.
+
+        Args:
+            current_step: The step that is about to be executed.
+            completed_steps: The earlier steps with an execution result, in plan order.
+            token_budget: Maximum number of tokens of the section.
+            resolve: Turns an ``execution_res`` into the full text of the finding.
+            agent_name: The agent the context is built for, used for logging.
+        """
+        if not completed_steps:
+            return ""
+        resolve = resolve or (lambda value: value)
+        findings = [resolve(step.execution_res) for step in completed_steps]
+        header = "# Existing Research Findings\n\n"
+        full_context = header + "".join(
+            _render_full(i + 1, step, finding)
+            for i, (step, finding) in enumerate(zip(completed_steps, findings))
+        )
+        full_tokens = estimate_tokens(full_context)
+        if full_tokens <= token_budget:
+            return full_context
+
+        summaries = [
+            self.summarize(
+                step.execution_res
+                or hashlib.sha256(finding.encode("utf-8")).hexdigest(),
+                finding,
+            )
+            for step, finding in zip(completed_steps, findings)
+        ]
+        ranking = self._rank(current_step, completed_steps, summaries)
+        full_steps = ranking[: self.max_full_steps]
+        # token budget of every summary, 0 only keeps the step title
+        summary_lengths = {i: self.summary_tokens for i in range(len(findings))}
+
+        while True:
+            context = self._render(
+                completed_steps, findings, summaries, full_steps, summary_lengths
+            )
+            tokens = estimate_tokens(context)
+            if tokens <= token_budget:
+                break
+            if full_steps:
+                # the least relevant full finding falls back to its summary
+                full_steps = full_steps[:-1]
+                continue
+            # shorten the summaries, least relevant first
+            shrinkable = [i for i in reversed(ranking) if summary_lengths[i] > 0]
+            if not shrinkable:
+                break
+            summary_lengths[shrinkable[0]] //= 2
+            if summary_lengths[shrinkable[0]] < 20:
+                summary_lengths[shrinkable[0]] = 0
+
+        logger.info(
+            f"Existing findings for {agent_name}: {tokens} of {full_tokens} tokens, "
+            f"{len(full_steps)} of {len(completed_steps)} steps in full, "
+            f"saved {full_tokens - tokens} prompt tokens"
+        )
+        return context
+
+    def _render(
+        self,
+        steps: list[Step],
+        findings: list[str],
+        summaries: list[str],
+        full_steps: list[int],
+        summary_lengths: dict[int, int],
+    ) -> str:
+        context = "# Existing Research Findings\n\n"
+        summarized = [i for i in range(len(steps)) if i not in full_steps]
+        if summarized:
+            context += "## Summary of Earlier Findings\n\n"
+            for i in summarized:
+                summary = truncate_to_tokens(summaries[i], summary_lengths[i])
+                context += f"- **{steps[i].title}**"
+                context += f": {summary}\n" if summary else "\n"
+            context += "\n"
+        for i in sorted(full_steps):
+            context += _render_full(i + 1, steps[i], findings[i])
+        return context
+
+    def _rank(
+        self, current_step: Step, steps: list[Step], summaries: list[str]
+    ) -> list[int]:
+        """Rank the earlier steps by their relevance to the current step."""
+        query = Counter(
+            tokenize_words(f"{current_step.title} {current_step.description}")
+        )
+        scores = [
+            _cosine(
+                query,
+                Counter(tokenize_words(f"{step.title} {step.description} {summary}")),
+            )
+            for step, summary in zip(steps, summaries)
+        ]
+        # later steps win ties, they usually build on the earlier ones
+        return sorted(range(len(steps)), key=lambda i: (-scores[i], -i))
+
+    def _extract_summary(self, finding: str) -> str:
+        """Take the leading sentences of a finding, skipping headings and references."""
+        references = _REFERENCES_HEADING.search(finding)
+        if references:
+            finding = finding[: references.start()]
+        finding = _MARKDOWN_LINK.sub(r"\1", finding)
+        sentences = []
+        tokens = 0
+        for sentence in split_sentences(finding):
+            sentence = sentence.lstrip("#>-*| ").strip()
+            if len(sentence) < 2 or set(sentence) <= set("-|: "):
+                continue
+            tokens += estimate_tokens(sentence)
+            if sentences and tokens > self.summary_tokens:
+                break
+            sentences.append(sentence)
+        return truncate_to_tokens(" ".join(sentences), self.summary_tokens)
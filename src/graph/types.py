@@ -1,18 +1,27 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from typing import Annotated
+
 from langgraph.graph import MessagesState
 
 from src.prompts.planner_model import Plan
 from src.rag import Resource
 
 
+def append_list(left: list, right: list | None) -> list:
+    """Append-only reducer, nodes return only the new items and ``None`` resets."""
+    if right is None:
+        return []
+    return (left or []) + right
+
+
 class State(MessagesState):
     """State for the agent system, extends MessagesState with next field."""
 
     # Runtime Variables
     locale: str = "en-US"
-    observations: list[str] = []
+    observations: Annotated[list[str], append_list] = []
     resources: list[Resource] = []
     plan_iterations: int = 0
     current_plan: Plan | str = None
@@ -20,3 +29,4 @@ class State(MessagesState):
     auto_accepted_plan: bool = False
     enable_background_investigation: bool = True
     background_investigation_results: str = None
+    step_results: Annotated[list[dict], append_list] = []
@@ -1,10 +1,13 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import json
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Hashable, Sequence
 import os
 
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 
 from src.config import load_yaml_config
@@ -13,6 +16,11 @@ from src.config.agents import LLMType
 # Cache for LLM instances
 _llm_cache: dict[LLMType, ChatOpenAI] = {}
 
+# Cache for LLM instances bound to tools or to a structured output schema, the
+# objects the key was built from are kept alive next to the bound instance
+_bound_llm_cache: dict[tuple, tuple[tuple, Runnable]] = {}
+_bound_llm_lock = threading.Lock()
+
 
 def _get_env_llm_conf(llm_type: str) -> Dict[str, Any]:
     """
@@ -67,6 +75,62 @@ def get_llm_by_type(
     return llm
 
 
+def get_tool_set_signature(tools: Sequence[Any]) -> tuple[Hashable, ...]:
+    """
+    Get a hashable signature of a tool set, used to cache runnables bound to it.
+    Tools are identified by the object itself, because MCP tools with the same
+    name are bound to different sessions, and by their name, description and
+    argument schema, because those are copied into the LLM request when the
+    tools are bound and may be changed in place (e.g. MCP tool descriptions).
+    Callers must keep the tools alive as long as the signature is cached, so
+    that their ids are not reused.
+    """
+    signature = []
+    for tool in tools:
+        schema = getattr(tool, "args", None)
+        signature.append(
+            (
+                id(tool),
+                getattr(tool, "name", getattr(tool, "__name__", None)),
+                getattr(tool, "description", None),
+                json.dumps(schema, sort_keys=True, default=str) if schema else None,
+            )
+        )
+    return tuple(signature)
+
+
+def _get_bound_llm(key: tuple, pinned: tuple, build) -> Runnable:
+    with _bound_llm_lock:
+        if key in _bound_llm_cache:
+            return _bound_llm_cache[key][1]
+    bound = build()
+    with _bound_llm_lock:
+        return _bound_llm_cache.setdefault(key, (pinned, bound))[1]
+
+
+def get_llm_with_tools(llm_type: LLMType, tools: Sequence[Any]) -> Runnable:
+    """
+    Get the LLM of a type bound to tools. Returns cached instance if available.
+    """
+    llm = get_llm_by_type(llm_type)
+    key = ("tools", llm_type, id(llm), get_tool_set_signature(tools))
+    return _get_bound_llm(key, (llm, *tools), lambda: llm.bind_tools(list(tools)))
+
+
+def get_llm_with_structured_output(
+    llm_type: LLMType, schema: Any, **kwargs: Any
+) -> Runnable:
+    """
+    Get the LLM of a type with a structured output schema. Returns cached
+    instance if available.
+    """
+    llm = get_llm_by_type(llm_type)
+    key = ("structured", llm_type, id(llm), schema, tuple(sorted(kwargs.items())))
+    return _get_bound_llm(
+        key, (llm,), lambda: llm.with_structured_output(schema, **kwargs)
+    )
+
+
 # In the future, we will use reasoning_llm and vl_llm for different purposes
 # reasoning_llm = get_llm_by_type("reasoning")
 # vl_llm = get_llm_by_type("vision")
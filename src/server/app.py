@@ -1,22 +1,30 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from typing import Annotated, List, cast
 from uuid import uuid4
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, ToolMessage, BaseMessage
 from langgraph.types import Command
 
 from src.config.report_style import ReportStyle
 from src.config.tools import SELECTED_RAG_PROVIDER
+from src.crawler.crawl_cache import get_crawl_cache
+from src.crawler.extraction_pool import get_extraction_pool
+from src.crawler.host_limiter import get_host_limiter
+from src.crawler.http_client import close_http_clients
 from src.graph.builder import build_graph_with_memory
+from src.graph.checkpointer import BoundedMemorySaver, SQLiteSaver
+from src.graph.finding_store import get_finding_store
 from src.podcast.graph.builder import build_graph as build_podcast_graph
 from src.ppt.graph.builder import build_graph as build_ppt_graph
 from src.prose.graph.builder import build_graph as build_prose_graph
@@ -33,22 +41,44 @@ from src.server.chat_request import (
     TTSRequest,
 )
 from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
-from src.server.mcp_utils import load_mcp_tools
+from src.server.mcp_utils import load_mcp_tools, mcp_tool_cache
 from src.server.rag_request import (
     RAGConfigResponse,
     RAGResourceRequest,
     RAGResourcesResponse,
 )
 from src.tools import VolcengineTTS
+from src.tools.mcp_pool import get_mcp_session_pool
+from src.tools.search_cache import close_search_cache, get_search_cache
+from src.tools.tavily_search.http_session import close_sessions as close_tavily_sessions
+from src.utils.near_duplicates import get_near_duplicate_filter
 
 logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_DETAIL = "Internal Server Error"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # stop the MCP servers kept warm for the agent steps
+    await get_mcp_session_pool().close()
+    # close the pooled connections and extraction workers of the crawler
+    await close_http_clients()
+    get_extraction_pool().shutdown()
+    # close the keep-alive connections to the search API
+    await close_tavily_sessions()
+    await asyncio.to_thread(close_search_cache)
+    # commit the checkpoints still buffered, so no conversation state is lost
+    if isinstance(graph.checkpointer, SQLiteSaver):
+        await asyncio.to_thread(graph.checkpointer.close)
+
+
 app = FastAPI(
     title="DeerFlow API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -81,6 +111,8 @@ async def chat_stream(request: ChatRequest):
             request.mcp_settings,
             request.enable_background_investigation,
             request.report_style,
+            request.enable_parallel_steps,
+            request.max_parallel_steps,
         ),
         media_type="text/event-stream",
     )
@@ -98,13 +130,15 @@ async def _astream_workflow_generator(
     mcp_settings: dict,
     enable_background_investigation: bool,
     report_style: ReportStyle,
+    enable_parallel_steps: bool,
+    max_parallel_steps: int,
 ):
     input_ = {
         "messages": messages,
         "plan_iterations": 0,
         "final_report": "",
         "current_plan": None,
-        "observations": [],
+        "observations": None,  # reset the observations of a previous run
         "auto_accepted_plan": auto_accepted_plan,
         "enable_background_investigation": enable_background_investigation,
     }
@@ -114,6 +148,7 @@ async def _astream_workflow_generator(
         if messages:
             resume_msg += f" {messages[-1]['content']}"
         input_ = Command(resume=resume_msg)
+    interrupted = False
     async for agent, _, event_data in graph.astream(
         input_,
         config={
@@ -124,12 +159,15 @@ async def _astream_workflow_generator(
             "max_search_results": max_search_results,
             "mcp_settings": mcp_settings,
             "report_style": report_style.value,
+            "enable_parallel_steps": enable_parallel_steps,
+            "max_parallel_steps": max_parallel_steps,
         },
         stream_mode=["messages", "updates"],
         subgraphs=True,
     ):
         if isinstance(event_data, dict):
             if "__interrupt__" in event_data:
+                interrupted = True
                 yield _make_event(
                     "interrupt",
                     {
@@ -182,6 +220,10 @@ async def _astream_workflow_generator(
                 # AI Message - Raw message tokens
                 yield _make_event("message_chunk", event_stream_message)
 
+    if not interrupted and isinstance(graph.checkpointer, BoundedMemorySaver):
+        # the run reached the end of the graph, its thread can be evicted early
+        graph.checkpointer.mark_finished(thread_id)
+
 
 def _make_event(event_type: str, data: dict[str, any]):
     if data.get("content") == "":
@@ -357,14 +399,18 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
         if request.timeout_seconds is not None:
             timeout = request.timeout_seconds
 
-        # Load tools from the MCP server using the utility function
-        tools = await load_mcp_tools(
-            server_type=request.transport,
-            command=request.command,
-            args=request.args,
-            url=request.url,
-            env=request.env,
-            timeout_seconds=timeout,
+        # Load tools from the MCP server using the utility function, the tool
+        # lists are cached per server since the UI asks for them often
+        tools = await mcp_tool_cache.get_tools(
+            request.model_dump(include={"transport", "command", "args", "url", "env"}),
+            lambda: load_mcp_tools(
+                server_type=request.transport,
+                command=request.command,
+                args=request.args,
+                url=request.url,
+                env=request.env,
+                timeout_seconds=timeout,
+            ),
         )
 
         # Create the response with tools
@@ -385,6 +431,62 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
         raise
 
 
+@app.get("/api/crawler/cache/stats")
+async def crawler_cache_stats(thread_id: str | None = None):
+    """Get the hits and misses of the crawl cache, per research thread."""
+    cache = get_crawl_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Crawl cache is disabled")
+    return cache.stats(thread_id)
+
+
+@app.get("/api/crawler/hosts/stats")
+async def crawler_hosts_stats():
+    """Get the crawl requests in flight and waiting, per host."""
+    return get_host_limiter().stats()
+
+
+@app.get("/api/search/cache/stats")
+async def search_cache_stats():
+    """Get the hits, misses and coalesced searches of the search cache."""
+    cache = get_search_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Search cache is disabled")
+    return cache.stats()
+
+
+@app.get("/api/search/duplicates/stats")
+async def search_duplicates_stats(thread_id: str | None = None):
+    """Get the ratio of near-duplicate search results and pages, per research thread."""
+    duplicate_filter = get_near_duplicate_filter()
+    if duplicate_filter is None:
+        raise HTTPException(status_code=404, detail="Near-duplicate filter is disabled")
+    return duplicate_filter.stats(thread_id)
+
+
+@app.get("/api/mcp/pool/stats")
+async def mcp_pool_stats():
+    """Get the state of the pooled MCP servers."""
+    return get_mcp_session_pool().stats()
+
+
+@app.get("/api/checkpointer/stats")
+async def checkpointer_stats():
+    """Get the thread and eviction counters of the checkpointer."""
+    if isinstance(graph.checkpointer, BoundedMemorySaver):
+        return graph.checkpointer.stats()
+    return {}
+
+
+@app.get("/api/findings/{thread_id}/{finding_ref}", response_class=PlainTextResponse)
+async def get_finding(thread_id: str, finding_ref: str):
+    """Get the full text of a finding referenced from the graph state."""
+    try:
+        return get_finding_store().get(thread_id, finding_ref)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Finding not found")
+
+
 @app.get("/api/rag/config", response_model=RAGConfigResponse)
 async def rag_config():
     """Get the config of the RAG."""
@@ -62,6 +62,12 @@ class ChatRequest(BaseModel):
     report_style: Optional[ReportStyle] = Field(
         ReportStyle.ACADEMIC, description="The style of the report"
     )
+    enable_parallel_steps: Optional[bool] = Field(
+        False, description="Whether to run independent research steps in parallel"
+    )
+    max_parallel_steps: Optional[int] = Field(
+        3, description="The maximum number of steps running at the same time"
+    )
 
 
 class TTSRequest(BaseModel):
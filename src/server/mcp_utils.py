@@ -1,15 +1,27 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import json
 import logging
+import os
+import time
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 
+from src.config.mcp import (
+    MCP_TOOL_CACHE_MAX_STALE_SECONDS,
+    MCP_TOOL_CACHE_PATH,
+    MCP_TOOL_CACHE_TTL_SECONDS,
+)
+from src.tools.mcp_pool import get_server_config_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -102,3 +114,124 @@ async def load_mcp_tools(
             logger.exception(f"Error loading MCP tools: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
         raise
+
+
+class MCPToolCache:
+    """
+    Cache of the tools listed by MCP servers, keyed by their connection settings.
+
+    Listing the tools of a server spawns it or opens an SSE connection, which
+    is slow for a settings UI that asks often. Cached tool lists are served
+    for ``ttl`` seconds. For ``max_stale`` more seconds they are still served
+    right away while a background lookup refreshes them. Concurrent lookups of
+    the same server share one request to it. With a ``path``, the cache is
+    persisted as JSON so it survives restarts.
+
+    Args:
+        ttl: Seconds a tool list is served without revalidating it.
+        max_stale: Seconds an expired tool list is still served while revalidating.
+        path: Optional JSON file the cache is persisted to.
+        max_entries: Maximum number of servers kept in the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float = MCP_TOOL_CACHE_TTL_SECONDS,
+        max_stale: float = MCP_TOOL_CACHE_MAX_STALE_SECONDS,
+        path: Optional[str] = MCP_TOOL_CACHE_PATH or None,
+        max_entries: int = 256,
+    ) -> None:
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.path = path
+        self.max_entries = max_entries
+        # key -> (fetched at, tools as JSON compatible dicts)
+        self._entries: OrderedDict[str, Tuple[float, List[dict]]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"fresh": 0, "stale": 0, "miss": 0}
+        self._load_from_disk()
+
+    async def get_tools(
+        self, config: Dict[str, Any], load: Callable[[], Awaitable[List]]
+    ) -> List[dict]:
+        """
+        Get the tools of an MCP server, calling ``load`` when they are not cached.
+
+        Args:
+            config: The server settings (transport, command, args, url, env).
+            load: Lists the tools of the server.
+        """
+        key = get_server_config_key(config)
+        entry = self._entries.get(key)
+        if entry is not None:
+            fetched_at, tools = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                self.stats["fresh"] += 1
+                return tools
+            if age < self.ttl + self.max_stale:
+                self.stats["stale"] += 1
+                self._refresh(key, load)
+                return tools
+        self.stats["miss"] += 1
+        # a cancelled request must not cancel the lookup other requests wait on
+        return await asyncio.shield(self._refresh(key, load))
+
+    def invalidate(self, config: Dict[str, Any]) -> None:
+        """Drop the cached tools of an MCP server."""
+        if self._entries.pop(get_server_config_key(config), None) is not None:
+            self._save_to_disk()
+
+    def _refresh(self, key: str, load: Callable[[], Awaitable[List]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, load))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_fetched(key, t))
+        return task
+
+    async def _fetch(self, key: str, load: Callable[[], Awaitable[List]]) -> List[dict]:
+        tools = [
+            (
+                tool.model_dump(mode="json", by_alias=True)
+                if hasattr(tool, "model_dump")
+                else tool
+            )
+            for tool in await load()
+        ]
+        self._entries[key] = (time.time(), tools)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._save_to_disk()
+        return tools
+
+    def _on_fetched(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to list the MCP tools: {task.exception()!r}")
+
+    def _load_from_disk(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for key, (fetched_at, tools) in json.load(f).items():
+                    self._entries[key] = (fetched_at, tools)
+        except Exception as e:
+            logger.warning(f"Ignoring the MCP tool cache at {self.path}: {e!r}")
+
+    def _save_to_disk(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist the MCP tool cache: {e!r}")
+
+
+mcp_tool_cache = MCPToolCache()
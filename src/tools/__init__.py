@@ -3,16 +3,18 @@
 
 import os
 
-from .crawl import crawl_tool
+from .crawl import crawl_batch_tool, crawl_tool
 from .python_repl import python_repl_tool
 from .retriever import get_retriever_tool
-from .search import get_web_search_tool
+from .search import get_web_search_batch_tool, get_web_search_tool
 from .tts import VolcengineTTS
 
 __all__ = [
     "crawl_tool",
+    "crawl_batch_tool",
     "python_repl_tool",
     "get_web_search_tool",
+    "get_web_search_batch_tool",
     "get_retriever_tool",
     "VolcengineTTS",
 ]
@@ -1,28 +1,274 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
-from typing import Annotated
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Type
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
 
-from langchain_core.tools import tool
 from .decorators import log_io
+from .deduplication import get_thread_id
 
-from src.crawler import Crawler
+from src.config.crawler import (
+    CRAWLER_BATCH_CONCURRENCY,
+    CRAWLER_BATCH_MAX_URLS,
+    CRAWLER_BATCH_TOKEN_BUDGET,
+    CRAWLER_PAGE_TOKEN_BUDGET,
+)
+from src.crawler import Article, Crawler
+from src.crawler.crawl_cache import get_crawl_cache
+from src.crawler.passage_selector import PassageSelector
+from src.utils.near_duplicates import get_near_duplicate_filter
+from src.utils.text_utils import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 
-@tool
+class CrawlInput(BaseModel):
+    url: str = Field(description="The url to crawl.")
+
+
+class CrawlBatchInput(BaseModel):
+    urls: list[str] = Field(description="The urls to crawl.")
+
+
+passage_selector = PassageSelector()
+
+
+def _digest(article: Article, query: str, token_budget: int) -> str:
+    """Get the title and the passages of an article most relevant to the query."""
+    title = f"# {article.title}\n\n"
+    passages = passage_selector.select(
+        article.iter_markdown_blocks(), query, token_budget - estimate_tokens(title)
+    )
+    return title + passages
+
+
+def _article_text(article: Article) -> str:
+    # documents like PDFs come as Markdown only
+    return article.to_text() or article.markdown or ""
+
+
+def _find_original(url: str, text: str, thread_id: Optional[str]) -> Optional[str]:
+    """Get the url of the page seen by the thread that the crawled page repeats."""
+    duplicate_filter = get_near_duplicate_filter()
+    if duplicate_filter is None or thread_id is None:
+        return None
+    return duplicate_filter.check(thread_id, url, text)
+
+
+def _format_article(
+    url: str, article: Article, query: str, thread_id: Optional[str] = None
+) -> dict:
+    original = _find_original(url, _article_text(article), thread_id)
+    if original:
+        return {"url": url, "duplicate_of": original}
+    return {
+        "url": url,
+        "crawled_content": _digest(article, query, CRAWLER_PAGE_TOKEN_BUDGET),
+    }
+
+
+def _format_error(e: BaseException) -> str:
+    error_msg = f"Failed to crawl. Error: {repr(e)}"
+    logger.error(error_msg)
+    return error_msg
+
+
+def _get_crawler(config: Optional[RunnableConfig]) -> Crawler:
+    """Get a crawler using the crawl cache on behalf of the research thread."""
+    thread_id = get_thread_id(config) or "default"
+    return Crawler(cache=get_crawl_cache(), thread_id=thread_id)
+
+
+def _get_step_query(config: Optional[RunnableConfig]) -> str:
+    """Get the query of the research step the tool runs for, see _execute_agent_step."""
+    return (config or {}).get("configurable", {}).get("step_query", "")
+
+
 @log_io
-def crawl_tool(
-    url: Annotated[str, "The url to crawl."],
-) -> str:
-    """Use this to crawl a url and get a readable content in markdown format."""
+def crawl(
+    url: str, crawler: Crawler, query: str = "", thread_id: Optional[str] = None
+) -> dict | str:
     try:
-        crawler = Crawler()
-        article = crawler.crawl(url)
-        return {"url": url, "crawled_content": article.to_markdown()[:1000]}
+        return _format_article(url, crawler.crawl(url), query, thread_id)
     except BaseException as e:
-        error_msg = f"Failed to crawl. Error: {repr(e)}"
-        logger.error(error_msg)
-        return error_msg
+        return _format_error(e)
+
+
+@log_io
+async def acrawl(
+    url: str, crawler: Crawler, query: str = "", thread_id: Optional[str] = None
+) -> dict | str:
+    try:
+        article = await crawler.acrawl(url)
+        return await asyncio.to_thread(_format_article, url, article, query, thread_id)
+    except Exception as e:
+        return _format_error(e)
+
+
+class CrawlTool(BaseTool):
+    name: str = "crawl_tool"
+    description: str = (
+        "Use this to crawl a url and get a readable content in markdown format."
+    )
+    args_schema: Type[BaseModel] = CrawlInput
+
+    def _run(
+        self,
+        url: str,
+        config: RunnableConfig,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> dict | str:
+        return crawl(
+            url, _get_crawler(config), _get_step_query(config), get_thread_id(config)
+        )
+
+    async def _arun(
+        self,
+        url: str,
+        config: RunnableConfig,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> dict | str:
+        return await acrawl(
+            url, _get_crawler(config), _get_step_query(config), get_thread_id(config)
+        )
+
+
+crawl_tool = CrawlTool()
+
+
+def _allocate_budget(token_counts: list[int], budget: int) -> list[int]:
+    """Split a token budget over pages, short pages leave their share to long ones."""
+    allocation = [0] * len(token_counts)
+    remaining = budget
+    order = sorted(range(len(token_counts)), key=lambda i: token_counts[i])
+    for position, i in enumerate(order):
+        share = remaining // (len(order) - position)
+        allocation[i] = min(token_counts[i], share)
+        remaining -= allocation[i]
+    return allocation
+
+
+def _format_batch(
+    urls: list[str],
+    results: list[Article | BaseException],
+    budget: int,
+    query: str,
+    thread_id: Optional[str] = None,
+) -> list[dict]:
+    texts = [
+        _article_text(result) if isinstance(result, Article) else ""
+        for result in results
+    ]
+    # near duplicates leave their share of the budget to the other pages
+    originals = [
+        _find_original(url, text, thread_id) if text else None
+        for url, text in zip(urls, texts)
+    ]
+    # sized by their plain text, with a margin for the Markdown syntax, so the
+    # pages are not converted to Markdown beyond what their digest needs
+    sizes = [
+        (
+            int(estimate_tokens(f"# {result.title}\n\n{text}") * 1.25) + 16
+            if isinstance(result, Article) and not original
+            else 0
+        )
+        for result, text, original in zip(results, texts, originals)
+    ]
+    allocation = _allocate_budget(sizes, budget)
+    digests = []
+    for url, result, original, max_tokens in zip(urls, results, originals, allocation):
+        if isinstance(result, BaseException):
+            digests.append({"url": url, "error": _format_error(result)})
+        elif original:
+            digests.append({"url": url, "duplicate_of": original})
+        else:
+            digests.append(
+                {"url": url, "crawled_content": _digest(result, query, max_tokens)}
+            )
+    return digests
+
+
+def _select_urls(urls: list[str], max_urls: int) -> list[str]:
+    selected = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+    if len(selected) > max_urls:
+        logger.warning(f"Crawling the first {max_urls} of {len(selected)} urls")
+    return selected[:max_urls]
+
+
+class CrawlBatchTool(BaseTool):
+    name: str = "crawl_batch_tool"
+    description: str = (
+        "Use this to crawl several urls at once and get a readable digest of each "
+        "page in markdown format. Prefer it over calling crawl_tool once per url."
+    )
+    args_schema: Type[BaseModel] = CrawlBatchInput
+
+    concurrency: int = CRAWLER_BATCH_CONCURRENCY
+    max_urls: int = CRAWLER_BATCH_MAX_URLS
+    token_budget: int = CRAWLER_BATCH_TOKEN_BUDGET
+
+    def _run(
+        self,
+        urls: list[str],
+        config: RunnableConfig,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> list[dict]:
+        urls = _select_urls(urls, self.max_urls)
+        if not urls:
+            return []
+        crawler = _get_crawler(config)
+
+        def crawl_one(url: str) -> Article | BaseException:
+            try:
+                return crawler.crawl(url)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(crawl_one, urls))
+        return _format_batch(
+            urls,
+            results,
+            self.token_budget,
+            _get_step_query(config),
+            get_thread_id(config),
+        )
+
+    async def _arun(
+        self,
+        urls: list[str],
+        config: RunnableConfig,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> list[dict]:
+        urls = _select_urls(urls, self.max_urls)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        crawler = _get_crawler(config)
+
+        async def crawl_one(url: str) -> Article:
+            async with semaphore:
+                return await crawler.acrawl(url)
+
+        results = await asyncio.gather(
+            *(crawl_one(url) for url in urls), return_exceptions=True
+        )
+        return await asyncio.to_thread(
+            _format_batch,
+            urls,
+            results,
+            self.token_budget,
+            _get_step_query(config),
+            get_thread_id(config),
+        )
+
+
+crawl_batch_tool = CrawlBatchTool()
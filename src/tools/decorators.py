@@ -3,6 +3,7 @@
 
 import logging
 import functools
+import inspect
 import json
 from typing import Any, Callable, Type, TypeVar
 
@@ -54,20 +55,33 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Log input parameters
-        func_name = func.__name__
+    def log_input(*args: Any, **kwargs: Any) -> None:
         params = ", ".join(
             [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
         )
-        logger.info(f"Tool {func_name} called with parameters: {params}")
+        logger.info(f"Tool {func.__name__} called with parameters: {params}")
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            log_input(*args, **kwargs)
+            result = await func(*args, **kwargs)
+            logger.info(f"Tool {func.__name__} returned: {result}")
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Log input parameters
+        log_input(*args, **kwargs)
 
         # Execute the function
         result = func(*args, **kwargs)
 
         # Log the output
-        logger.info(f"Tool {func_name} returned: {result}")
+        logger.info(f"Tool {func.__name__} returned: {result}")
 
         return result
 
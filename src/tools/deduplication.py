@@ -0,0 +1,122 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import logging
+from typing import Any, Optional, Type, TypeVar
+
+from langchain_core.runnables import RunnableConfig
+
+from src.utils.near_duplicates import get_near_duplicate_filter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# fields carrying the text of a search result
+_TEXT_FIELDS = ("raw_content", "content", "snippet")
+
+
+def get_thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    """Get the research thread a tool runs for, None outside of a thread."""
+    return (config or {}).get("configurable", {}).get("thread_id")
+
+
+def collapse_duplicate_results(results: Any, thread_id: Optional[str]) -> Any:
+    """
+    Collapse the search results repeating a page the research thread has seen.
+
+    Results are lists of pages like the ones of ``clean_results_with_images``,
+    possibly as JSON or as the content of a (content, artifact) tuple. A near
+    duplicate keeps its title and url, its text is replaced by the url of the
+    page it repeats. Other outputs are returned unchanged.
+    """
+    duplicate_filter = get_near_duplicate_filter()
+    if duplicate_filter is None or thread_id is None:
+        return results
+    if isinstance(results, tuple):
+        return (collapse_duplicate_results(results[0], thread_id), *results[1:])
+    if isinstance(results, str):
+        try:
+            parsed = json.loads(results)
+        except ValueError:
+            return results
+        if not isinstance(parsed, list):
+            return results
+        collapsed = collapse_duplicate_results(parsed, thread_id)
+        return json.dumps(collapsed, ensure_ascii=False)
+    if not isinstance(results, list):
+        return results
+    collapsed = []
+    for result in results:
+        text = _result_text(result)
+        original = text and duplicate_filter.check(
+            thread_id, result.get("url") or result.get("link") or "", text
+        )
+        if original:
+            result = {
+                key: value for key, value in result.items() if key not in _TEXT_FIELDS
+            }
+            result["duplicate_of"] = original
+        collapsed.append(result)
+    return collapsed
+
+
+def _result_text(result: Any) -> str:
+    if not isinstance(result, dict) or result.get("type", "page") != "page":
+        return ""
+    for key in _TEXT_FIELDS:
+        if isinstance(result.get(key), str) and result[key]:
+            # the full page when the agent is shown it, the snippet otherwise
+            return result[key]
+    return ""
+
+
+class DeduplicatedSearchMixin:
+    """A mixin collapsing the search results a research thread has already seen."""
+
+    def _run(
+        self,
+        *args: Any,
+        config: RunnableConfig = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Any:
+        results = super()._run(*args, run_manager=run_manager, **kwargs)
+        return collapse_duplicate_results(results, get_thread_id(config))
+
+    async def _arun(
+        self,
+        *args: Any,
+        config: RunnableConfig = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Any:
+        results = await super()._arun(*args, run_manager=run_manager, **kwargs)
+        return await asyncio.to_thread(
+            collapse_duplicate_results, results, get_thread_id(config)
+        )
+
+
+def create_deduplicated_tool(base_tool_class: Type[T]) -> Type[T]:
+    """
+    Factory function to create a version of a search tool class whose results
+    are filtered for near duplicates.
+
+    Only the tools whose results reach the agent are to be deduplicated, e.g.
+    not the engines of a meta search, which would drop the pages the engines
+    agree on.
+
+    Args:
+        base_tool_class: The search tool class, e.g. one of the cached tools
+
+    Returns:
+        A new class that inherits from both DeduplicatedSearchMixin and the base tool class
+    """
+
+    class DeduplicatedTool(DeduplicatedSearchMixin, base_tool_class):
+        pass
+
+    DeduplicatedTool.__name__ = f"Deduplicated{base_tool_class.__name__}"
+    return DeduplicatedTool
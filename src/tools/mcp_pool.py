@@ -0,0 +1,400 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, Optional
+
+import anyio
+from langchain_core.tools import BaseTool, StructuredTool
+from langchain_mcp_adapters.tools import _convert_call_tool_result
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+from src.agents import release_agents
+from src.config.mcp import (
+    MCP_POOL_HEALTH_CHECK_SECONDS,
+    MCP_POOL_IDLE_TIMEOUT_SECONDS,
+    MCP_POOL_MAX_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVER_CONFIG_KEYS = ("transport", "command", "args", "url", "env")
+
+# errors raised by a session whose server or connection is gone
+_CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+def get_server_config_key(config: dict[str, Any]) -> str:
+    """Get a stable hash of the connection settings of an MCP server."""
+    relevant = {k: config.get(k) for k in SERVER_CONFIG_KEYS}
+    return hashlib.sha256(
+        json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+@asynccontextmanager
+async def _connect(config: dict[str, Any]):
+    transport = config.get("transport", "stdio")
+    if transport == "stdio":
+        server_params = StdioServerParameters(
+            command=config["command"],
+            args=config.get("args") or [],
+            env=config.get("env"),
+        )
+        async with stdio_client(server_params) as streams:
+            yield streams
+    elif transport == "sse":
+        async with sse_client(url=config["url"]) as streams:
+            yield streams
+    else:
+        raise ValueError(f"Unsupported MCP transport: {transport}")
+
+
+async def _first_completed(main, other, error: Optional[Exception] = None) -> Any:
+    """Await ``main`` until ``other`` completes first, then raise ``error``."""
+    main_task = asyncio.ensure_future(main)
+    other_task = asyncio.ensure_future(other)
+    try:
+        await asyncio.wait({main_task, other_task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (main_task, other_task):
+            if not task.done():
+                task.cancel()
+    if main_task.done() and not main_task.cancelled():
+        return main_task.result()
+    if error is not None:
+        raise error
+
+
+class _PooledServer:
+    """A long-lived session with one MCP server.
+
+    The transport and the session are entered and exited by a dedicated owner
+    task, as anyio requires, while tool calls use the session from any task.
+    """
+
+    def __init__(self, key: str, config: dict[str, Any], max_concurrency: int):
+        self.key = key
+        self.config = config
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.session: Optional[ClientSession] = None
+        self.mcp_tools: list = []
+        self.tools: dict[Optional[str], list[BaseTool]] = {}
+        self.active_calls = 0
+        self.last_used = time.monotonic()
+        self.starts = 0
+        self.closed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    @property
+    def crashed(self) -> bool:
+        """The session ended without being stopped."""
+        return self._task is not None and self._task.done() and not self._stop.is_set()
+
+    async def start(self, startup_timeout: float, call_timeout: float) -> None:
+        ready = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self.closed = asyncio.Event()
+        self._task = asyncio.create_task(self._run(ready, call_timeout))
+        try:
+            tools = await asyncio.wait_for(asyncio.shield(ready), startup_timeout)
+        except BaseException:
+            await self.stop()
+            raise
+        self.starts += 1
+        if [self._describe(t) for t in tools] != [
+            self._describe(t) for t in self.mcp_tools
+        ]:
+            # new tool objects, agents compiled with the old schemas are not reused
+            if self.tools:
+                release_agents(self.pooled_tools())
+            self.mcp_tools = tools
+            self.tools = {}
+
+    def pooled_tools(self) -> list[BaseTool]:
+        """Get the tools handed out for this server, under every server name."""
+        return [tool for tools in self.tools.values() for tool in tools]
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, 10)
+        except Exception:
+            self._task.cancel()
+        self.session = None
+
+    async def _run(self, ready: asyncio.Future, call_timeout: float) -> None:
+        relay = None
+        try:
+            async with _connect(self.config) as (read, write):
+                # the session does not fail pending requests when the server
+                # exits, relay the messages to notice the end of the stream
+                relay_writer, relay_reader = anyio.create_memory_object_stream(0)
+                relay = asyncio.create_task(self._relay(read, relay_writer))
+                async with ClientSession(
+                    relay_reader,
+                    write,
+                    read_timeout_seconds=timedelta(seconds=call_timeout),
+                ) as session:
+                    await session.initialize()
+                    listed_tools = await session.list_tools()
+                    self.session = session
+                    ready.set_result(listed_tools.tools)
+                    await _first_completed(self._stop.wait(), self.closed.wait())
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not isinstance(e, asyncio.CancelledError):
+                logger.warning(f"MCP server {self.key[:8]} stopped: {e}")
+        finally:
+            self.session = None
+            self.closed.set()
+            if relay:
+                relay.cancel()
+
+    async def _relay(self, read, relay_writer) -> None:
+        try:
+            async with relay_writer:
+                async for message in read:
+                    await relay_writer.send(message)
+        finally:
+            self.closed.set()
+
+    @staticmethod
+    def _describe(tool) -> tuple:
+        return (
+            tool.name,
+            tool.description,
+            json.dumps(tool.inputSchema, sort_keys=True),
+        )
+
+
+class MCPSessionPool:
+    """A pool of warm MCP sessions shared by all agent steps and threads.
+
+    Opening a ``MultiServerMCPClient`` per step spawns stdio servers, runs the
+    initialize handshake and lists the tools every time. The pool keeps one
+    session per server, keyed by the hash of its connection settings, and
+    hands out tools that call it through the pool:
+
+    - at most ``max_concurrency`` tool calls run on a server at the same time,
+    - a call that fails because the server crashed restarts it and is retried once,
+    - running servers are pinged every ``health_check_interval`` seconds, and
+      the unresponsive ones are restarted,
+    - servers idle for ``idle_timeout`` seconds are stopped, and started again
+      by the next call.
+
+    The tools of a server are stable objects as long as its tool list does not
+    change, so the compiled agents using them are reused across steps.
+
+    A pool belongs to the event loop it is created in, see
+    :func:`get_mcp_session_pool`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MCP_POOL_MAX_CONCURRENCY,
+        idle_timeout: float = MCP_POOL_IDLE_TIMEOUT_SECONDS,
+        health_check_interval: float = MCP_POOL_HEALTH_CHECK_SECONDS,
+        startup_timeout: float = 60,
+        call_timeout: float = 300,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.startup_timeout = startup_timeout
+        self.call_timeout = call_timeout
+        self.servers: dict[str, _PooledServer] = {}
+        self._maintenance: Optional[asyncio.Task] = None
+
+    async def get_tools(
+        self, config: dict[str, Any], server_name: Optional[str] = None
+    ) -> list[BaseTool]:
+        """Get the tools of an MCP server, starting it if needed.
+
+        Args:
+            config: The server settings (transport, command, args, url, env).
+            server_name: Shown in the tool descriptions as "Powered by ...".
+        """
+        server = self._get_server(config)
+        await self._ensure_running(server)
+        if server_name not in server.tools:
+            server.tools[server_name] = [
+                self._make_tool(server, tool, server_name) for tool in server.mcp_tools
+            ]
+        return server.tools[server_name]
+
+    async def call_tool(
+        self, config: dict[str, Any], name: str, arguments: dict[str, Any]
+    ) -> Any:
+        """Call a tool on a pooled session, restarting a crashed server once."""
+        server = self._get_server(config)
+        async with server.semaphore:
+            server.active_calls += 1
+            server.last_used = time.monotonic()
+            try:
+                for attempt in range(2):
+                    await self._ensure_running(server)
+                    try:
+                        return await _first_completed(
+                            server.session.call_tool(name, arguments),
+                            server.closed.wait(),
+                            error=ConnectionError("MCP server closed the connection"),
+                        )
+                    except _CONNECTION_ERRORS as e:
+                        if attempt:
+                            raise
+                        logger.warning(
+                            f"MCP server {server.key[:8]} is gone ({e!r}), restarting it"
+                        )
+                        async with server._lock:
+                            await server.stop()
+            finally:
+                server.active_calls -= 1
+                server.last_used = time.monotonic()
+
+    async def check_servers(self) -> None:
+        """Stop the idle servers and restart the unresponsive ones."""
+        now = time.monotonic()
+        for server in list(self.servers.values()):
+            if server._lock.locked() or server._task is None:
+                continue
+            if (
+                server.running
+                and server.active_calls == 0
+                and now - server.last_used > self.idle_timeout
+            ):
+                logger.info(f"Stopping idle MCP server {server.key[:8]}")
+                async with server._lock:
+                    await server.stop()
+                continue
+            if server.running:
+                try:
+                    await asyncio.wait_for(server.session.send_ping(), 10)
+                    continue
+                except Exception as e:
+                    logger.warning(
+                        f"MCP server {server.key[:8]} failed its health check: {e!r}"
+                    )
+            elif not server.crashed:
+                continue
+            try:
+                async with server._lock:
+                    await server.stop()
+                    await server.start(self.startup_timeout, self.call_timeout)
+            except Exception as e:
+                logger.warning(f"Restarting MCP server {server.key[:8]} failed: {e!r}")
+
+    def stats(self) -> dict[str, Any]:
+        """Get the state of every pooled server."""
+        return {
+            server.key[:8]: {
+                "command": server.config.get("command") or server.config.get("url"),
+                "running": server.running,
+                "active_calls": server.active_calls,
+                "starts": server.starts,
+                "idle_seconds": round(time.monotonic() - server.last_used),
+            }
+            for server in self.servers.values()
+        }
+
+    async def close(self) -> None:
+        """Stop all servers and drop the agents using their tools."""
+        if self._maintenance:
+            self._maintenance.cancel()
+            self._maintenance = None
+        for server in self.servers.values():
+            await server.stop()
+            if server.tools:
+                release_agents(server.pooled_tools())
+        self.servers.clear()
+
+    def _get_server(self, config: dict[str, Any]) -> _PooledServer:
+        key = get_server_config_key(config)
+        if key not in self.servers:
+            self.servers[key] = _PooledServer(
+                key,
+                {k: config.get(k) for k in SERVER_CONFIG_KEYS},
+                self.max_concurrency,
+            )
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.create_task(self._maintain())
+        return self.servers[key]
+
+    async def _ensure_running(self, server: _PooledServer) -> None:
+        if server.running:
+            return
+        async with server._lock:
+            if server.running:
+                return
+            await server.stop()
+            logger.info(f"Starting MCP server {server.key[:8]}")
+            await server.start(self.startup_timeout, self.call_timeout)
+            server.last_used = time.monotonic()
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.health_check_interval, self.idle_timeout))
+            try:
+                await self.check_servers()
+            except Exception:
+                logger.exception("MCP session pool maintenance failed")
+
+    def _make_tool(
+        self, server: _PooledServer, tool, server_name: Optional[str]
+    ) -> BaseTool:
+        config = server.config
+
+        async def call_tool(**arguments: dict[str, Any]):
+            result = await self.call_tool(config, tool.name, arguments)
+            return _convert_call_tool_result(result)
+
+        description = tool.description or ""
+        if server_name:
+            description = f"Powered by '{server_name}'.\n{description}"
+        return StructuredTool(
+            name=tool.name,
+            description=description,
+            args_schema=tool.inputSchema,
+            coroutine=call_tool,
+            response_format="content_and_artifact",
+        )
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Get the MCP session pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _pools:
+        _pools[loop] = MCPSessionPool()
+    return _pools[loop]
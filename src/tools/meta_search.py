@@ -0,0 +1,258 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import logging
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Optional, Type
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.config.tools import META_SEARCH_DEADLINE_SECONDS, META_SEARCH_QUORUM
+from src.crawler.crawl_cache import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# the constant of reciprocal-rank fusion, damping the weight of the top ranks
+RRF_K = 60
+
+_ARXIV_FIELD_PATTERN = re.compile(r"^(Published|Title|Authors|Summary): ", re.M)
+
+
+class MetaSearchInput(BaseModel):
+    query: str = Field(description="search query to look up")
+
+
+class SearchError(Exception):
+    """Raised when an engine answered with an error instead of results."""
+
+
+def parse_results(engine: str, output: Any) -> tuple[list[dict], list[dict]]:
+    """
+    Parse the output of a search tool into pages and images.
+
+    Pages are dicts of ``title``, ``url`` and ``content``, in the order of the
+    engine. Arxiv results carry no url and are told apart by their title.
+    """
+    if isinstance(output, tuple):
+        # (content, artifact) of the tools answering with both
+        output = output[0]
+    if isinstance(output, str) and engine != "arxiv":
+        try:
+            output = json.loads(output)
+        except ValueError:
+            raise SearchError(output[:200])
+    if engine == "arxiv":
+        return _parse_arxiv(output), []
+    if isinstance(output, dict) and "content" in output:
+        # an error wrapped by ensure_valid_json_output
+        raise SearchError(str(output["content"])[:200])
+    if not isinstance(output, list):
+        raise SearchError(f"Unexpected results of {engine}: {output!r:.200}")
+    pages, images = [], []
+    for result in output:
+        if result.get("type") == "image":
+            images.append(result)
+            continue
+        page = {
+            "title": result.get("title") or "",
+            "url": result.get("url") or result.get("link") or "",
+            "content": result.get("content") or result.get("snippet") or "",
+        }
+        if result.get("raw_content"):
+            page["raw_content"] = result["raw_content"]
+        pages.append(page)
+    return pages, images
+
+
+def _parse_arxiv(output: str) -> list[dict]:
+    if output.startswith("Arxiv exception"):
+        raise SearchError(output)
+    pages = []
+    for document in output.split("\n\nPublished: "):
+        fields = dict(
+            zip(*[iter(_ARXIV_FIELD_PATTERN.split(document.strip())[1:])] * 2)
+        )
+        if fields.get("Title"):
+            pages.append(
+                {
+                    "title": fields["Title"].strip(),
+                    "url": "",
+                    "content": fields.get("Summary", "").strip(),
+                }
+            )
+    return pages
+
+
+def _dedupe_key(page: dict) -> str:
+    if page["url"]:
+        return canonicalize_url(page["url"])
+    return "title:" + " ".join(page["title"].casefold().split())
+
+
+def fuse_results(
+    ranked: dict[str, list[dict]], max_results: int, k: int = RRF_K
+) -> list[dict]:
+    """
+    Merge the ranked pages of several engines with reciprocal-rank fusion.
+
+    A page scores the sum of ``1 / (k + rank)`` over the engines that found
+    it, so pages several engines agree on rise to the top. Pages are
+    deduplicated by canonical url, keeping the fields of their best rank.
+    """
+    fused: dict[str, dict] = {}
+    for engine, pages in ranked.items():
+        seen = set()
+        for rank, page in enumerate(pages, start=1):
+            key = _dedupe_key(page)
+            if key in seen:
+                continue
+            seen.add(key)
+            score = 1 / (k + rank)
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {
+                    "type": "page",
+                    **page,
+                    "score": 0.0,
+                    "engines": [],
+                    "_best_rank": rank,
+                }
+            elif rank < entry["_best_rank"]:
+                entry.update(page, _best_rank=rank)
+            entry["score"] += score
+            entry["engines"].append(engine)
+    results = sorted(fused.values(), key=lambda entry: -entry["score"])
+    for entry in results:
+        del entry["_best_rank"]
+        entry["score"] = round(entry["score"], 6)
+    return results[:max_results]
+
+
+class MetaSearch(BaseTool):
+    """
+    Search several engines at once and merge their results.
+
+    The engines are queried concurrently. The search returns once ``quorum``
+    engines answered, or once ``deadline`` seconds passed and at least one
+    did, so a slow engine never holds up the step. In the blocking path the
+    slower engines finish in their threads. In the async path they are
+    cancelled, but while the ``SEARCH_CACHE`` is enabled their searches keep
+    running behind it and fill it for later steps.
+
+    Args:
+        engines: The search tools to query, by engine name.
+        max_results: Number of merged results returned.
+        quorum: Number of answers the search waits for.
+        deadline: Seconds after which any answers are enough.
+    """
+
+    name: str = "web_search"
+    description: str = (
+        "A search engine querying several search engines at once. "
+        "Useful for when you need to answer questions about current events. "
+        "Input should be a search query."
+    )
+    args_schema: Type[BaseModel] = MetaSearchInput
+
+    engines: dict[str, BaseTool]
+    max_results: int = 5
+    quorum: int = META_SEARCH_QUORUM
+    deadline: float = META_SEARCH_DEADLINE_SECONDS
+
+    def _run(
+        self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None
+    ) -> list[dict] | str:
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=len(self.engines), thread_name_prefix="meta-search"
+        )
+        futures = {
+            executor.submit(tool.invoke, query): engine
+            for engine, tool in self.engines.items()
+        }
+        answers, errors = {}, []
+        try:
+            pending = set(futures)
+            while pending and not self._is_enough(answers, start):
+                done, pending = wait(
+                    pending,
+                    timeout=self._wait_time(start),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    self._collect(futures[future], future, answers, errors)
+        finally:
+            # the slower engines are left to finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+        return self._merge(query, answers, errors, start)
+
+    async def _arun(
+        self,
+        query: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> list[dict] | str:
+        start = time.monotonic()
+        tasks = {
+            asyncio.ensure_future(tool.ainvoke(query)): engine
+            for engine, tool in self.engines.items()
+        }
+        answers, errors = {}, []
+        try:
+            pending = set(tasks)
+            while pending and not self._is_enough(answers, start):
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self._wait_time(start),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    self._collect(tasks[task], task, answers, errors)
+        finally:
+            # the searches of a cached engine are shielded and keep running
+            for task in tasks:
+                task.cancel()
+        return self._merge(query, answers, errors, start)
+
+    def _is_enough(self, answers: dict, start: float) -> bool:
+        if len(answers) >= min(self.quorum, len(self.engines)):
+            return True
+        return bool(answers) and time.monotonic() - start >= self.deadline
+
+    def _wait_time(self, start: float) -> Optional[float]:
+        remaining = self.deadline - (time.monotonic() - start)
+        # past the deadline, the first answer is waited for
+        return remaining if remaining > 0 else None
+
+    @staticmethod
+    def _collect(engine: str, future, answers: dict, errors: list) -> None:
+        try:
+            answers[engine] = parse_results(engine, future.result())
+        except Exception as e:
+            logger.warning(f"Search engine {engine} failed: {e!r}")
+            errors.append(f"{engine}: {e!r}")
+
+    def _merge(
+        self, query: str, answers: dict, errors: list, start: float
+    ) -> list[dict] | str:
+        if not answers:
+            error_msg = f"Failed to search. Errors: {'; '.join(errors)}"
+            logger.error(error_msg)
+            return error_msg
+        logger.info(
+            f"Meta search of {query!r} answered by {', '.join(answers)} "
+            f"in {time.monotonic() - start:.2f}s"
+        )
+        ranked = {engine: pages for engine, (pages, _) in answers.items()}
+        images = [
+            image for _, engine_images in answers.values() for image in engine_images
+        ]
+        return fuse_results(ranked, self.max_results) + images
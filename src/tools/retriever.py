@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+from functools import lru_cache
 from typing import List, Optional, Type
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import (
@@ -54,11 +55,26 @@ class RetrieverTool(BaseTool):
 def get_retriever_tool(resources: List[Resource]) -> RetrieverTool | None:
     if not resources:
         return None
+    # steps of a thread share the tool of its resources, and so their agent
+    key = tuple(
+        (resource.uri, resource.title, resource.description) for resource in resources
+    )
+    return _get_retriever_tool(key)
+
+
+@lru_cache(maxsize=16)
+def _get_retriever_tool(
+    key: tuple[tuple[str, str, str | None], ...],
+) -> RetrieverTool | None:
     logger.info(f"create retriever tool: {SELECTED_RAG_PROVIDER}")
     retriever = build_retriever()
 
     if not retriever:
         return None
+    resources = [
+        Resource(uri=uri, title=title, description=description)
+        for uri, title, description in key
+    ]
     return RetrieverTool(retriever=retriever, resources=resources)
 
 
@@ -4,17 +4,23 @@
 import json
 import logging
 import os
+from functools import lru_cache
 
 from langchain_community.tools import BraveSearch, DuckDuckGoSearchResults
 from langchain_community.tools.arxiv import ArxivQueryRun
 from langchain_community.utilities import ArxivAPIWrapper, BraveSearchWrapper
 
 from src.config import SearchEngine, SELECTED_SEARCH_ENGINE
+from src.config.tools import META_SEARCH_ENGINES
 from src.tools.tavily_search.tavily_search_results_with_images import (
     TavilySearchResultsWithImages,
 )
 
 from src.tools.decorators import create_logged_tool
+from src.tools.deduplication import create_deduplicated_tool
+from src.tools.meta_search import MetaSearch
+from src.tools.search_batch import SearchBatchTool
+from src.tools.search_cache import create_cached_tool
 
 logger = logging.getLogger(__name__)
 
@@ -24,38 +30,120 @@ LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
 LoggedBraveSearch = create_logged_tool(BraveSearch)
 LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
 
+# Serve repeated searches of all threads from the search cache
+CachedTavilySearch = create_cached_tool(LoggedTavilySearch, SearchEngine.TAVILY.value)
+CachedDuckDuckGoSearch = create_cached_tool(
+    LoggedDuckDuckGoSearch, SearchEngine.DUCKDUCKGO.value
+)
+CachedBraveSearch = create_cached_tool(
+    LoggedBraveSearch, SearchEngine.BRAVE_SEARCH.value
+)
+CachedArxivSearch = create_cached_tool(LoggedArxivSearch, SearchEngine.ARXIV.value)
 
-# Get the selected search tool
-def get_web_search_tool(max_search_results: int):
-    if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
-        return LoggedTavilySearch(
-            name="web_search",
+CACHED_SEARCH_TOOLS = {
+    SearchEngine.TAVILY.value: CachedTavilySearch,
+    SearchEngine.DUCKDUCKGO.value: CachedDuckDuckGoSearch,
+    SearchEngine.BRAVE_SEARCH.value: CachedBraveSearch,
+    SearchEngine.ARXIV.value: CachedArxivSearch,
+}
+# Collapse the results the research thread has already seen, for the tools
+# whose results reach the agent
+DEDUPLICATED_SEARCH_TOOLS = {
+    engine: create_deduplicated_tool(tool_class)
+    for engine, tool_class in CACHED_SEARCH_TOOLS.items()
+}
+DeduplicatedMetaSearch = create_deduplicated_tool(MetaSearch)
+DeduplicatedSearchBatchTool = create_deduplicated_tool(SearchBatchTool)
+
+
+def build_search_tool(
+    engine: str,
+    max_search_results: int,
+    name: str = "web_search",
+    deduplicated: bool = False,
+    **kwargs,
+):
+    """Build the cached search tool of an engine, see :class:`SearchEngine`."""
+    if engine not in CACHED_SEARCH_TOOLS:
+        raise ValueError(f"Unsupported search engine: {engine}")
+    tool_classes = DEDUPLICATED_SEARCH_TOOLS if deduplicated else CACHED_SEARCH_TOOLS
+    tool_class = tool_classes[engine]
+    if engine == SearchEngine.TAVILY.value:
+        return tool_class(
+            name=name,
             max_results=max_search_results,
             include_raw_content=True,
             include_images=True,
             include_image_descriptions=True,
+            **kwargs,
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.DUCKDUCKGO.value:
-        return LoggedDuckDuckGoSearch(name="web_search", max_results=max_search_results)
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.BRAVE_SEARCH.value:
-        return LoggedBraveSearch(
-            name="web_search",
+    elif engine == SearchEngine.DUCKDUCKGO.value:
+        return tool_class(name=name, max_results=max_search_results, **kwargs)
+    elif engine == SearchEngine.BRAVE_SEARCH.value:
+        return tool_class(
+            name=name,
             search_wrapper=BraveSearchWrapper(
                 api_key=os.getenv("BRAVE_SEARCH_API_KEY", ""),
                 search_kwargs={"count": max_search_results},
             ),
+            **kwargs,
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.ARXIV.value:
-        return LoggedArxivSearch(
-            name="web_search",
+    else:
+        return tool_class(
+            name=name,
             api_wrapper=ArxivAPIWrapper(
                 top_k_results=max_search_results,
                 load_max_docs=max_search_results,
                 load_all_available_meta=True,
             ),
+            **kwargs,
+        )
+
+
+# Get the selected search tool
+# tools are stateless, sharing them lets the compiled agents using them be reused
+@lru_cache(maxsize=16)
+def get_web_search_tool(max_search_results: int):
+    if SELECTED_SEARCH_ENGINE == SearchEngine.META.value:
+        engines = {
+            engine: _build_structured_search_tool(engine, max_search_results)
+            for engine in META_SEARCH_ENGINES
+        }
+        return DeduplicatedMetaSearch(engines=engines, max_results=max_search_results)
+    return build_search_tool(
+        SELECTED_SEARCH_ENGINE, max_search_results, deduplicated=True
+    )
+
+
+# Get the tool searching several queries of the selected search engine at once
+@lru_cache(maxsize=16)
+def get_web_search_batch_tool(max_search_results: int):
+    if SELECTED_SEARCH_ENGINE == SearchEngine.META.value:
+        # the batch filters the merged results of its queries, not every query
+        search_tool = MetaSearch(
+            engines={
+                engine: _build_structured_search_tool(engine, max_search_results)
+                for engine in META_SEARCH_ENGINES
+            },
+            max_results=max_search_results,
         )
     else:
-        raise ValueError(f"Unsupported search engine: {SELECTED_SEARCH_ENGINE}")
+        search_tool = _build_structured_search_tool(
+            SELECTED_SEARCH_ENGINE, max_search_results
+        )
+    return DeduplicatedSearchBatchTool(
+        search_tool=search_tool,
+        engine=SELECTED_SEARCH_ENGINE,
+        max_results=max_search_results,
+    )
+
+
+def _build_structured_search_tool(engine: str, max_search_results: int):
+    # results which can be merged, e.g. not a string of DuckDuckGo
+    kwargs = {}
+    if engine == SearchEngine.DUCKDUCKGO.value:
+        kwargs["output_format"] = "list"
+    return build_search_tool(engine, max_search_results, name=engine, **kwargs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Type
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.config.tools import SEARCH_BATCH_MAX_QUERIES
+from src.tools.meta_search import fuse_results, parse_results
+from src.tools.search_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class SearchBatchInput(BaseModel):
+    queries: list[str] = Field(description="The related search queries to look up.")
+
+
+def _select_queries(queries: list[str], max_queries: int) -> list[str]:
+    selected = {}
+    for query in queries:
+        # trivially different spellings are searched once
+        if query.strip():
+            selected.setdefault(normalize_query(query), query.strip())
+    if len(selected) > max_queries:
+        logger.warning(f"Searching the first {max_queries} of {len(selected)} queries")
+    return list(selected.values())[:max_queries]
+
+
+def _merge(
+    engine: str, queries: list[str], outputs: list[Any], max_results: int
+) -> list[dict]:
+    """Merge the results of the queries into one compact, deduplicated list."""
+    ranked, images, errors = {}, {}, []
+    for query, output in zip(queries, outputs):
+        try:
+            if isinstance(output, BaseException):
+                raise output
+            pages, query_images = parse_results(engine, output)
+        except Exception as e:
+            logger.warning(f"Searching {query!r} failed: {e!r}")
+            errors.append({"type": "error", "query": query, "error": repr(e)})
+            continue
+        # the full pages are left to the crawl tools
+        ranked[query] = [
+            {key: value for key, value in page.items() if key != "raw_content"}
+            for page in pages
+        ]
+        for image in query_images:
+            images.setdefault(image.get("image_url"), image)
+    # pages found by several queries first, then by their best rank
+    results = fuse_results(ranked, max_results * len(queries))
+    for result in results:
+        result["queries"] = result.pop("engines")
+    return results + list(images.values())[:max_results] + errors
+
+
+class SearchBatchTool(BaseTool):
+    """
+    Search several related queries at once, returning one deduplicated result set.
+
+    Args:
+        search_tool: The search tool every query goes through, answering with
+            structured results, see ``get_web_search_batch_tool``.
+        engine: Engine of the search tool, telling how to parse its results.
+        max_results: Results kept per query, and images kept in total.
+        max_queries: Maximum number of queries searched per call.
+    """
+
+    name: str = "web_search_batch"
+    description: str = (
+        "Use this to run several related web searches at once, e.g. the different "
+        "angles of one research step. Returns one deduplicated list of pages, each "
+        "with the queries that found it. Prefer it over calling web_search once per "
+        "query, and crawl the urls to read the full pages."
+    )
+    args_schema: Type[BaseModel] = SearchBatchInput
+
+    search_tool: BaseTool
+    engine: str
+    max_results: int = 5
+    max_queries: int = SEARCH_BATCH_MAX_QUERIES
+
+    def _run(
+        self,
+        queries: list[str],
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> list[dict]:
+        queries = _select_queries(queries, self.max_queries)
+        if not queries:
+            return []
+
+        def search_one(query: str) -> Any:
+            try:
+                return self.search_tool.invoke(query)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            outputs = list(executor.map(search_one, queries))
+        return _merge(self.engine, queries, outputs, self.max_results)
+
+    async def _arun(
+        self,
+        queries: list[str],
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> list[dict]:
+        queries = _select_queries(queries, self.max_queries)
+        outputs = await asyncio.gather(
+            *(self.search_tool.ainvoke(query) for query in queries),
+            return_exceptions=True,
+        )
+        return _merge(self.engine, queries, outputs, self.max_results)
@@ -0,0 +1,397 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Optional,
+    Protocol,
+    Type,
+    TypeVar,
+)
+
+from langchain_core.tools import BaseTool
+
+from src.config.tools import (
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_TTL_SECONDS,
+    SELECTED_SEARCH_CACHE,
+    SQLITE_SEARCH_CACHE_PATH,
+    SearchCacheBackend,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# fields which never change the results, e.g. the credentials of the API
+_IGNORED_PARAM_PATTERN = re.compile(r"api_key|secret|token", re.IGNORECASE)
+_TRAILING_PUNCTUATION = "?!.,;:。？！，；："
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so that trivially different spellings share a cache entry.
+
+    Applies Unicode NFKC, case folding and whitespace collapsing, and strips
+    surrounding quotes and trailing punctuation.
+    """
+    query = " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+    return query.strip("\"'").rstrip(_TRAILING_PUNCTUATION).strip()
+
+
+def search_cache_key(engine: str, query: str, params: dict[str, Any]) -> str:
+    """Get the cache key of a search: its engine, normalized query and parameters."""
+    data = json.dumps(
+        [engine, normalize_query(query), params],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=lambda value: f"<{type(value).__name__}>",
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def search_params(tool: BaseTool) -> dict[str, Any]:
+    """Get the settings of a search tool which change its results, e.g. max_results."""
+    return _without_ignored(tool.model_dump(exclude=set(BaseTool.model_fields)))
+
+
+def _without_ignored(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _without_ignored(item)
+            for key, item in value.items()
+            if not _IGNORED_PARAM_PATTERN.search(str(key))
+        }
+    if isinstance(value, (list, tuple)):
+        return [_without_ignored(item) for item in value]
+    return value
+
+
+class SearchCacheStore(Protocol):
+    """Where search results are kept, see the memory and SQLite stores."""
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def put(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def close(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class MemorySearchCacheStore:
+    """An in-process LRU of search results, holding up to ``max_entries``."""
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        # key -> (expiry time, value), least recently used first
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # callers get their own copy, as they would from the SQLite store
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteSearchCacheStore:
+    """
+    Search results in a SQLite database, shared by processes and kept across restarts.
+
+    Values are stored as JSON, tuples such as the (content, artifact) results
+    of Tavily are restored as tuples.
+    """
+
+    def __init__(self, path: str, max_entries: int = SEARCH_CACHE_MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS search_cache_accessed_at "
+            "ON search_cache (accessed_at)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM search_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return _decode(json.loads(row[0]))
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        data = json.dumps(_encode(value), ensure_ascii=False)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?)",
+                (key, data, now + ttl, now),
+            )
+            # expired entries first, then the least recently used ones
+            self.conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            self.conn.execute(
+                "DELETE FROM search_cache WHERE key IN (SELECT key FROM search_cache "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and list(value) == ["__tuple__"]:
+        return tuple(_decode(item) for item in value["__tuple__"])
+    return value
+
+
+class SearchCache:
+    """
+    A TTL cache of search results in front of the paid search APIs.
+
+    Identical searches running at the same time share one call to the API,
+    and the outcome of every lookup is counted.
+
+    Args:
+        store: Where the results are kept, see :class:`MemorySearchCacheStore`
+            and :class:`SQLiteSearchCacheStore`.
+        ttl: Seconds a search result is served from the cache.
+    """
+
+    def __init__(self, store: SearchCacheStore, ttl: float) -> None:
+        self.store = store
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._ainflight: dict[str, asyncio.Future] = {}
+        self._stats = {"hit": 0, "miss": 0, "coalesced": 0}
+
+    def fetch(self, key: str, search: Callable[[], T]) -> T:
+        """Get the cached result of a search, calling ``search`` on a miss."""
+        result = self.store.get(key)
+        if result is not None:
+            self._record("hit")
+            return result
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            self._record("coalesced")
+            return future.result()
+        self._record("miss")
+        try:
+            result = search()
+            self._put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def afetch(self, key: str, search: Callable[[], Awaitable[T]]) -> T:
+        """Like :meth:`fetch`, without blocking the event loop."""
+        result = await asyncio.to_thread(self.store.get, key)
+        if result is not None:
+            self._record("hit")
+            return result
+        future = self._ainflight.get(key)
+        if future is not None:
+            self._record("coalesced")
+            return await asyncio.shield(future)
+        self._record("miss")
+        future = self._ainflight[key] = asyncio.ensure_future(
+            self._asearch(key, search)
+        )
+        future.add_done_callback(lambda _: self._ainflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        """Get the number of hits, misses and coalesced searches."""
+        with self._lock:
+            return {**self._stats, "entries": len(self.store)}
+
+    def close(self) -> None:
+        """Close the store of the cached results."""
+        self.store.close()
+
+    async def _asearch(self, key: str, search: Callable[[], Awaitable[T]]) -> T:
+        result = await search()
+        await asyncio.to_thread(self._put, key, result)
+        return result
+
+    def _put(self, key: str, result: Any) -> None:
+        # failed searches, e.g. Tavily errors returned with an empty
+        # artifact, are not worth keeping
+        if not result or (isinstance(result, tuple) and not result[-1]):
+            return
+        try:
+            self.store.put(key, result, self.ttl)
+        except (TypeError, ValueError, sqlite3.Error) as e:
+            logger.warning(f"Could not cache a search result: {e!r}")
+
+    def _record(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+
+
+def build_search_cache(backend: str = SELECTED_SEARCH_CACHE) -> Optional[SearchCache]:
+    """Build the search cache selected by the ``SEARCH_CACHE`` setting."""
+    if backend == SearchCacheBackend.NONE.value:
+        return None
+    elif backend == SearchCacheBackend.MEMORY.value:
+        return SearchCache(MemorySearchCacheStore(), SEARCH_CACHE_TTL_SECONDS)
+    elif backend == SearchCacheBackend.SQLITE.value:
+        return SearchCache(
+            SQLiteSearchCacheStore(SQLITE_SEARCH_CACHE_PATH), SEARCH_CACHE_TTL_SECONDS
+        )
+    else:
+        raise ValueError(f"Unsupported search cache: {backend}")
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_built = False
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Return the process-wide search cache, or None when it is disabled."""
+    global _search_cache, _search_cache_built
+    with _search_cache_lock:
+        if not _search_cache_built:
+            _search_cache = build_search_cache()
+            _search_cache_built = True
+        return _search_cache
+
+
+def close_search_cache() -> None:
+    """Close the store of the process-wide search cache, e.g. its database."""
+    global _search_cache, _search_cache_built
+    with _search_cache_lock:
+        if _search_cache is not None:
+            _search_cache.close()
+        _search_cache = None
+        _search_cache_built = False
+
+
+class CachedSearchMixin:
+    """A mixin serving the results of a search tool from the :class:`SearchCache`."""
+
+    # set by create_cached_tool
+    search_engine: ClassVar[str] = ""
+    has_async_search: ClassVar[bool] = False
+
+    def _run(self, query: str, run_manager: Any = None) -> Any:
+        cache = get_search_cache()
+        if cache is None:
+            return super()._run(query, run_manager=run_manager)
+        return cache.fetch(
+            self._cache_key(query),
+            lambda: super(CachedSearchMixin, self)._run(query, run_manager=run_manager),
+        )
+
+    async def _arun(self, query: str, run_manager: Any = None) -> Any:
+        cache = get_search_cache()
+        if cache is None:
+            return await self._asearch(query, run_manager)
+        return await cache.afetch(
+            self._cache_key(query), lambda: self._asearch(query, run_manager)
+        )
+
+    async def _asearch(self, query: str, run_manager: Any) -> Any:
+        if self.has_async_search:
+            return await super()._arun(query, run_manager=run_manager)
+        # the default _arun would call the cached _run in a thread
+        run_manager = run_manager.get_sync() if run_manager is not None else None
+        return await asyncio.to_thread(
+            super(CachedSearchMixin, self)._run, query, run_manager=run_manager
+        )
+
+    def _cache_key(self, query: str) -> str:
+        return search_cache_key(self.search_engine, query, search_params(self))
+
+
+def create_cached_tool(base_tool_class: Type[T], search_engine: str) -> Type[T]:
+    """
+    Factory function to create a version of a search tool class served from the cache.
+
+    Args:
+        base_tool_class: The search tool class, e.g. one of the logged tools
+        search_engine: Engine the results come from, part of the cache key
+
+    Returns:
+        A new class that inherits from both CachedSearchMixin and the base tool class
+    """
+    engine = search_engine
+
+    class CachedTool(CachedSearchMixin, base_tool_class):
+        # the engine is part of the cache key
+        search_engine: ClassVar[str] = engine
+        has_async_search: ClassVar[bool] = base_tool_class._arun is not BaseTool._arun
+
+    CachedTool.__name__ = f"Cached{base_tool_class.__name__}"
+    return CachedTool
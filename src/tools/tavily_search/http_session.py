@@ -0,0 +1,82 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config.tools import (
+    TAVILY_CONNECT_TIMEOUT_SECONDS,
+    TAVILY_KEEPALIVE_SECONDS,
+    TAVILY_MAX_CONNECTIONS,
+    TAVILY_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeout of the blocking requests
+REQUEST_TIMEOUT = (TAVILY_CONNECT_TIMEOUT_SECONDS, TAVILY_TIMEOUT_SECONDS)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_sessions: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide session of the blocking Tavily searches."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # searches from many threads share the keep-alive connections
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=TAVILY_MAX_CONNECTIONS
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_async_session() -> aiohttp.ClientSession:
+    """Get the Tavily session of the running event loop.
+
+    Connections of an aiohttp session belong to the event loop that opened
+    them, so every loop gets its own pooled session.
+    """
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=TAVILY_MAX_CONNECTIONS,
+                keepalive_timeout=TAVILY_KEEPALIVE_SECONDS,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(
+                total=TAVILY_TIMEOUT_SECONDS, connect=TAVILY_CONNECT_TIMEOUT_SECONDS
+            ),
+            trust_env=True,
+        )
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_sessions() -> None:
+    """Close the Tavily session of the running event loop and the blocking one."""
+    global _session
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -1,13 +1,17 @@
 import json
 from typing import Dict, List, Optional
 
-import aiohttp
-import requests
 from langchain_community.utilities.tavily_search import TAVILY_API_URL
 from langchain_community.utilities.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
+from src.tools.tavily_search.http_session import (
+    REQUEST_TIMEOUT,
+    get_async_session,
+    get_session,
+)
+
 
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
     def raw_results(
@@ -34,10 +38,12 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             "include_images": include_images,
             "include_image_descriptions": include_image_descriptions,
         }
-        response = requests.post(
+        # a pooled keep-alive session saves the connection setup per search
+        response = get_session().post(
             # type: ignore
             f"{TAVILY_API_URL}/search",
             json=params,
+            timeout=REQUEST_TIMEOUT,
         )
         response.raise_for_status()
         return response.json()
@@ -70,13 +76,13 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
                 "include_images": include_images,
                 "include_image_descriptions": include_image_descriptions,
             }
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
+            session = get_async_session()
+            async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
+                if res.status == 200:
+                    data = await res.text()
+                    return data
+                else:
+                    raise Exception(f"Error {res.status}: {res.reason}")
 
         results_json_str = await fetch()
         return json.loads(results_json_str)
@@ -0,0 +1,276 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from src.utils.text_utils import estimate_tokens, split_sentences, tokenize_words
+
+logger = logging.getLogger(__name__)
+
+_HEADING = re.compile(r"^\s*#{1,6}\s+\S")
+_REFERENCE = re.compile(r"\[[^\]]+\]\((https?://[^)\s]+)\)")
+_SEPARATOR = re.compile(r"^\s*([-*_|:]\s*)+$")
+
+
+@dataclass
+class _Unit:
+    text: str
+    document: int
+    line: int
+    heading: Optional[int] = None  # index of the heading unit of its section
+    is_heading: bool = False
+    tokens: int = 0
+
+
+class ExtractiveCompressor:
+    """Shrinks a set of documents to a token budget by picking their best sentences.
+
+    Sentences are scored with TextRank over their TF-IDF vectors, blended with
+    their similarity to an optional query, and then picked greedily by score
+    while skipping sentences that repeat an already picked one, within and
+    across documents. Reference lines with links are kept (once per URL), and
+    so are the headings of the sections the picked sentences come from.
+
+    TextRank compares every pair of sentences, so beyond ``max_candidates``
+    sentences only the ones most relevant to the query, then the ones whose
+    terms are most common across the sentences, are ranked. This keeps time
+    and memory bounded on long research runs.
+
+    Everything is plain NumPy without randomness, and ties are broken by the
+    position of a sentence, so the output only depends on the input.
+
+    Args:
+        query_weight: Weight of the query similarity in the sentence score.
+        redundancy_threshold: Cosine similarity above which a sentence is
+            considered a repetition of an already picked one.
+        damping: Damping factor of TextRank.
+        max_vocabulary: Maximum number of terms of the TF-IDF vectors.
+        max_candidates: Maximum number of sentences ranked with TextRank.
+    """
+
+    def __init__(
+        self,
+        query_weight: float = 0.3,
+        redundancy_threshold: float = 0.75,
+        damping: float = 0.85,
+        max_vocabulary: int = 4096,
+        max_candidates: int = 2000,
+    ) -> None:
+        self.query_weight = query_weight
+        self.redundancy_threshold = redundancy_threshold
+        self.damping = damping
+        self.max_vocabulary = max_vocabulary
+        self.max_candidates = max_candidates
+
+    def compress(
+        self, documents: list[str], token_budget: int, query: str = ""
+    ) -> list[str]:
+        """Compress documents to at most ``token_budget`` tokens in total.
+
+        Documents that already fit are returned unchanged. Documents keep their
+        order, and the picked sentences keep their order within a document.
+        """
+        total_tokens = sum(estimate_tokens(document) for document in documents)
+        if total_tokens <= token_budget:
+            return list(documents)
+
+        units, references = self._split(documents)
+        # links are needed for the citations, but may use half of the budget
+        reference_budget = token_budget // 2
+        kept_references: list[_Unit] = []
+        for unit in references:
+            if unit.tokens <= reference_budget:
+                kept_references.append(unit)
+                reference_budget -= unit.tokens
+        budget = token_budget - sum(unit.tokens for unit in kept_references)
+
+        sentences = [i for i, unit in enumerate(units) if not unit.is_heading]
+        selected = self._select(units, sentences, budget, query)
+
+        # add the headings of the picked sentences, budget permitting
+        used = sum(units[i].tokens for i in selected)
+        chosen = set(selected)
+        for i in sorted(selected):
+            heading = units[i].heading
+            if heading is not None and heading not in chosen:
+                if used + units[heading].tokens <= budget:
+                    chosen.add(heading)
+                    used += units[heading].tokens
+
+        result = self._join(
+            documents, [units[i] for i in sorted(chosen)] + kept_references
+        )
+        logger.info(
+            f"Compressed {len(documents)} documents from {total_tokens} to "
+            f"{sum(estimate_tokens(document) for document in result)} tokens"
+        )
+        return result
+
+    def _split(self, documents: list[str]) -> tuple[list[_Unit], list[_Unit]]:
+        """Split documents into sentence and heading units, and reference lines."""
+        units: list[_Unit] = []
+        references: list[_Unit] = []
+        seen_urls: set[str] = set()
+        for d, document in enumerate(documents):
+            heading = None
+            for line_number, line in enumerate(document.splitlines()):
+                if not line.strip() or _SEPARATOR.match(line):
+                    continue
+                if _HEADING.match(line):
+                    heading = len(units)
+                    # headings are never picked on their own
+                    units.append(_Unit(line.strip(), d, line_number, is_heading=True))
+                    continue
+                urls = _REFERENCE.findall(line)
+                if urls and len(_REFERENCE.sub("", line).strip(" -*")) < 20:
+                    if not seen_urls.issuperset(urls):
+                        seen_urls.update(urls)
+                        references.append(_Unit(line.rstrip(), d, line_number))
+                    continue
+                for sentence in split_sentences(line):
+                    units.append(_Unit(sentence, d, line_number, heading))
+        for unit in units + references:
+            unit.tokens = estimate_tokens(unit.text) + 1
+        return units, references
+
+    def _select(
+        self, units: list[_Unit], candidates: list[int], budget: int, query: str
+    ) -> list[int]:
+        if not candidates or budget <= 0:
+            return []
+        if len(candidates) > self.max_candidates:
+            candidates = self._prerank(units, candidates, query)
+        vectors, query_vector = self._vectorize(
+            [units[i].text for i in candidates], query
+        )
+        similarity = vectors @ vectors.T
+        scores = self._textrank(similarity)
+        if query_vector is not None and self.query_weight > 0:
+            relevance = vectors @ query_vector
+            scores = (1 - self.query_weight) * scores / max(
+                scores.max(), 1e-12
+            ) + self.query_weight * relevance / max(relevance.max(), 1e-12)
+
+        # stable sort, equal scores keep the order of the sentences
+        order = np.argsort(-np.round(scores, 12), kind="stable")
+        picked: list[int] = []
+        used = 0
+        for position in order:
+            unit = units[candidates[position]]
+            if used + unit.tokens > budget:
+                continue
+            if picked and similarity[position, picked].max() > (
+                self.redundancy_threshold
+            ):
+                continue
+            picked.append(int(position))
+            used += unit.tokens
+        return [candidates[position] for position in picked]
+
+    def _prerank(
+        self, units: list[_Unit], candidates: list[int], query: str
+    ) -> list[int]:
+        """Keep the ``max_candidates`` best sentences, scored in linear time.
+
+        Sentences sharing rare terms with the query come first, then the
+        sentences whose terms occur in many other sentences, the ones TextRank
+        would score high.
+        """
+        tokenized = [set(tokenize_words(units[i].text)) for i in candidates]
+        document_frequency = Counter(word for words in tokenized for word in words)
+        query_words = set(tokenize_words(query))
+        n = len(candidates)
+        relevance = np.array(
+            [
+                sum(
+                    np.log((1 + n) / (1 + document_frequency[word])) + 1
+                    for word in words & query_words
+                )
+                for words in tokenized
+            ]
+        )
+        centrality = np.array(
+            [
+                sum(document_frequency[word] for word in words) / max(len(words), 1)
+                for words in tokenized
+            ]
+        )
+        # a stable sort, equal scores keep the order of the sentences
+        order = np.lexsort((-np.round(centrality, 12), -np.round(relevance, 12)))
+        kept = sorted(order[: self.max_candidates].tolist())
+        logger.debug(f"Ranking {len(kept)} of {n} sentences with TextRank")
+        return [candidates[position] for position in kept]
+
+    def _vectorize(
+        self, sentences: list[str], query: str
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Return the L2 normalized TF-IDF vectors of the sentences and the query."""
+        tokenized = [tokenize_words(sentence) for sentence in sentences]
+        document_frequency = Counter(word for words in tokenized for word in set(words))
+        # most frequent terms first, alphabetical on ties to stay deterministic
+        vocabulary = {
+            word: i
+            for i, (word, _) in enumerate(
+                sorted(
+                    document_frequency.items(), key=lambda item: (-item[1], item[0])
+                )[: self.max_vocabulary]
+            )
+        }
+        idf = np.zeros(len(vocabulary), dtype=np.float32)
+        for word, i in vocabulary.items():
+            idf[i] = np.log((1 + len(sentences)) / (1 + document_frequency[word])) + 1
+
+        def to_vector(words: list[str]) -> np.ndarray:
+            vector = np.zeros(len(vocabulary), dtype=np.float32)
+            for word, count in Counter(words).items():
+                if word in vocabulary:
+                    vector[vocabulary[word]] = count
+            vector *= idf
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else vector
+
+        vectors = np.stack([to_vector(words) for words in tokenized])
+        query_vector = to_vector(tokenize_words(query)) if query else None
+        if query_vector is not None and not query_vector.any():
+            query_vector = None
+        return vectors, query_vector
+
+    def _textrank(self, similarity: np.ndarray, iterations: int = 50) -> np.ndarray:
+        """Score sentences with PageRank over the sentence similarity graph."""
+        n = similarity.shape[0]
+        # normalized in place, the matrix is the largest allocation
+        transition = similarity.astype(np.float64)
+        np.fill_diagonal(transition, 0)
+        out_degree = transition.sum(axis=1)
+        transition /= np.maximum(out_degree, 1e-12)[:, None]
+        # sentences without similar ones spread their score evenly
+        transition[out_degree <= 0] = 1 / n
+        scores = np.full(n, 1 / n)
+        for _ in range(iterations):
+            updated = (1 - self.damping) / n + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < 1e-9:
+                return updated
+            scores = updated
+        return scores
+
+    @staticmethod
+    def _join(documents: list[str], units: list[_Unit]) -> list[str]:
+        """Rebuild the documents from the kept units, in their original order."""
+        lines: list[dict[int, list[str]]] = [{} for _ in documents]
+        for unit in units:
+            lines[unit.document].setdefault(unit.line, []).append(unit.text)
+        return [
+            "\n\n".join(" ".join(texts) for _, texts in sorted(document_lines.items()))
+            for document_lines in lines
+        ]
+
+
+def compress_texts(texts: list[str], token_budget: int, query: str = "") -> list[str]:
+    """Compress texts to a token budget with the default :class:`ExtractiveCompressor`."""
+    return ExtractiveCompressor().compress(texts, token_budget, query)
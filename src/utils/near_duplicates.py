@@ -0,0 +1,192 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from src.config.tools import (
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    NEAR_DUPLICATE_MAX_PAGES_PER_THREAD,
+)
+from src.crawler.crawl_cache import canonicalize_url
+from src.utils.text_utils import tokenize_words
+
+logger = logging.getLogger(__name__)
+
+# words per shingle, the unit of text the fingerprints compare
+SHINGLE_SIZE = 3
+# texts with fewer shingles are too short for a fingerprint to tell them apart
+MIN_SHINGLES = 8
+# shingles whose bits are counted at once, bounding the memory of long pages
+_CHUNK_SHINGLES = 4096
+_MAX_TRACKED_THREADS = 1024
+
+_BITS = np.arange(64, dtype=np.uint64)
+
+
+@lru_cache(maxsize=65536)
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest())
+
+
+def _rotate(hashes: np.ndarray, bits: int) -> np.ndarray:
+    if bits == 0:
+        return hashes
+    return (hashes << np.uint64(bits)) | (hashes >> np.uint64(64 - bits))
+
+
+def _mix(hashes: np.ndarray) -> np.ndarray:
+    # the finalizer of SplitMix64, spreading every input bit over the output
+    hashes = hashes ^ (hashes >> np.uint64(30))
+    hashes = hashes * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = hashes ^ (hashes >> np.uint64(27))
+    hashes = hashes * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def simhash(text: str) -> Optional[int]:
+    """Get the 64-bit SimHash fingerprint of a text, None when it is too short.
+
+    The text is split into overlapping shingles of ``SHINGLE_SIZE`` words, and
+    every bit of the fingerprint is the majority vote of that bit over the
+    hashes of the shingles. Texts sharing most of their shingles get
+    fingerprints differing in a few bits only, whatever their length.
+    """
+    words = tokenize_words(text, drop_stopwords=False)
+    count = len(words) - SHINGLE_SIZE + 1
+    if count < MIN_SHINGLES:
+        return None
+    word_hashes = np.fromiter(
+        (_word_hash(word) for word in words), dtype=np.uint64, count=len(words)
+    )
+    shingles = np.zeros(count, dtype=np.uint64)
+    for position in range(SHINGLE_SIZE):
+        # rotated by position, so the order of the words matters
+        shingles ^= _rotate(word_hashes[position : position + count], position)
+    shingles = _mix(shingles)
+
+    votes = np.zeros(64, dtype=np.int64)
+    for start in range(0, count, _CHUNK_SHINGLES):
+        chunk = shingles[start : start + _CHUNK_SHINGLES]
+        votes += ((chunk[:, None] >> _BITS) & np.uint64(1)).sum(axis=0, dtype=np.int64)
+    bits = (2 * votes > count).astype(np.uint64)
+    return int((bits << _BITS).sum(dtype=np.uint64))
+
+
+def hamming_distances(fingerprint: int, fingerprints: np.ndarray) -> np.ndarray:
+    """Get the number of differing bits between a fingerprint and many others."""
+    return np.bitwise_count(fingerprints ^ np.uint64(fingerprint))
+
+
+@dataclass
+class _ThreadPages:
+    fingerprints: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.uint64)
+    )
+    urls: list[str] = field(default_factory=list)
+    checked: int = 0
+    duplicates: int = 0
+
+
+class NearDuplicateFilter:
+    """Tells the pages of a research thread that repeat a page it has already seen.
+
+    Syndicated articles and mirror sites carry the same text under different
+    urls. The filter keeps the SimHash fingerprint of every page a research
+    thread was shown, and a page within ``max_distance`` bits of one of them
+    is a near duplicate. A page seen again under the same canonical url is
+    not, as reading it again is up to the agent. The pages checked and the
+    duplicates found are counted per thread.
+
+    Args:
+        max_distance: Maximum Hamming distance of near-duplicate fingerprints.
+        max_pages: Pages remembered per thread, the oldest are forgotten first.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE,
+        max_pages: int = NEAR_DUPLICATE_MAX_PAGES_PER_THREAD,
+    ) -> None:
+        self.max_distance = max_distance
+        self.max_pages = max_pages
+        self._threads: OrderedDict[str, _ThreadPages] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, thread_id: str, url: str, text: str) -> Optional[str]:
+        """
+        Check a page shown to a research thread, remembering it unless it is a
+        near duplicate.
+
+        Returns:
+            The url of the page it is a near duplicate of, or None.
+        """
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return None
+        url = canonicalize_url(url) if url else ""
+        with self._lock:
+            pages = self._threads.get(thread_id)
+            if pages is None:
+                pages = self._threads[thread_id] = _ThreadPages()
+                if len(self._threads) > _MAX_TRACKED_THREADS:
+                    self._threads.popitem(last=False)
+            self._threads.move_to_end(thread_id)
+            pages.checked += 1
+            if url and url in pages.urls:
+                return None
+            distances = hamming_distances(fingerprint, pages.fingerprints)
+            matches = np.flatnonzero(distances <= self.max_distance)
+            if matches.size:
+                pages.duplicates += 1
+                original = pages.urls[matches[np.argmin(distances[matches])]]
+                logger.info(f"Page {url or text[:80]!r} repeats {original}")
+                return original
+            pages.fingerprints = np.append(pages.fingerprints, np.uint64(fingerprint))
+            pages.urls.append(url)
+            if len(pages.urls) > self.max_pages:
+                pages.fingerprints = pages.fingerprints[1:]
+                del pages.urls[0]
+            return None
+
+    def stats(self, thread_id: Optional[str] = None) -> dict:
+        """Get the pages checked and the duplicates of one thread, or of all of them."""
+        with self._lock:
+            if thread_id is not None:
+                pages = self._threads.get(thread_id)
+                return _stats(pages) if pages else _stats(_ThreadPages())
+            checked = sum(pages.checked for pages in self._threads.values())
+            duplicates = sum(pages.duplicates for pages in self._threads.values())
+            return {
+                "checked": checked,
+                "duplicates": duplicates,
+                "duplicate_ratio": round(duplicates / checked, 4) if checked else 0.0,
+                "threads": {key: _stats(pages) for key, pages in self._threads.items()},
+            }
+
+
+def _stats(pages: _ThreadPages) -> dict:
+    ratio = pages.duplicates / pages.checked if pages.checked else 0.0
+    return {
+        "checked": pages.checked,
+        "duplicates": pages.duplicates,
+        "duplicate_ratio": round(ratio, 4),
+    }
+
+
+_near_duplicate_filter: Optional[NearDuplicateFilter] = None
+
+
+def get_near_duplicate_filter() -> Optional[NearDuplicateFilter]:
+    """Return the process-wide near-duplicate filter, or None when it is disabled."""
+    global _near_duplicate_filter
+    if _near_duplicate_filter is None and NEAR_DUPLICATE_MAX_DISTANCE >= 0:
+        _near_duplicate_filter = NearDuplicateFilter()
+    return _near_duplicate_filter
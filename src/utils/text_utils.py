@@ -0,0 +1,63 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import re
+
+# Chinese, Japanese and Korean characters
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+_WORD_PATTERN = re.compile(
+    r"[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]"
+)
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?。！？])\s+|(?<=[。！？])|\n+")
+
+STOPWORDS = frozenset("""
+    a an and are as at be been but by can for from has have how in into is it
+    its of on or that the their there these this those to was were what when
+    which who will with about also more most such than then they we you your
+    """.split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens of a text without a tokenizer.
+
+    CJK characters count as one token each, everything else as one token per
+    four characters, which is close enough for budgeting prompts.
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def tokenize_words(text: str, drop_stopwords: bool = True) -> list[str]:
+    """Split a text into lowercase words, CJK characters are words of their own."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if drop_stopwords:
+        return [w for w in words if w not in STOPWORDS]
+    return words
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split a text into sentences and lines, dropping empty ones."""
+    return [s.strip() for s in _SENTENCE_PATTERN.split(text) if s and s.strip()]
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text to about ``max_tokens`` tokens, preferring a whitespace boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    # binary search the longest prefix within the budget
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+    boundary = cut.rfind(" ")
+    if boundary > low * 0.8:
+        cut = cut[:boundary]
+    return cut.rstrip() + "..."
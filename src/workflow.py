@@ -4,6 +4,7 @@
 import asyncio
 import logging
 from src.graph import build_graph
+from src.graph.finding_store import get_finding_store
 
 # Configure logging
 logging.basicConfig(
@@ -97,6 +98,10 @@ async def run_agent_workflow_async(
                 if isinstance(message, tuple):
                     print(message)
                 else:
+                    # print the full text of findings, not their summary
+                    [message] = get_finding_store().resolve_messages(
+                        config["configurable"]["thread_id"], [message]
+                    )
                     message.pretty_print()
             else:
                 # For any other output format
@@ -0,0 +1,96 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.tools import tool
+from langchain_openai import ChatOpenAI
+
+from src.agents import clear_agent_cache, create_agent, release_agents
+from src.llms.llm import get_llm_with_structured_output, get_llm_with_tools
+from src.prompts.planner_model import Plan
+from src.rag import Resource, Retriever
+from src.tools.retriever import _get_retriever_tool, get_retriever_tool
+
+
+@pytest.fixture(autouse=True)
+def llm():
+    llm = ChatOpenAI(model="gpt-4o", api_key="test")
+    clear_agent_cache()
+    with (
+        patch.dict("src.llms.llm._llm_cache", {"basic": llm}),
+        patch.dict("src.llms.llm._bound_llm_cache", {}),
+    ):
+        yield llm
+    clear_agent_cache()
+
+
+def make_tool(description="Search the web."):
+    @tool
+    def web_search(query: str) -> str:
+        """Search the web."""
+        return query
+
+    web_search.description = description
+    return web_search
+
+
+def test_agents_are_reused_for_the_same_tool_set():
+    tools = [make_tool()]
+    agent = create_agent("researcher", "researcher", tools, "researcher")
+    assert create_agent("researcher", "researcher", list(tools), "researcher") is agent
+    assert create_agent("coder", "coder", tools, "coder") is not agent
+
+
+def test_new_or_changed_tools_build_a_new_agent():
+    tools = [make_tool()]
+    agent = create_agent("researcher", "researcher", tools, "researcher")
+    # same name, but e.g. bound to another MCP session
+    other = create_agent("researcher", "researcher", [make_tool()], "researcher")
+    assert other is not agent
+    tools[0].description = "Powered by 'server'.\nSearch the web."
+    assert create_agent("researcher", "researcher", tools, "researcher") is not agent
+
+
+def test_release_agents_drops_agents_using_the_tools():
+    tools = [make_tool()]
+    agent = create_agent("researcher", "researcher", tools, "researcher")
+    release_agents(tools)
+    assert create_agent("researcher", "researcher", tools, "researcher") is not agent
+
+
+def test_bound_llms_are_cached(llm):
+    handoff = make_tool()
+    assert get_llm_with_tools("basic", [handoff]) is get_llm_with_tools(
+        "basic", [handoff]
+    )
+    structured = get_llm_with_structured_output("basic", Plan, method="json_mode")
+    assert structured is get_llm_with_structured_output(
+        "basic", Plan, method="json_mode"
+    )
+    assert structured is not get_llm_with_structured_output("basic", Plan)
+
+
+class FakeRetriever(Retriever):
+    def list_resources(self, query=None):
+        return []
+
+    def query_relevant_documents(self, query, resources=[]):
+        return []
+
+
+def test_steps_with_the_same_resources_reuse_the_agent():
+    def resources():
+        return [Resource(uri="rag://dataset/1", title="Journey to the West")]
+
+    _get_retriever_tool.cache_clear()
+    with patch("src.tools.retriever.build_retriever", FakeRetriever):
+        retriever_tool = get_retriever_tool(resources())
+        assert get_retriever_tool(resources()) is retriever_tool
+        other = Resource(uri="rag://dataset/2", title="Dream of the Red Chamber")
+        assert get_retriever_tool([other]) is not retriever_tool
+    _get_retriever_tool.cache_clear()
+
+    agent = create_agent("coder", "coder", [retriever_tool], "coder")
+    assert create_agent("coder", "coder", [retriever_tool], "coder") is agent
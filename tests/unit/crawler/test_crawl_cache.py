@@ -0,0 +1,164 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import dataclasses
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler.crawl_cache import CachedPage, CrawlCache, canonicalize_url
+
+HTML = "<html><head><title>Page</title></head><body><p>{}</p></body></html>"
+
+
+def test_canonical_urls_ignore_trivial_differences():
+    assert canonicalize_url("HTTPS://Example.com:443?b=2&a=1&utm_source=x#top") == (
+        "https://example.com/?a=1&b=2"
+    )
+    assert canonicalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CrawlCache(str(tmp_path), ttl=60, max_bytes=10 * 1024 * 1024)
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    """Count the Jina crawls and answer HEAD requests like an origin with an ETag."""
+    state = {"crawls": 0, "heads": 0, "etag": '"v1"'}
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            state["crawls"] += 1
+            time.sleep(0.05)
+            return HTML.format(url)
+
+        async def acrawl(self, url, return_format=None):
+            state["crawls"] += 1
+            await asyncio.sleep(0.05)
+            return HTML.format(url)
+
+    def handler(request):
+        state["heads"] += 1
+        if request.headers.get("If-None-Match") == state["etag"]:
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": state["etag"]})
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article("Page", html)
+
+        async def aextract_article(self, html):
+            return Article("Page", html)
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+    monkeypatch.setattr(
+        "src.crawler.crawler.get_http_client",
+        lambda: httpx.Client(transport=transport),
+    )
+    monkeypatch.setattr(
+        "src.crawler.crawler.get_async_http_client",
+        lambda: httpx.AsyncClient(transport=transport),
+    )
+    return state
+
+
+def test_crawls_are_cached_per_canonical_url(cache, origin):
+    crawler = Crawler(cache=cache, thread_id="t1")
+    first = crawler.crawl("https://example.com/a?utm_source=x")
+    # the page is cached unconverted, to be converted as far as it is read
+    assert cache.get("https://example.com/a").markdown is None
+    second = crawler.crawl("https://EXAMPLE.com/a")
+    assert origin["crawls"] == 1
+    assert second.url == "https://EXAMPLE.com/a"
+    assert second.to_markdown() == first.to_markdown()
+    assert cache.stats("t1") == {"miss": 1, "hit": 1}
+    # a first crawl through Jina does not ask the origin for its validators
+    assert origin["heads"] == 0
+
+
+def test_concurrent_crawls_are_coalesced(cache, origin):
+    crawler = Crawler(cache=cache, thread_id="t1")
+
+    async def main():
+        await asyncio.gather(
+            *(crawler.acrawl("https://example.com/a") for _ in range(4))
+        )
+
+    asyncio.run(main())
+    threads = [
+        threading.Thread(target=crawler.crawl, args=("https://example.com/b",))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert origin["crawls"] == 2
+    stats = cache.stats("t1")
+    assert stats["miss"] == 2
+    assert stats["coalesced"] + stats.get("hit", 0) == 6
+
+
+def test_expired_pages_are_revalidated(cache, origin, monkeypatch):
+    def refuse(url, documents=True):
+        raise httpx.ConnectError("the origin refuses direct crawls")
+
+    async def arefuse(url, documents=True):
+        refuse(url)
+
+    # the hedged backend falls back to Jina at once
+    monkeypatch.setattr("src.crawler.crawler._crawl_direct", refuse)
+    monkeypatch.setattr("src.crawler.crawler._acrawl_direct", arefuse)
+    crawler = Crawler(cache=cache, thread_id="t2", backend="hedged")
+    crawler.crawl("https://example.com/a")
+    cache.ttl = 0
+    # the validators come with the first revalidation request
+    asyncio.run(crawler.acrawl("https://example.com/a"))
+    assert origin["crawls"] == 2
+    assert cache.get("https://example.com/a").etag == '"v1"'
+    crawler.crawl("https://example.com/a")
+    assert origin["crawls"] == 2
+    origin["etag"] = '"v2"'
+    asyncio.run(crawler.acrawl("https://example.com/a"))
+    assert origin["crawls"] == 3
+    assert cache.get("https://example.com/a").etag == '"v2"'
+    assert origin["heads"] == 3
+    assert cache.stats("t2") == {"miss": 1, "expired": 3, "revalidated": 1}
+
+
+def test_jina_backend_asks_the_origin_only_with_validators(cache, origin):
+    crawler = Crawler(cache=cache, thread_id="t3", backend="jina")
+    crawler.crawl("https://example.com/a")
+    cache.ttl = 0
+    # Jina gave no validators, there is nothing to ask the origin about
+    asyncio.run(crawler.acrawl("https://example.com/a"))
+    assert origin["crawls"] == 2 and origin["heads"] == 0
+
+    page = cache.get("https://example.com/a")
+    cache.put(dataclasses.replace(page, etag='"v1"'))
+    crawler.crawl("https://example.com/a")
+    assert origin["crawls"] == 2 and origin["heads"] == 1
+    assert cache.stats("t3") == {"miss": 1, "expired": 2, "revalidated": 1}
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    cache = CrawlCache(str(tmp_path), ttl=60, max_bytes=2500)
+    for name in ("a", "b"):
+        cache.put(CachedPage(url=f"https://example.com/{name}", html="x" * 1000))
+    assert cache.get("https://example.com/a") is not None
+    cache.put(CachedPage(url="https://example.com/c", html="x" * 1000))
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a") is not None
+
+    reopened = CrawlCache(str(tmp_path), ttl=60, max_bytes=2500)
+    assert reopened.stats()["entries"] == 2
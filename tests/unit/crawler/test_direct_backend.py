@@ -0,0 +1,249 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler.crawl_cache import CrawlCache
+from src.crawler.host_limiter import HostLimiter
+from src.crawler.http_client import (
+    AsyncLimitedTransport,
+    BlockedAddressError,
+    LimitedTransport,
+)
+
+TEXT = "<p>A static page served by the origin, long enough to be an article.</p>" * 5
+PAGES = {
+    "/article": ("text/html", f"<html><body><article>{TEXT}</article></body></html>"),
+    "/app": ("text/html", "<html><body><div id='root'></div></body></html>"),
+    "/paper.pdf": ("application/pdf", "%PDF-1.7\n"),
+}
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    requests: list[tuple[str, str]] = []
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path))
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+            self.path = "/article"
+        self._respond(with_body=True)
+
+    def do_HEAD(self):
+        self.requests.append(("HEAD", self.path))
+        self._respond(with_body=False)
+
+    def _respond(self, with_body: bool):
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OriginHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def origin(server, monkeypatch):
+    OriginHandler.requests = []
+    # the local origin is not rate limited, nor refused for being local
+    limiter = HostLimiter(host_rate=0)
+    for module in ("crawler", "direct_client"):
+        monkeypatch.setattr(
+            f"src.crawler.{module}.get_http_client",
+            lambda: httpx.Client(
+                transport=LimitedTransport(
+                    httpx.HTTPTransport(), limiter, allow_private_addresses=True
+                )
+            ),
+        )
+        monkeypatch.setattr(
+            f"src.crawler.{module}.get_async_http_client",
+            lambda: httpx.AsyncClient(
+                transport=AsyncLimitedTransport(
+                    httpx.AsyncHTTPTransport(), limiter, allow_private_addresses=True
+                )
+            ),
+        )
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+@pytest.fixture
+def jina(monkeypatch):
+    """Count the Jina crawls, failing them when ``fail`` is set."""
+    state = {"crawls": 0, "fail": False}
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            state["crawls"] += 1
+            if state["fail"]:
+                raise RuntimeError("Jina is down")
+            return "<html><body>jina</body></html>"
+
+        async def acrawl(self, url, return_format=None):
+            return self.crawl(url, return_format)
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article("Page", html)
+
+        async def aextract_article(self, html):
+            return Article("Page", html)
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+    return state
+
+
+def crawl(crawler: Crawler, url: str, mode: str) -> Article:
+    if mode == "sync":
+        return crawler.crawl(url)
+    return asyncio.run(crawler.acrawl(url))
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+def test_direct_backend_fetches_from_the_origin(origin, jina, mode):
+    article = crawl(Crawler(backend="direct"), f"{origin}/article", mode)
+    assert "served by the origin" in article.html_content
+    assert jina["crawls"] == 0
+
+
+def test_direct_backend_rejects_pages_without_text(origin, jina, mode):
+    with pytest.raises(ValueError):
+        crawl(Crawler(backend="direct"), f"{origin}/app", mode)
+
+
+def test_hedged_backend_keeps_a_fast_origin(origin, jina, mode):
+    crawler = Crawler(backend="hedged", hedge_delay=5)
+    article = crawl(crawler, f"{origin}/article", mode)
+    assert "served by the origin" in article.html_content
+    assert jina["crawls"] == 0
+
+
+def test_hedged_backend_asks_jina_when_the_origin_is_slow(origin, jina, mode):
+    crawler = Crawler(backend="hedged", hedge_delay=0.1)
+    start = time.perf_counter()
+    article = crawl(crawler, f"{origin}/slow", mode)
+    assert time.perf_counter() - start < 0.9
+    assert "jina" in article.html_content
+    assert jina["crawls"] == 1
+
+
+@pytest.mark.parametrize("path", ["/app", "/paper.pdf", "/missing"])
+def test_hedged_backend_falls_back_to_jina_at_once(origin, jina, mode, path):
+    crawler = Crawler(backend="hedged", hedge_delay=5)
+    start = time.perf_counter()
+    article = crawl(crawler, f"{origin}{path}", mode)
+    assert time.perf_counter() - start < 1
+    assert "jina" in article.html_content
+
+
+def test_hedged_backend_waits_for_the_origin_when_jina_fails(origin, jina, mode):
+    jina["fail"] = True
+    crawler = Crawler(backend="hedged", hedge_delay=0.1)
+    article = crawl(crawler, f"{origin}/slow", mode)
+    assert "served by the origin" in article.html_content
+
+
+def test_hedged_backend_raises_when_both_fail(origin, jina, mode):
+    jina["fail"] = True
+    with pytest.raises(RuntimeError, match="Jina is down"):
+        crawl(Crawler(backend="hedged", hedge_delay=5), f"{origin}/missing", mode)
+
+
+def test_direct_fetch_gives_the_cache_its_validators(origin, jina, mode, tmp_path):
+    cache = CrawlCache(str(tmp_path), ttl=0, max_bytes=10 * 1024 * 1024)
+    crawler = Crawler(cache=cache, thread_id="t1", backend="direct")
+    crawl(crawler, f"{origin}/article", mode)
+    assert OriginHandler.requests == [("GET", "/article")]
+
+    # the page is stale right away and revalidated with its ETag
+    crawl(crawler, f"{origin}/article", mode)
+    assert OriginHandler.requests[1:] == [("HEAD", "/article")]
+    assert cache.stats("t1")["revalidated"] == 1
+
+
+@pytest.fixture
+def guarded(monkeypatch):
+    """Send the requests of the direct backend through the address guard."""
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        # a public origin redirecting to the metadata service of the cloud
+        return httpx.Response(
+            302, headers={"Location": "http://169.254.169.254/latest/meta-data/"}
+        )
+
+    limiter = HostLimiter(host_rate=0)
+    monkeypatch.setattr(
+        "src.crawler.direct_client.get_http_client",
+        lambda: httpx.Client(
+            transport=LimitedTransport(httpx.MockTransport(handler), limiter),
+            follow_redirects=True,
+        ),
+    )
+    monkeypatch.setattr(
+        "src.crawler.direct_client.get_async_http_client",
+        lambda: httpx.AsyncClient(
+            transport=AsyncLimitedTransport(httpx.MockTransport(handler), limiter),
+            follow_redirects=True,
+        ),
+    )
+    return requests
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "10.0.0.5", "169.254.169.254"])
+def test_direct_backend_refuses_private_addresses(guarded, jina, mode, host):
+    with pytest.raises(BlockedAddressError):
+        crawl(Crawler(backend="direct"), f"http://{host}/article", mode)
+    assert guarded == []
+
+    article = crawl(Crawler(backend="hedged"), f"http://{host}/article", mode)
+    assert "jina" in article.html_content
+
+
+def test_direct_backend_refuses_redirects_to_private_addresses(guarded, jina, mode):
+    with pytest.raises(BlockedAddressError):
+        crawl(Crawler(backend="direct"), "http://93.184.215.14/article", mode)
+    assert guarded == ["http://93.184.215.14/article"]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown crawler backend"):
+        Crawler(backend="firecrawl")
@@ -0,0 +1,196 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler.document_extractor import (
+    document_kind,
+    extract_document,
+    guess_document_kind,
+)
+from src.crawler.host_limiter import HostLimiter
+from src.crawler.http_client import AsyncLimitedTransport, LimitedTransport
+
+SENTENCE = "Deer flow crawls documents without a browser. "
+
+
+def make_pdf(pages: list[str], title: str = "") -> bytes:
+    """Build a minimal PDF with one line of text per page."""
+    count = len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (" ".join(f"{4 + 2 * i} 0 R" for i in range(count)), count),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append(f"<< /Title ({title}) >>")
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info {len(objects)} 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return pdf
+
+
+def test_document_kind():
+    assert document_kind("application/json; charset=utf-8") == "json"
+    assert document_kind("application/ld+json") == "json"
+    assert document_kind("text/plain") == "text"
+    assert document_kind("text/markdown") == "text"
+    assert document_kind("text/html", b"<html>") is None
+    assert document_kind("image/png") is None
+
+
+def test_guess_document_kind():
+    assert guess_document_kind("https://example.com/data/report.JSON") == "json"
+    assert guess_document_kind("https://example.com/README.md?plain=1") == "text"
+    assert guess_document_kind("https://example.com/v1.2/index") is None
+    assert guess_document_kind("https://example.com/") is None
+
+
+def test_text_is_split_into_paragraphs():
+    text = f"First para-\ngraph,\nwrapped.\n\n{SENTENCE * 40}"
+    article = extract_document("https://example.com/notes.txt", "text", text.encode())
+    blocks = list(article.iter_markdown_blocks())
+    assert blocks[0] == "First paragraph, wrapped."
+    # long paragraphs are cut at sentence ends into passage-sized blocks
+    assert len(blocks) > 2
+    assert all(len(block) < 1300 for block in blocks)
+    assert all(block.endswith(".") for block in blocks)
+    assert article.title == "notes.txt"
+    assert "<p>First paragraph, wrapped.</p>" in article.html_content
+
+
+def test_json_is_pretty_printed():
+    data = json.dumps({"name": "deer", "tags": ["<flow>"]}).encode()
+    article = extract_document("https://example.com/api.json", "json", data)
+    markdown = article.to_markdown(including_title=False)
+    assert markdown.startswith("```json\n{\n")
+    assert '"tags": [\n    "<flow>"' in markdown
+    assert "&lt;flow&gt;" in article.html_content
+
+
+def test_pdf_is_extracted_up_to_the_page_limit():
+    pdf = make_pdf(["Alpha page text", "Beta page text", "Gamma"], title="Report")
+    article = extract_document("https://example.com/r.pdf", "pdf", pdf, max_pages=2)
+    assert article.title == "Report"
+    assert article.to_markdown(including_title=False) == (
+        "### Page 1\n\nAlpha page text\n\n### Page 2\n\nBeta page text\n\n"
+        "[1 more pages not extracted]"
+    )
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    """Serve documents from a mock origin to the direct client, failing Jina."""
+    pages = {}
+
+    def handler(request):
+        if request.url.path not in pages:
+            return httpx.Response(404)
+        content_type, body = pages[request.url.path]
+        return httpx.Response(200, headers={"Content-Type": content_type}, content=body)
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        "src.crawler.direct_client.get_http_client",
+        lambda: httpx.Client(transport=transport),
+    )
+    monkeypatch.setattr(
+        "src.crawler.direct_client.get_async_http_client",
+        lambda: httpx.AsyncClient(transport=transport),
+    )
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            return "<html><body>jina</body></html>"
+
+        async def acrawl(self, url, return_format=None):
+            return self.crawl(url, return_format)
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article("Page", html)
+
+        async def aextract_article(self, html):
+            return Article("Page", html)
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+    return pages
+
+
+@pytest.fixture(params=["sync", "async"])
+def crawl(request):
+    def crawl(crawler: Crawler, url: str) -> Article:
+        if request.param == "sync":
+            return crawler.crawl(url)
+        return asyncio.run(crawler.acrawl(url))
+
+    return crawl
+
+
+def test_text_documents_skip_the_html_pipeline(origin, crawl):
+    origin["/notes.txt"] = ("text/plain", b"Plain <b>text</b> notes")
+    article = crawl(Crawler(backend="jina"), "https://example.com/notes.txt")
+    assert article.url == "https://example.com/notes.txt"
+    assert article.to_markdown() == "# notes.txt\n\nPlain <b>text</b> notes"
+
+
+def test_html_behind_a_document_url_goes_to_the_backend(origin, crawl):
+    origin["/notes.txt"] = ("text/html", b"<html><body>notes</body></html>")
+    article = crawl(Crawler(backend="jina"), "https://example.com/notes.txt")
+    assert "jina" in article.html_content
+
+
+def test_direct_backend_dispatches_on_the_content_type(origin, crawl):
+    origin["/download"] = ("application/octet-stream", make_pdf(["Paper text"]))
+    origin["/api"] = ("application/json", b'{"ok": true}')
+    article = crawl(Crawler(backend="direct"), "https://example.com/download")
+    assert "Paper text" in article.to_markdown()
+    article = crawl(Crawler(backend="direct"), "https://example.com/api")
+    assert '"ok": true' in article.to_markdown()
+
+
+def test_documents_on_private_addresses_are_left_to_jina(origin, crawl, monkeypatch):
+    def handler(request):
+        return httpx.Response(200, json={"secret": True})
+
+    limiter = HostLimiter(host_rate=0)
+    monkeypatch.setattr(
+        "src.crawler.direct_client.get_http_client",
+        lambda: httpx.Client(
+            transport=LimitedTransport(httpx.MockTransport(handler), limiter)
+        ),
+    )
+    monkeypatch.setattr(
+        "src.crawler.direct_client.get_async_http_client",
+        lambda: httpx.AsyncClient(
+            transport=AsyncLimitedTransport(httpx.MockTransport(handler), limiter)
+        ),
+    )
+    url = "http://169.254.169.254/latest/meta-data/credentials.json"
+    article = crawl(Crawler(backend="jina"), url)
+    assert "secret" not in article.html_content
+    assert "jina" in article.html_content
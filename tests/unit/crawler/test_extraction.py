@@ -0,0 +1,60 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.crawler.extraction_pool import ExtractionPool, ExtractionQueueFull
+from src.crawler.simple_extractor import extract_simple_article
+
+PARAGRAPHS = "<p>DeerFlow extracts the text of articles for the researcher.</p>" * 10
+
+
+def page(body: str) -> str:
+    return f"<html><head><title>Title</title></head><body>{body}</body></html>"
+
+
+def test_simple_pages_are_extracted_without_boilerplate():
+    article = extract_simple_article(
+        page(
+            "<nav><a href='/'>Home</a></nav>"
+            f"<article><h1>Heading</h1><script>track()</script>{PARAGRAPHS}</article>"
+            "<footer>Copyright</footer>"
+        )
+    )
+    assert article.title == "Title"
+    markdown = article.to_markdown()
+    assert "Heading" in markdown and "DeerFlow extracts" in markdown
+    assert "track()" not in markdown
+    assert "Home" not in markdown and "Copyright" not in markdown
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        f"<article>{PARAGRAPHS}</article><article>{PARAGRAPHS}</article>",
+        f"<div>{PARAGRAPHS}</div><article><p>Only a teaser.</p></article>",
+        "<article><p>Too short.</p></article>",
+        f"<div>{PARAGRAPHS}</div>",
+    ],
+)
+def test_other_pages_are_left_to_readability(body):
+    assert extract_simple_article(page(body)) is None
+
+
+def test_pool_extracts_articles_in_worker_processes():
+    pool = ExtractionPool(max_workers=1, use_readability=False)
+    try:
+        article = asyncio.run(pool.extract(page(f"<div>{PARAGRAPHS}</div>")))
+    finally:
+        pool.shutdown()
+    assert "DeerFlow extracts" in article.markdown
+    assert pool.pending == 0
+
+
+def test_full_queue_fails_after_the_timeout():
+    pool = ExtractionPool(max_workers=1, max_queue_depth=0, queue_timeout=0.01)
+    pool._slots.acquire()
+    with pytest.raises(ExtractionQueueFull):
+        asyncio.run(pool.extract(page(PARAGRAPHS)))
@@ -0,0 +1,181 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import email.utils
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.crawler.host_limiter import HostLimiter, HostQueueTimeout, parse_retry_after
+from src.crawler.http_client import AsyncLimitedTransport, LimitedTransport
+
+
+def make_limiter(**kwargs) -> HostLimiter:
+    options = dict(
+        max_in_flight=100,
+        host_concurrency=2,
+        host_rate=0,
+        host_burst=1,
+        max_backoff=5,
+        queue_timeout=5,
+        host_limits={},
+    )
+    options.update(kwargs)
+    return HostLimiter(**options)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28 < parse_retry_after(retry_at) <= 30
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_concurrency_is_capped_per_host():
+    limiter = make_limiter(host_concurrency=2)
+    running = peak = 0
+    lock = threading.Lock()
+
+    def crawl(host):
+        nonlocal running, peak
+        limiter.acquire(host)
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        limiter.release(host, 200)
+
+    threads = [threading.Thread(target=crawl, args=("a.com",)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_async_requests_share_the_global_cap():
+    limiter = make_limiter(max_in_flight=3, host_concurrency=10)
+    running = peak = 0
+
+    async def crawl(host):
+        nonlocal running, peak
+        await limiter.aacquire(host)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        limiter.release(host, 200)
+
+    async def main():
+        await asyncio.gather(*(crawl(f"host{i % 4}.com") for i in range(20)))
+
+    asyncio.run(main())
+    assert peak == 3
+
+
+def test_token_bucket_paces_requests():
+    limiter = make_limiter(host_rate=20, host_burst=1, host_concurrency=10)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire("a.com")
+        limiter.release("a.com", 200)
+    # the first request uses the burst, the others wait 50ms each
+    assert 0.18 < time.monotonic() - start < 1
+    # other hosts have their own bucket
+    start = time.monotonic()
+    limiter.acquire("b.com")
+    assert time.monotonic() - start < 0.05
+
+
+def test_backoff_pauses_the_host_and_halves_its_limit():
+    limiter = make_limiter(host_concurrency=4)
+    limiter.acquire("a.com")
+    limiter.release("a.com", 429, retry_after=0.2)
+    stats = limiter.stats()["hosts"]["a.com"]
+    assert stats["limit"] == 2
+    assert 0.1 < stats["backoff_seconds"] <= 0.2
+
+    start = time.monotonic()
+    limiter.acquire("a.com")
+    assert time.monotonic() - start >= 0.15
+    limiter.release("a.com", 200)
+    assert limiter.stats()["hosts"]["a.com"]["limit"] == 3
+
+
+def test_waiting_requests_are_counted_and_time_out():
+    limiter = make_limiter(host_concurrency=1, queue_timeout=0.3)
+    limiter.acquire("a.com")
+    waiter = threading.Thread(
+        target=lambda: pytest.raises(HostQueueTimeout, limiter.acquire, "a.com")
+    )
+    waiter.start()
+    time.sleep(0.1)
+    assert limiter.stats()["hosts"]["a.com"]["waiting"] == 1
+    assert limiter.stats()["waiting"] == 1
+    waiter.join()
+    assert limiter.stats()["hosts"]["a.com"]["waiting"] == 0
+
+    with pytest.raises(HostQueueTimeout):
+        asyncio.run(limiter.aacquire("a.com"))
+
+
+class Body(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """A streamed body, which stays open until the response is closed."""
+
+    def __iter__(self):
+        yield b"ok"
+
+    async def __aiter__(self):
+        yield b"ok"
+
+
+def throttling_handler(statuses: list[tuple[int, dict]]):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status, headers = statuses[min(len(calls), len(statuses)) - 1]
+        return httpx.Response(status, headers=headers, stream=Body())
+
+    return handler, calls
+
+
+def test_transport_retries_throttled_requests():
+    limiter = make_limiter()
+    handler, calls = throttling_handler(
+        [(429, {"Retry-After": "0"}), (503, {}), (200, {})]
+    )
+    client = httpx.Client(
+        transport=LimitedTransport(httpx.MockTransport(handler), limiter, max_retries=2)
+    )
+    response = client.get("https://a.com/page")
+    assert response.text == "ok"
+    assert len(calls) == 3
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_async_transport_gives_up_on_long_retry_after():
+    limiter = make_limiter(max_backoff=5)
+    handler, calls = throttling_handler([(429, {"Retry-After": "3600"})])
+
+    async def main():
+        transport = AsyncLimitedTransport(httpx.MockTransport(handler), limiter)
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "https://a.com/page") as response:
+                # the slot is held until the streamed response is closed
+                assert limiter.stats()["in_flight"] == 1
+                return response.status_code
+
+    assert asyncio.run(main()) == 429
+    assert len(calls) == 1
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.stats()["hosts"]["a.com"]["backoff_seconds"] == pytest.approx(
+        5, abs=0.5
+    )
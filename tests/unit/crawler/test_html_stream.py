@@ -0,0 +1,129 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.crawler.html_stream import (
+    HTMLDocument,
+    HTMLStream,
+    UnsupportedContentError,
+    afetch_html,
+    fetch_html,
+    is_html,
+)
+from src.crawler.simple_extractor import extract_simple_article
+
+PAGE = (
+    "<!DOCTYPE html><html><head><title>Stream</title></head><body>"
+    "<article><h1>Stream</h1>"
+    + "<p>A paragraph of the article streamed chunk by chunk.</p>" * 20
+    + "</article></body></html>"
+)
+
+
+class ChunkedBody(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """A response body counting how many of its chunks were read."""
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.read = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+def make_clients(body: ChunkedBody, content_type: str):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": content_type}, stream=body)
+
+    transport = httpx.MockTransport(handler)
+    return httpx.Client(transport=transport), httpx.AsyncClient(transport=transport)
+
+
+def test_is_html_sniffs_mislabeled_and_binary_bodies():
+    assert is_html("text/html; charset=utf-8", b"<p>hi</p>")
+    assert is_html("text/plain", b"\n<!DOCTYPE html><html>")
+    assert not is_html("text/plain", b"just some text")
+    assert not is_html("application/pdf", b"<html>")
+    assert not is_html("text/html", b"%PDF-1.7\n")
+    assert not is_html("", b"\x89PNG\r\n\x1a\n")
+
+
+def test_stream_parses_the_page_chunk_by_chunk():
+    stream = HTMLStream("https://example.com", "text/html")
+    encoded = PAGE.encode()
+    for i in range(0, len(encoded), 100):
+        assert stream.feed(encoded[i : i + 100])
+    document = stream.close()
+
+    assert isinstance(document, HTMLDocument)
+    assert document == PAGE
+    assert not document.truncated
+    assert document.tree.findtext(".//title") == "Stream"
+    article = extract_simple_article(document)
+    assert article.title == "Stream"
+
+
+def test_stream_decodes_multibyte_characters_split_across_chunks():
+    encoded = "<html><body><p>Grüße, 世界</p></body></html>".encode()
+    stream = HTMLStream("https://example.com", "text/html; charset=utf-8")
+    for i in range(len(encoded)):
+        stream.feed(encoded[i : i + 1])
+    assert "Grüße, 世界" in stream.close()
+
+
+def test_stream_uses_the_charset_of_the_meta_tag():
+    encoded = '<html><head><meta charset="iso-8859-1"></head><p>café</p></html>'
+    stream = HTMLStream("https://example.com", "text/html")
+    stream.feed(encoded.encode("iso-8859-1"))
+    assert "café" in stream.close()
+
+
+def test_fetch_stops_reading_at_max_bytes():
+    body = ChunkedBody([b"<html><body>"] + [b"<p>" + b"x" * 1000 + b"</p>"] * 100)
+    client, async_client = make_clients(body, "text/html")
+
+    document = fetch_html(client, "GET", "https://example.com", max_bytes=4096)
+    assert document.truncated
+    assert len(document) == 4096
+    assert body.read < 10
+    assert document.tree is not None
+
+    body.read = 0
+    document = asyncio.run(
+        afetch_html(async_client, "GET", "https://example.com", max_bytes=4096)
+    )
+    assert document.truncated and body.read < 10
+    # parsing is left to the extraction workers, off the event loop
+    assert document.tree is None
+
+
+def test_fetch_rejects_non_html_bodies_after_the_first_chunk():
+    body = ChunkedBody([b"%PDF-1.7\n" + b"\x00" * 2048] * 100)
+    client, async_client = make_clients(body, "application/pdf")
+
+    with pytest.raises(UnsupportedContentError) as error:
+        fetch_html(client, "GET", "https://example.com/paper.pdf")
+    assert error.value.content_type == "application/pdf"
+    assert body.read == 1
+
+    body.read = 0
+    with pytest.raises(UnsupportedContentError):
+        asyncio.run(afetch_html(async_client, "GET", "https://example.com/paper.pdf"))
+    assert body.read == 1
+
+
+def test_fetch_rejects_empty_bodies():
+    client, _ = make_clients(ChunkedBody([]), "text/html")
+    with pytest.raises(UnsupportedContentError):
+        fetch_html(client, "GET", "https://example.com")
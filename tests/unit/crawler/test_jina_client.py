@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.crawler import Crawler
+from src.crawler.http_client import (
+    close_http_clients,
+    get_async_http_client,
+    get_http_client,
+)
+from src.crawler.jina_client import JINA_READER_URL, JinaClient
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    assert str(request.url) == JINA_READER_URL
+    assert request.headers["X-Return-Format"] == "html"
+    url = json.loads(request.content)["url"]
+    if url.endswith("/missing"):
+        return httpx.Response(404, text="not found")
+    return httpx.Response(
+        200,
+        text=f"<html><head><title>Page</title></head><body><p>{url}</p></body></html>",
+    )
+
+
+@pytest.fixture
+def mock_clients(monkeypatch):
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        "src.crawler.jina_client.get_http_client",
+        lambda: httpx.Client(transport=transport),
+    )
+    monkeypatch.setattr(
+        "src.crawler.jina_client.get_async_http_client",
+        lambda: httpx.AsyncClient(transport=transport),
+    )
+
+
+def test_crawl_and_acrawl_return_the_same_html(mock_clients):
+    client = JinaClient()
+    html = client.crawl("https://example.com/a")
+    assert "https://example.com/a" in html
+    assert asyncio.run(client.acrawl("https://example.com/a")) == html
+
+
+def test_error_responses_raise(mock_clients):
+    with pytest.raises(httpx.HTTPStatusError):
+        JinaClient().crawl("https://example.com/missing")
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(JinaClient().acrawl("https://example.com/missing"))
+
+
+def test_crawler_acrawl_extracts_the_article(monkeypatch):
+    class DummyJinaClient:
+        async def acrawl(self, url, return_format=None):
+            return "<html>dummy</html>"
+
+    class DummyReadabilityExtractor:
+        async def aextract_article(self, html):
+            class DummyArticle:
+                url = None
+
+            return DummyArticle()
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+    article = asyncio.run(Crawler().acrawl("http://example.com"))
+    assert article.url == "http://example.com"
+
+
+def test_http_clients_are_shared_and_closed():
+    async def main():
+        client = get_async_http_client()
+        assert get_async_http_client() is client
+        sync_client = get_http_client()
+        assert get_http_client() is sync_client
+        await close_http_clients()
+        return client, sync_client
+
+    client, sync_client = asyncio.run(main())
+    assert client.is_closed and sync_client.is_closed
@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from lxml import etree
+from markdownify import markdownify as md
+
+from src.crawler.article import Article
+from src.crawler.markdown_converter import (
+    Image,
+    MarkdownConverter,
+    html_to_markdown,
+    parse_fragment,
+)
+
+# the HTML of the crawler tests and the elements of typical articles
+COMPATIBILITY_CASES = [
+    "<p>Hello <b>world</b>!</p>",
+    "<p>Hello world!</p>",
+    '<p>Intro</p><img src="img/pic.png"/>',
+    '<p>Start</p><img src="a.png"/><p>Mid</p><img src="b.jpg"/>End',
+    "<div><h2>Head</h2><p>One <b>two</b></p>tail"
+    "<section><p>Three</p><img src='a.png'/></section></div>",
+    "<h1> Title <b>x</b></h1><h3>Sub</h3><h6>Small</h6>",
+    "<p>a_b *c* [x] <i>it</i> <em>em</em> <strong>st</strong></p>",
+    "<p>a <b> spaced </b> <b></b> x</p>",
+    '<p><a href="http://x">http://x</a> <a href="/u" title="T">l</a> <a>no</a></p>',
+    '<p><a href="/img"><img src="i.png" alt="alt"></a></p>',
+    "<p>x</p><script>var a = 1</script><style>p {}</style>tail",
+    "<ul><li>a<ul><li>b<ul><li>c</li></ul></li></ul></li><li>d</li></ul>",
+    "<ul><li><p>p1</p><p>p2</p></li><li>c</li></ul>",
+    "<ol start=3><li>a</li><li>b</li></ol>",
+    "<blockquote><p>a</p><p>b</p></blockquote>",
+    "<pre><code>x = 1\n  y = [*a]</code></pre><p>after</p>",
+    "<p><code>a_b</code> and <kbd>Ctrl</kbd></p>",
+    "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>",
+    "<table><tr><td>1</td><td>2</td></tr><tr><td>3</td><td>4</td></tr></table>",
+    "<div>a<div>b</div>c</div><hr><p>one\n  two<br>three</p>",
+    "<p><del>d</del> <s>s</s> <u>u</u> H<sub>2</sub>O</p>",
+    "<article><h1>Heading</h1><p>DeerFlow extracts the text of articles.</p></article>",
+]
+
+
+def normalize(markdown: str) -> str:
+    # block separators and runs of spaces differ, e.g. images are blocks of their own
+    return "".join(markdown.split())
+
+
+@pytest.mark.parametrize("html", COMPATIBILITY_CASES)
+def test_output_matches_markdownify(html):
+    assert normalize(html_to_markdown(html)) == normalize(md(html))
+
+
+@pytest.mark.parametrize("html", COMPATIBILITY_CASES)
+def test_article_markdown_and_blocks_agree(html):
+    article = Article("Title", html)
+    blocks = list(Article("Title", html).iter_markdown_blocks())
+    assert "\n\n".join(blocks) == article.to_markdown(including_title=False)
+
+
+def test_top_level_images_are_blocks_of_their_own():
+    blocks = list(
+        MarkdownConverter().iter_blocks(
+            parse_fragment('<p>a<img src="x.png" alt="X" title="T">b</p>')
+        )
+    )
+    assert blocks == ["a", Image("x.png", "X", "T"), "b"]
+    assert blocks[1].markdown == '![X](x.png "T")'
+
+
+def test_to_message_converts_in_one_pass_and_memoizes_the_markdown():
+    html = (
+        "<p>Intro</p><ul><li>Item <img src='nested.png'></li></ul><img src='top.png'>"
+    )
+    article = Article("Title", html)
+    article.url = "https://host.com/path/"
+    message = article.to_message()
+
+    assert message[0] == {"type": "text", "text": "# Title\n\nIntro\n\n* Item"}
+    image_urls = [i["image_url"]["url"] for i in message if i["type"] == "image_url"]
+    assert image_urls == [
+        "https://host.com/path/nested.png",
+        "https://host.com/path/top.png",
+    ]
+    assert article.markdown == "Intro\n\n* Item ![](nested.png)\n\n![](top.png)"
+    # the memoized Markdown gives the same message
+    assert article.to_message() == message
+
+
+def test_max_chars_stops_the_conversion():
+    html = "".join(f"<p>Paragraph {i} of a very long article.</p>" for i in range(1000))
+    markdown = html_to_markdown(html, max_chars=500)
+    assert len(markdown) <= 503
+    assert markdown.startswith("Paragraph 0 ")
+    assert markdown.endswith("...")
+
+
+def test_deeply_nested_html_does_not_recurse():
+    # built by hand, the HTML parser stops nesting at 255 levels
+    root = element = etree.Element("div")
+    for _ in range(5000):
+        element = etree.SubElement(element, "div")
+    etree.SubElement(element, "p").text = "deep"
+    assert list(MarkdownConverter().iter_blocks(root)) == ["deep"]
+
+
+def test_empty_and_broken_html():
+    assert html_to_markdown("") == ""
+    assert html_to_markdown("   ") == ""
+    assert html_to_markdown("<p>unclosed <b>bold") == "unclosed **bold**"
+    assert html_to_markdown("<!-- comment -->text") == "text"
+    assert html_to_markdown("<p>a<!-- comment --> b</p>") == "a b"
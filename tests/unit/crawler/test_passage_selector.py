@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.crawler import Article
+from src.crawler.passage_selector import PassageSelector
+from src.utils.text_utils import estimate_tokens
+
+FILLER = "The committee discussed the agenda and approved the minutes of the meeting. "
+
+
+def blocks():
+    for section in range(20):
+        yield f"Section {section}\n----------"
+        for _ in range(3):
+            yield FILLER * 5
+    yield "Battery chemistry\n-----------------"
+    yield "Solid state lithium batteries double the energy density of cells."
+
+
+def test_short_pages_are_kept_whole():
+    text = "# Title\n\nOne paragraph.\n\nAnother paragraph."
+    selected = PassageSelector().select(text.split("\n\n"), "paragraph", 500)
+    assert selected == text
+
+
+def test_relevant_passages_are_selected_within_the_budget():
+    selected = PassageSelector().select(blocks(), "lithium battery energy density", 300)
+    assert "Solid state lithium batteries" in selected
+    assert "Battery chemistry" in selected
+    assert selected.startswith("[...]")
+    assert estimate_tokens(selected) <= 300 + 10
+
+
+def test_pages_without_query_keep_the_lead_and_stop_early():
+    consumed = 0
+
+    def counting_blocks():
+        nonlocal consumed
+        for block in blocks():
+            consumed += 1
+            yield block
+
+    selected = PassageSelector().select(counting_blocks(), "", 200)
+    assert selected.startswith("Section 0")
+    assert "lithium" not in selected
+    assert consumed < 10
+
+
+def test_scanning_stops_after_a_multiple_of_the_budget():
+    consumed = 0
+
+    def endless_blocks():
+        nonlocal consumed
+        while True:
+            consumed += 1
+            yield FILLER * 5
+
+    PassageSelector(scan_factor=5).select(endless_blocks(), "agenda", 100)
+    assert consumed < 10
+
+
+def test_article_blocks_follow_the_document():
+    article = Article(
+        "Title",
+        "<div><h2>Head</h2><p>One <b>two</b></p>tail"
+        "<section><p>Three</p><img src='a.png'/></section></div>",
+    )
+    assert list(article.iter_markdown_blocks()) == [
+        "Head\n----",
+        "One **two**",
+        "tail",
+        "Three",
+        "![](a.png)",
+    ]
+    assert article.to_text() == "Head One two tail Three"
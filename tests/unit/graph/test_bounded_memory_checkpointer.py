@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import operator
+import time
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+
+from src.graph.checkpointer import BoundedMemorySaver
+
+
+class ReviewState(TypedDict):
+    values: Annotated[list[str], operator.add]
+
+
+def build_review_graph(checkpointer, with_review=False):
+    def review(state):
+        return {"values": [interrupt("review")]}
+
+    builder = StateGraph(ReviewState)
+    builder.add_node("work", lambda state: {"values": ["work"]})
+    builder.add_edge(START, "work")
+    if with_review:
+        builder.add_node("review", review)
+        builder.add_edge("work", "review")
+        builder.add_edge("review", END)
+    else:
+        builder.add_edge("work", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def thread(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_lru_cap_evicts_least_recently_used_threads():
+    saver = BoundedMemorySaver(max_threads=4, low_watermark=0.5)
+    graph = build_review_graph(saver)
+    for i in range(4):
+        graph.invoke({"values": []}, thread(f"t{i}"))
+    # reading t0 makes t1 the least recently used thread
+    graph.get_state(thread("t0"))
+    graph.invoke({"values": []}, thread("t4"))
+
+    assert saver.stats()["threads"] == 2
+    assert saver.evictions["lru"] == 3
+    assert graph.get_state(thread("t1")).values == {}
+    assert graph.get_state(thread("t4")).values["values"] == ["work"]
+    assert not any(key[0] == "t1" for key in saver.blobs)
+
+
+def test_interrupted_threads_survive_lru_cap():
+    saver = BoundedMemorySaver(max_threads=2, low_watermark=0.5)
+    review_graph = build_review_graph(saver, with_review=True)
+    review_graph.invoke({"values": []}, thread("review"))
+    assert saver.stats()["interrupted"] == 1
+
+    graph = build_review_graph(saver)
+    for i in range(3):
+        graph.invoke({"values": []}, thread(f"t{i}"))
+
+    assert "review" in saver.threads
+    result = review_graph.invoke(Command(resume="accepted"), thread("review"))
+    assert result["values"] == ["work", "accepted"]
+    assert saver.threads["review"].status == "running"
+
+
+def test_ttl_depends_on_thread_status():
+    saver = BoundedMemorySaver(
+        idle_ttl=0.05, interrupt_ttl=10, finished_ttl=0, sweep_interval=0
+    )
+    build_review_graph(saver, with_review=True).invoke({"values": []}, thread("wait"))
+    graph = build_review_graph(saver)
+    graph.invoke({"values": []}, thread("done"))
+    saver.mark_finished("done")
+    graph.invoke({"values": []}, thread("idle"))
+    time.sleep(0.1)
+    saver.evict()
+
+    assert list(saver.threads) == ["wait"]
+    assert saver.evictions == {"finished_ttl": 1, "running_ttl": 1}
+
+
+def test_get_state_of_unknown_thread_does_not_allocate():
+    saver = BoundedMemorySaver()
+    graph = build_review_graph(saver)
+    assert graph.get_state(thread("missing")).values == {}
+    assert "missing" not in saver.storage
+    assert saver.stats()["threads"] == 0
@@ -0,0 +1,100 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.checkpointer import DeltaCodec, DeltaMemorySaver, SQLiteSaver
+from src.graph.types import append_list
+
+
+class ObservationState(TypedDict):
+    observations: Annotated[list[str], append_list]
+
+
+def build_observation_graph(checkpointer, steps):
+    builder = StateGraph(ObservationState)
+    previous = START
+    for i in range(steps):
+        builder.add_node(
+            f"step_{i}", lambda state, i=i: {"observations": [f"finding {i} " * 200]}
+        )
+        builder.add_edge(previous, f"step_{i}")
+        previous = f"step_{i}"
+    builder.add_edge(previous, END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def blob_bytes(saver):
+    return sum(len(blob[1]) for blob in saver.blobs.values())
+
+
+def test_append_list_reducer():
+    assert append_list(["a"], ["b"]) == ["a", "b"]
+    assert append_list(["a"], None) == []
+    assert append_list(None, ["b"]) == ["b"]
+
+
+def test_codec_round_trip_and_fallback():
+    codec = DeltaCodec(JsonPlusSerializer(), max_chain=2)
+    stored = {}
+    key = ("thread", "", "messages")
+    values = [
+        [HumanMessage(content="a")],
+        [HumanMessage(content="a"), HumanMessage(content="b")],
+        [HumanMessage(content="c")],  # not an extension, stored in full
+        [HumanMessage(content="c"), HumanMessage(content="d")],
+        [HumanMessage(content="c"), HumanMessage(content="d"), HumanMessage("e")],
+        [HumanMessage(content="c"), HumanMessage(content="d"), HumanMessage("e")],
+    ]
+    for version, value in enumerate(values):
+        stored[str(version)] = codec.dumps(key, version, value)
+
+    assert codec.base_version(stored["1"]) == "0"
+    assert codec.base_version(stored["2"]) is None
+    assert codec.base_version(stored["4"]) == "3"
+    # max_chain forces a full snapshot
+    assert codec.base_version(stored["5"]) is None
+    for version, value in enumerate(values):
+        assert codec.loads(stored[str(version)], stored.get) == value
+
+
+def test_delta_memory_saver_grows_linearly():
+    full, delta = MemorySaver(), DeltaMemorySaver()
+    config = {"configurable": {"thread_id": "t1"}}
+    sizes = {}
+    for steps in (5, 10):
+        for name, saver in (("full", full), ("delta", delta)):
+            saver.delete_thread("t1")
+            state = build_observation_graph(saver, steps).invoke(
+                {"observations": []}, config
+            )
+            assert len(state["observations"]) == steps
+            sizes[(steps, name)] = blob_bytes(saver)
+
+    # doubling the steps roughly doubles the bytes instead of quadrupling them
+    assert sizes[(10, "delta")] < 2.5 * sizes[(5, "delta")]
+    assert sizes[(10, "full")] > 3 * sizes[(5, "full")]
+    graph = build_observation_graph(delta, 10)
+    assert graph.get_state(config).values["observations"] == state["observations"]
+    # every historical checkpoint can still be restored
+    history = list(graph.get_state_history(config))
+    assert [len(h.values.get("observations", [])) for h in history][:3] == [10, 9, 8]
+
+
+def test_sqlite_saver_keeps_delta_bases_when_trimming(tmp_path):
+    saver = SQLiteSaver(
+        str(tmp_path / "checkpoints.sqlite"),
+        max_checkpoints_per_thread=2,
+        prune_interval=0,
+    )
+    config = {"configurable": {"thread_id": "t1"}}
+    graph = build_observation_graph(saver, 8)
+    graph.invoke({"observations": []}, config)
+    saver.flush()
+    assert len(graph.get_state(config).values["observations"]) == 8
+    saver.close()
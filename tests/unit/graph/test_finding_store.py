@@ -0,0 +1,162 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.graph.checkpointer import BoundedMemorySaver, SQLiteSaver, build_checkpointer
+from src.graph.finding_store import FindingStore, is_finding_ref, summarize_finding
+from src.graph.nodes import (
+    _execute_agent_step,
+    _record_finding,
+    planner_node,
+    reporter_node,
+)
+from src.prompts.planner_model import Plan, Step, StepType
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FindingStore(str(tmp_path))
+    with patch("src.graph.finding_store._finding_store", store):
+        yield store
+
+
+def make_plan():
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="thought",
+        title="title",
+        steps=[
+            Step(
+                need_search=True,
+                title=f"Step {i}",
+                description=f"Description {i}",
+                step_type=StepType.RESEARCH,
+            )
+            for i in range(2)
+        ],
+    )
+
+
+def test_put_is_content_addressed(store):
+    ref = store.put("t1", "finding")
+    assert is_finding_ref(ref)
+    assert store.put("t1", "finding") == ref
+    assert store.put("t1", "other") != ref
+    assert store.get("t1", ref) == "finding"
+    # findings are kept per thread
+    with pytest.raises(KeyError):
+        store.get("t2", ref)
+
+
+def test_memory_is_bounded_and_findings_reload_from_disk(tmp_path):
+    store = FindingStore(str(tmp_path), max_memory_bytes=250)
+    refs = [store.put("t1", f"{i}" * 100) for i in range(5)]
+    assert store.memory_bytes <= 250
+    assert [store.get("t1", ref) for ref in refs] == [f"{i}" * 100 for i in range(5)]
+    # a new store on the same directory, e.g. after a restart
+    assert FindingStore(str(tmp_path)).get("t1", refs[0]) == "0" * 100
+
+
+def test_resolve(store):
+    ref = store.put("t1", "finding")
+    assert store.resolve("t1", ref) == "finding"
+    assert store.resolve("t1", "plain text") == "plain text"
+    assert store.resolve("t1", None) is None
+    assert store.resolve("t1", "finding:" + "0" * 64) == "[finding unavailable]"
+
+
+def test_delete_thread_and_sweep(tmp_path):
+    store = FindingStore(str(tmp_path), thread_ttl=60)
+    ref = store.put("old/thread", "old")
+    store.put("t2", "new")
+    store.delete_thread("t2")
+    assert os.listdir(tmp_path) != []
+    with patch("src.graph.finding_store.time.time", return_value=time.time() + 120):
+        store.sweep()
+    assert os.listdir(tmp_path) == []
+    with pytest.raises(KeyError):
+        store.get("old/thread", ref)
+
+
+def test_summarize_finding():
+    assert summarize_finding("short") == "short"
+    summary = summarize_finding("word " * 100, max_chars=20)
+    assert summary == "word word word word..."
+
+
+def test_agent_step_stores_finding_and_reporter_resolves_it(store):
+    agent = MagicMock()
+
+    async def ainvoke(input, config):
+        # the first step's finding is resolved for the second step
+        if "<finding>" in input["messages"][0].content:
+            assert "full text of step 0" in input["messages"][0].content
+        return {"messages": [AIMessage(content="full text of step 0 " * 50)]}
+
+    agent.ainvoke = ainvoke
+    plan = make_plan()
+    state = {"current_plan": plan, "messages": [], "locale": "en-US"}
+    command = asyncio.run(_execute_agent_step(state, agent, "researcher", "t1"))
+
+    ref = plan.steps[0].execution_res
+    assert command.update["observations"] == [ref]
+    message = command.update["messages"][0]
+    assert message.additional_kwargs["finding"] == ref
+    assert len(message.content) < 310
+    asyncio.run(_execute_agent_step(state, agent, "researcher", "t1"))
+
+    llm = MagicMock()
+    llm.invoke.return_value = AIMessage(content="report")
+    with patch("src.graph.nodes.get_llm_by_type", return_value=llm):
+        reporter_node(
+            {"current_plan": plan, "observations": [ref]},
+            {"configurable": {"thread_id": "t1"}},
+        )
+    invoke_messages = llm.invoke.call_args[0][0]
+    assert invoke_messages[-1].content.endswith("full text of step 0 " * 50)
+
+
+def test_replanning_sees_the_full_findings(store):
+    text = "full text of the finding " * 50
+    _, message = _record_finding("t1", "researcher", text)
+    llm = MagicMock()
+    llm.invoke.return_value = make_plan()
+    state = {
+        "messages": [HumanMessage(content="question"), message],
+        "plan_iterations": 1,
+        "locale": "en-US",
+    }
+    config = {"configurable": {"thread_id": "t1", "max_plan_iterations": 2}}
+    with patch("src.graph.nodes.get_llm_with_structured_output", return_value=llm):
+        planner_node(state, config)
+
+    planner_messages = llm.invoke.call_args[0][0]
+    assert planner_messages[-1].content == text
+    # the state keeps the summary
+    assert len(message.content) < 310
+
+
+def test_findings_are_removed_with_the_checkpoints_of_their_thread(store):
+    assert build_checkpointer("memory").on_delete_thread == store.delete_thread
+
+    ref = store.put("t1", "finding")
+    saver = SQLiteSaver(":memory:", on_delete_thread=store.delete_thread)
+    saver.delete_thread("t1")
+    with pytest.raises(KeyError):
+        store.get("t1", ref)
+
+    ref = store.put("t2", "finding")
+    saver = BoundedMemorySaver(finished_ttl=0, on_delete_thread=store.delete_thread)
+    saver.mark_finished("t2")
+    time.sleep(0.01)
+    saver.evict()
+    with pytest.raises(KeyError):
+        store.get("t2", ref)
@@ -0,0 +1,163 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from src.graph.builder import (
+    continue_to_running_research_team,
+    get_parallel_step_batch,
+)
+from src.graph.finding_store import FindingStore
+from src.graph.nodes import research_team_node, researcher_node
+from src.graph.types import State
+from src.prompts.planner_model import Plan, Step, StepType
+
+
+def make_plan(*step_types):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="thought",
+        title="title",
+        steps=[
+            Step(
+                need_search=True,
+                title=f"Step {i}",
+                description=f"Description {i}",
+                step_type=step_type,
+            )
+            for i, step_type in enumerate(step_types)
+        ],
+    )
+
+
+PARALLEL_CONFIG = {
+    "configurable": {
+        "thread_id": "parallel",
+        "enable_parallel_steps": True,
+        "max_parallel_steps": 2,
+    }
+}
+
+
+@pytest.fixture
+def finding_store(tmp_path):
+    store = FindingStore(str(tmp_path))
+    with patch("src.graph.finding_store._finding_store", store):
+        yield store
+
+
+def test_parallel_batch_stops_at_processing_step():
+    plan = make_plan(StepType.RESEARCH, StepType.RESEARCH, StepType.PROCESSING)
+    assert get_parallel_step_batch(plan, 5) == [0, 1]
+
+
+def test_parallel_batch_respects_cap_and_skips_finished_steps():
+    plan = make_plan(*[StepType.RESEARCH] * 4)
+    plan.steps[0].execution_res = "done"
+    assert get_parallel_step_batch(plan, 2) == [1, 2]
+
+
+def test_continue_to_running_research_team_fans_out():
+    plan = make_plan(StepType.RESEARCH, StepType.RESEARCH, StepType.RESEARCH)
+    result = continue_to_running_research_team(
+        {"current_plan": plan, "messages": []}, PARALLEL_CONFIG
+    )
+    assert all(isinstance(send, Send) for send in result)
+    assert [send.arg["step_index"] for send in result] == [0, 1]
+    assert {send.node for send in result} == {"researcher"}
+
+
+def test_continue_to_running_research_team_sequential_by_default():
+    plan = make_plan(StepType.RESEARCH, StepType.RESEARCH)
+    assert continue_to_running_research_team({"current_plan": plan}) == "researcher"
+
+
+def test_research_team_node_joins_results_in_plan_order():
+    plan = make_plan(StepType.RESEARCH, StepType.RESEARCH)
+    state = {
+        "current_plan": plan,
+        "observations": ["earlier"],
+        "messages": [],
+        "step_results": [
+            {"index": 1, "agent": "researcher", "finding": "ref-2", "summary": "2"},
+            {"index": 0, "agent": "researcher", "finding": "ref-1", "summary": "1"},
+        ],
+    }
+    update = research_team_node(state)
+    assert [s.execution_res for s in update["current_plan"].steps] == [
+        "ref-1",
+        "ref-2",
+    ]
+    # observations use an append-only reducer, only the new ones are returned
+    assert update["observations"] == ["ref-1", "ref-2"]
+    assert [m.content for m in update["messages"]] == ["1", "2"]
+    assert [m.additional_kwargs["finding"] for m in update["messages"]] == [
+        "ref-1",
+        "ref-2",
+    ]
+    assert update["step_results"] is None
+    # the plan in the incoming state is left untouched
+    assert plan.steps[0].execution_res is None
+
+
+def test_parallel_steps_run_concurrently_end_to_end(finding_store):
+    running = 0
+    max_running = 0
+
+    class FakeAgent:
+        async def ainvoke(self, input, config):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            title = input["messages"][0].content.split("## Title\n\n")[1].split("\n")[0]
+            return {"messages": [AIMessage(content=f"result of {title}")]}
+
+    builder = StateGraph(State)
+    builder.add_edge(START, "research_team")
+    builder.add_node("research_team", research_team_node)
+    builder.add_node("researcher", researcher_node)
+    builder.add_node("planner", lambda state: {})
+    builder.add_conditional_edges(
+        "research_team",
+        continue_to_running_research_team,
+        ["planner", "researcher"],
+    )
+    builder.add_edge("planner", END)
+    graph = builder.compile()
+
+    plan = make_plan(*[StepType.RESEARCH] * 3)
+    with (
+        patch("src.graph.nodes.create_agent", return_value=FakeAgent()),
+        patch("src.graph.nodes.get_web_search_tool", return_value=MagicMock()),
+        patch("src.graph.nodes.get_web_search_batch_tool", return_value=MagicMock()),
+    ):
+        final_state = asyncio.run(
+            graph.ainvoke(
+                {
+                    "messages": [HumanMessage(content="question")],
+                    "current_plan": plan,
+                    "observations": [],
+                },
+                PARALLEL_CONFIG,
+            )
+        )
+
+    assert max_running == 2
+    assert [finding_store.get("parallel", o) for o in final_state["observations"]] == [
+        "result of Step 0",
+        "result of Step 1",
+        "result of Step 2",
+    ]
+    assert [s.execution_res for s in final_state["current_plan"].steps] == (
+        final_state["observations"]
+    )
+    assert final_state["step_results"] == []
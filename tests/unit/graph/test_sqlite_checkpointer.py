@@ -0,0 +1,142 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import operator
+import threading
+import time
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+
+from src.graph.checkpointer import SQLiteSaver
+
+
+class CounterState(TypedDict):
+    values: Annotated[list[int], operator.add]
+
+
+def build_counter_graph(checkpointer, steps=3):
+    builder = StateGraph(CounterState)
+    previous = START
+    for i in range(steps):
+        builder.add_node(f"step_{i}", lambda state, i=i: {"values": [i]})
+        builder.add_edge(previous, f"step_{i}")
+        previous = f"step_{i}"
+    builder.add_edge(previous, END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def thread(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_sqlite_saver_round_trip(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.sqlite"))
+    graph = build_counter_graph(saver)
+    graph.invoke({"values": []}, thread("t1"))
+    assert graph.get_state(thread("t1")).values["values"] == [0, 1, 2]
+    history = list(saver.list(thread("t1")))
+    assert len(history) == 5
+    assert [h.metadata["step"] for h in history] == [3, 2, 1, 0, -1]
+    assert len(list(saver.list(thread("t1"), limit=2))) == 2
+    assert len(list(saver.list(None, filter={"step": 1}))) == 1
+    saver.close()
+
+
+def test_sqlite_saver_survives_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = SQLiteSaver(path, batch_size=1000, flush_interval=60)
+    graph = build_counter_graph(saver)
+    graph.invoke({"values": []}, thread("t1"))
+    assert saver.pending_count > 0
+    saver.close()
+
+    reopened = SQLiteSaver(path)
+    graph = build_counter_graph(reopened)
+    assert graph.get_state(thread("t1")).values["values"] == [0, 1, 2]
+    reopened.close()
+
+
+class RecordingConnection:
+    """A database connection recording the threads it is used from."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.threads = set()
+
+    def execute(self, *args):
+        self.threads.add(threading.get_ident())
+        return self.conn.execute(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def test_sqlite_saver_async_io_runs_off_the_event_loop(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.sqlite"))
+    saver.conn = conn = RecordingConnection(saver.conn)
+
+    async def main():
+        graph = build_counter_graph(saver)
+        await graph.ainvoke({"values": []}, thread("t1"))
+        state = await graph.aget_state(thread("t1"))
+        history = [item async for item in saver.alist(thread("t1"), limit=2)]
+        return state, history, threading.get_ident()
+
+    state, history, loop_thread = asyncio.run(main())
+    assert state.values["values"] == [0, 1, 2]
+    assert len(history) == 2
+    assert conn.threads and loop_thread not in conn.threads
+    saver.close()
+
+
+def test_sqlite_saver_resumes_interrupt(tmp_path):
+    def review(state):
+        feedback = interrupt("review")
+        return {"values": [len(feedback)]}
+
+    builder = StateGraph(CounterState)
+    builder.add_node("review", review)
+    builder.add_edge(START, "review")
+    builder.add_edge("review", END)
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.sqlite"))
+    graph = builder.compile(checkpointer=saver)
+
+    graph.invoke({"values": []}, thread("t1"))
+    assert graph.get_state(thread("t1")).next == ("review",)
+    result = graph.invoke(Command(resume="accepted"), thread("t1"))
+    assert result["values"] == [8]
+    saver.close()
+
+
+def test_sqlite_saver_keeps_latest_checkpoints(tmp_path):
+    saver = SQLiteSaver(
+        str(tmp_path / "checkpoints.sqlite"),
+        max_checkpoints_per_thread=2,
+        prune_interval=0,
+    )
+    graph = build_counter_graph(saver, steps=6)
+    graph.invoke({"values": []}, thread("t1"))
+    saver.flush()
+    assert len(list(saver.list(thread("t1")))) == 2
+    assert graph.get_state(thread("t1")).values["values"] == list(range(6))
+    blob_count = saver.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    assert blob_count <= 2 * 8
+    saver.close()
+
+
+def test_sqlite_saver_drops_idle_threads(tmp_path):
+    saver = SQLiteSaver(
+        str(tmp_path / "checkpoints.sqlite"), thread_ttl_seconds=0.5, prune_interval=0
+    )
+    graph = build_counter_graph(saver)
+    graph.invoke({"values": []}, thread("old"))
+    saver.flush()
+    time.sleep(0.6)
+    graph.invoke({"values": []}, thread("new"))
+    saver.flush()
+    assert saver.get_tuple(thread("old")) is None
+    assert saver.get_tuple(thread("new")) is not None
+    saver.close()
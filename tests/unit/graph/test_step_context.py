@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.graph.step_context import StepContextBuilder
+from src.prompts.planner_model import Step, StepType
+from src.utils.text_utils import estimate_tokens
+
+
+def make_step(title, description, result=None):
+    return Step(
+        need_search=True,
+        title=title,
+        description=description,
+        step_type=StepType.RESEARCH,
+        execution_res=result,
+    )
+
+
+TOPICS = ["battery chemistry", "solar panel costs", "wind turbine output"]
+
+
+def make_steps():
+    return [
+        make_step(
+            f"Research {topic}",
+            f"Collect data about {topic}",
+            f"# {topic}\n\n"
+            + f"The {topic} findings are summarized here. " * 3
+            + f"More details about {topic} follow. " * 60,
+        )
+        for topic in TOPICS
+    ]
+
+
+def test_small_context_is_kept_in_full():
+    builder = StepContextBuilder()
+    steps = [make_step("Research A", "about A", "short finding")]
+    context = builder.build(make_step("B", "about B"), steps, token_budget=1000)
+    assert context == (
+        "# Existing Research Findings\n\n"
+        "## Existing Finding 1: Research A\n\n"
+        "<finding>\nshort finding\n</finding>\n\n"
+    )
+
+
+def test_budget_keeps_most_relevant_step_in_full():
+    builder = StepContextBuilder(max_full_steps=1)
+    current = make_step("Compare solar panel costs", "Use the solar panel costs")
+    context = builder.build(current, make_steps(), token_budget=1200)
+
+    assert estimate_tokens(context) <= 1200
+    assert "## Existing Finding 2: Research solar panel costs" in context
+    assert "## Summary of Earlier Findings" in context
+    assert "- **Research battery chemistry**: battery chemistry" in context
+    assert "Existing Finding 1" not in context
+
+
+def test_summaries_shrink_to_titles_under_a_tight_budget():
+    builder = StepContextBuilder()
+    current = make_step("Final step", "Wrap up")
+    context = builder.build(current, make_steps(), token_budget=60)
+    assert estimate_tokens(context) <= 60
+    assert all(f"Research {topic}" in context for topic in TOPICS)
+    assert "<finding>" not in context
+
+
+def test_summaries_are_cached_by_finding_key():
+    builder = StepContextBuilder()
+    resolved = []
+
+    def resolve(ref):
+        resolved.append(ref)
+        return f"Finding for {ref}. " * 200
+
+    steps = [make_step(f"Step {i}", "d", f"ref-{i}") for i in range(2)]
+    builder.build(make_step("Next", "d"), steps, token_budget=200, resolve=resolve)
+    summary = builder._summaries["ref-0"]
+    assert summary.startswith("Finding for ref-0.")
+    assert estimate_tokens(summary) <= builder.summary_tokens
+
+    builder._summaries["ref-0"] = "cached summary"
+    context = builder.build(
+        make_step("Next", "d"), steps, token_budget=200, resolve=resolve
+    )
+    assert "cached summary" in context
+    assert resolved == ["ref-0", "ref-1", "ref-0", "ref-1"]
@@ -0,0 +1,129 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from mcp.types import Tool
+
+from src.server.mcp_utils import MCPToolCache
+
+CONFIG = {"transport": "stdio", "command": "uvx", "args": ["mcp-github-trending"]}
+
+
+class FakeServer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    async def list_tools(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("server is down")
+        return [
+            Tool(
+                name=f"tool_{self.calls}",
+                description="A tool",
+                inputSchema={"type": "object", "properties": {}},
+            )
+        ]
+
+
+def test_fresh_entries_are_served_from_the_cache():
+    async def main():
+        cache = MCPToolCache(ttl=60, max_stale=60)
+        server = FakeServer()
+        first = await cache.get_tools(CONFIG, server.list_tools)
+        second = await cache.get_tools(dict(CONFIG), server.list_tools)
+        other = await cache.get_tools({**CONFIG, "env": {"A": "1"}}, server.list_tools)
+        return first, second, other, server.calls
+
+    first, second, other, calls = asyncio.run(main())
+    assert first == second
+    assert first[0]["name"] == "tool_1"
+    assert first[0]["inputSchema"] == {"type": "object", "properties": {}}
+    assert other[0]["name"] == "tool_2"
+    assert calls == 2
+
+
+def test_concurrent_lookups_are_coalesced():
+    async def main():
+        cache = MCPToolCache(ttl=60, max_stale=60)
+        server = FakeServer(delay=0.05)
+        results = await asyncio.gather(
+            *(cache.get_tools(CONFIG, server.list_tools) for _ in range(5))
+        )
+        return results, server.calls
+
+    results, calls = asyncio.run(main())
+    assert calls == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_stale_entries_are_served_while_revalidating():
+    async def main():
+        cache = MCPToolCache(ttl=60, max_stale=600)
+        server = FakeServer()
+        await cache.get_tools(CONFIG, server.list_tools)
+        key, (fetched_at, tools) = next(iter(cache._entries.items()))
+        cache._entries[key] = (fetched_at - 120, tools)
+
+        stale = await cache.get_tools(CONFIG, server.list_tools)
+        await asyncio.sleep(0.01)
+        fresh = await cache.get_tools(CONFIG, server.list_tools)
+        return stale, fresh, cache.stats
+
+    stale, fresh, stats = asyncio.run(main())
+    assert stale[0]["name"] == "tool_1"
+    assert fresh[0]["name"] == "tool_2"
+    assert stats == {"fresh": 1, "stale": 1, "miss": 1}
+
+
+def test_failed_revalidation_keeps_the_stale_entry():
+    async def main():
+        cache = MCPToolCache(ttl=0, max_stale=600)
+        server = FakeServer()
+        await cache.get_tools(CONFIG, server.list_tools)
+        server.fail = True
+        stale = await cache.get_tools(CONFIG, server.list_tools)
+        await asyncio.sleep(0.01)
+        return stale, await cache.get_tools(CONFIG, server.list_tools)
+
+    stale, again = asyncio.run(main())
+    assert stale == again
+    assert stale[0]["name"] == "tool_1"
+
+
+def test_expired_entries_are_reloaded_and_errors_raised():
+    async def main():
+        cache = MCPToolCache(ttl=0, max_stale=0)
+        server = FakeServer()
+        await cache.get_tools(CONFIG, server.list_tools)
+        server.fail = True
+        await cache.get_tools(CONFIG, server.list_tools)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+
+
+def test_cache_is_persisted_to_disk(tmp_path):
+    path = str(tmp_path / "cache" / "mcp_tools.json")
+
+    async def main():
+        server = FakeServer()
+        await MCPToolCache(ttl=60, path=path).get_tools(CONFIG, server.list_tools)
+        restarted = MCPToolCache(ttl=60, path=path)
+        return await restarted.get_tools(CONFIG, server.list_tools), server.calls
+
+    tools, calls = asyncio.run(main())
+    assert tools[0]["name"] == "tool_1"
+    assert calls == 1
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "mcp_tools.json"
+    path.write_text("not json")
+    cache = MCPToolCache(path=str(path))
+    assert not cache._entries
@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from unittest.mock import patch
+
+from src.crawler import Article
+from src.tools import crawl_batch_tool, crawl_tool
+from src.tools.crawl import CrawlBatchTool, _allocate_budget
+from src.utils.text_utils import estimate_tokens
+
+
+def make_article(url):
+    article = Article("Title", "<p>Hello world</p>")
+    article.url = url
+    return article
+
+
+def test_ainvoke_crawls_without_blocking():
+    async def acrawl(self, url):
+        return make_article(url)
+
+    with (
+        patch("src.crawler.Crawler.acrawl", acrawl),
+        patch(
+            "src.crawler.Crawler.crawl", side_effect=AssertionError("blocking crawl")
+        ),
+    ):
+        result = asyncio.run(crawl_tool.ainvoke({"url": "https://example.com"}))
+    assert "Hello world" in result["crawled_content"]
+
+
+def test_invoke_reports_errors():
+    with patch("src.crawler.Crawler.crawl", side_effect=ValueError("boom")):
+        result = crawl_tool.invoke({"url": "https://example.com"})
+    assert result.startswith("Failed to crawl")
+
+
+def test_batch_crawl_is_concurrent_and_keeps_failures_per_url():
+    running = 0
+    peak = 0
+
+    async def acrawl(self, url):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if "broken" in url:
+            raise ValueError("boom")
+        article = Article(url, "<p>" + "word " * 2000 + "</p>")
+        article.url = url
+        return article
+
+    tool = CrawlBatchTool(concurrency=2, token_budget=900)
+    urls = ["https://a.com", "https://broken.com", "https://b.com", "https://a.com"]
+    with patch("src.crawler.Crawler.acrawl", acrawl):
+        results = asyncio.run(tool.ainvoke({"urls": urls}))
+
+    assert [result["url"] for result in results] == urls[:3]
+    assert results[1]["error"].startswith("Failed to crawl")
+    assert peak == 2
+    digests = [results[0]["crawled_content"], results[2]["crawled_content"]]
+    assert all(digest.startswith("# https://") for digest in digests)
+    assert sum(estimate_tokens(digest) for digest in digests) <= 900 + 2
+
+
+def test_batch_crawl_sync_path():
+    with patch("src.crawler.Crawler.crawl", side_effect=make_article):
+        results = crawl_batch_tool.invoke({"urls": ["https://a.com", "https://b.com"]})
+    assert [result["url"] for result in results] == ["https://a.com", "https://b.com"]
+    assert all("Hello world" in result["crawled_content"] for result in results)
+
+
+def test_short_pages_leave_their_budget_to_long_ones():
+    assert _allocate_budget([10, 1000, 1000], 610) == [10, 300, 300]
+    assert _allocate_budget([], 100) == []
+
+
+def test_passages_relevant_to_the_step_are_returned():
+    paragraphs = "".join(
+        f"<h2>Part {i}</h2>" + "<p>Unrelated filler sentence about nothing.</p>" * 20
+        for i in range(10)
+    )
+    html = f"<div>{paragraphs}<h2>Results</h2><p>The quantum error rate fell.</p></div>"
+
+    async def acrawl(self, url):
+        article = Article("Title", html)
+        article.url = url
+        return article
+
+    config = {"configurable": {"step_query": "quantum error rate"}}
+    with patch("src.crawler.Crawler.acrawl", acrawl):
+        result = asyncio.run(
+            crawl_tool.ainvoke({"url": "https://example.com"}, config=config)
+        )
+    assert result["crawled_content"].startswith("# Title")
+    assert "The quantum error rate fell." in result["crawled_content"]
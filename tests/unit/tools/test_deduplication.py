@@ -0,0 +1,99 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.crawler import Article
+from src.tools.crawl import CrawlBatchTool
+from src.tools.deduplication import (
+    collapse_duplicate_results,
+    create_deduplicated_tool,
+)
+from src.utils.near_duplicates import NearDuplicateFilter
+
+EXAMPLES = sorted(Path(__file__).parents[3].joinpath("examples").glob("*.md"))
+STORY = EXAMPLES[0].read_text(encoding="utf-8")
+OTHER_STORY = EXAMPLES[1].read_text(encoding="utf-8")
+CONFIG = {"configurable": {"thread_id": "thread-1"}}
+
+
+@pytest.fixture(autouse=True)
+def duplicate_filter(monkeypatch):
+    duplicate_filter = NearDuplicateFilter(max_distance=8)
+    for module in ("src.tools.deduplication", "src.tools.crawl"):
+        monkeypatch.setattr(
+            f"{module}.get_near_duplicate_filter", lambda: duplicate_filter
+        )
+    return duplicate_filter
+
+
+def page(url: str, text: str) -> dict:
+    return {"type": "page", "title": url, "url": url, "content": text, "score": 0.9}
+
+
+def test_tavily_results_repeating_a_seen_page_are_collapsed(duplicate_filter):
+    image = {"type": "image", "image_url": "https://a.com/a.png"}
+    results = [page("https://a.com/", STORY), page("https://b.com/", OTHER_STORY)]
+    assert collapse_duplicate_results((results, {}), "thread-1") == (results, {})
+
+    results = [page("https://mirror.com/", f"Syndicated: {STORY}"), image]
+    collapsed = collapse_duplicate_results(json.dumps(results), "thread-1")
+    assert json.loads(collapsed) == [
+        {
+            "type": "page",
+            "title": "https://mirror.com/",
+            "url": "https://mirror.com/",
+            "score": 0.9,
+            "duplicate_of": "https://a.com/",
+        },
+        image,
+    ]
+    # outside of a research thread nothing is filtered
+    assert collapse_duplicate_results(results, None) == results
+    assert duplicate_filter.stats("thread-1")["duplicate_ratio"] == 0.3333
+
+
+class FakeSearch(BaseTool):
+    name: str = "web_search"
+    description: str = "A fake search engine."
+
+    def _run(self, query: str, run_manager=None) -> list[dict]:
+        return [page(f"https://{query}.com/", STORY)]
+
+    async def _arun(self, query: str, run_manager=None) -> list[dict]:
+        return self._run(query)
+
+
+def test_deduplicated_tool_filters_per_thread():
+    tool = create_deduplicated_tool(FakeSearch)()
+    assert "content" in tool.invoke("a", config=CONFIG)[0]
+    assert asyncio.run(tool.ainvoke("b", config=CONFIG))[0]["duplicate_of"] == (
+        "https://a.com/"
+    )
+    other_thread = {"configurable": {"thread_id": "thread-2"}}
+    assert "content" in tool.invoke("b", config=other_thread)[0]
+
+
+def test_batch_crawl_collapses_mirrors_of_searched_pages():
+    collapse_duplicate_results([page("https://a.com/", STORY)], "thread-1")
+
+    async def acrawl(self, url):
+        text = OTHER_STORY if "b.com" in url else STORY
+        article = Article(url, f"<p>{text}</p>")
+        article.url = url
+        return article
+
+    urls = ["https://mirror.com/", "https://b.com/"]
+    with patch("src.crawler.Crawler.acrawl", acrawl):
+        results = asyncio.run(CrawlBatchTool().ainvoke({"urls": urls}, config=CONFIG))
+    assert results[0] == {
+        "url": "https://mirror.com/",
+        "duplicate_of": "https://a.com/",
+    }
+    assert results[1]["crawled_content"].startswith("# https://b.com/")
@@ -0,0 +1,147 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.tools.mcp_pool import MCPSessionPool, get_server_config_key
+
+SERVER = '''
+import asyncio
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("test")
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    """Echo the text with the process id of the server."""
+    return f"{os.getpid()}:{text}"
+
+
+@mcp.tool()
+async def slow() -> str:
+    """Wait a bit."""
+    await asyncio.sleep(0.3)
+    return "done"
+
+
+@mcp.tool()
+def crash() -> str:
+    """Exit the server."""
+    os._exit(1)
+
+
+mcp.run()
+'''
+
+
+@pytest.fixture
+def server_config(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(SERVER)
+    return {
+        "transport": "stdio",
+        "command": sys.executable,
+        "args": [str(script)],
+        "enabled_tools": ["echo"],
+    }
+
+
+def run_with_pool(test, **kwargs):
+    async def main():
+        pool = MCPSessionPool(**kwargs)
+        try:
+            return await test(pool)
+        finally:
+            await pool.close()
+
+    return asyncio.run(main())
+
+
+def test_config_key_only_depends_on_connection_settings(server_config):
+    key = get_server_config_key(server_config)
+    assert key == get_server_config_key({**server_config, "add_to_agents": ["coder"]})
+    assert key != get_server_config_key({**server_config, "args": []})
+
+
+def test_sessions_and_tools_are_reused(server_config):
+    async def test(pool):
+        tools = await pool.get_tools(server_config, "test")
+        echo = next(tool for tool in tools if tool.name == "echo")
+        assert echo.description.startswith("Powered by 'test'.")
+        first = await echo.ainvoke({"text": "a"})
+        second = await echo.ainvoke({"text": "b"})
+        assert first.split(":")[0] == second.split(":")[0]
+        assert await pool.get_tools(server_config, "test") is tools
+        return pool.stats()
+
+    stats = run_with_pool(test)
+    assert [server["starts"] for server in stats.values()] == [1]
+
+
+def test_crashed_server_is_restarted(server_config):
+    async def test(pool):
+        tools = {tool.name: tool for tool in await pool.get_tools(server_config)}
+        pid = (await tools["echo"].ainvoke({"text": "a"})).split(":")[0]
+        with pytest.raises(Exception):
+            await tools["crash"].ainvoke({})
+        # the same tool object keeps working on a new server process
+        new_pid = (await tools["echo"].ainvoke({"text": "b"})).split(":")[0]
+        assert new_pid != pid
+        return pool.stats()
+
+    stats = run_with_pool(test)
+    # the crashing call is retried once on a restarted server
+    assert [server["starts"] for server in stats.values()] == [3]
+
+
+def test_idle_servers_are_stopped_and_started_on_demand(server_config):
+    async def test(pool):
+        tools = {tool.name: tool for tool in await pool.get_tools(server_config)}
+        await tools["echo"].ainvoke({"text": "a"})
+        await asyncio.sleep(0.05)
+        await pool.check_servers()
+        assert [s["running"] for s in pool.stats().values()] == [False]
+        assert (await tools["echo"].ainvoke({"text": "b"})).endswith(":b")
+        return pool.stats()
+
+    stats = run_with_pool(test, idle_timeout=0.01)
+    assert [server["starts"] for server in stats.values()] == [2]
+
+
+def test_concurrency_is_capped_per_server(server_config):
+    async def test(pool):
+        tools = {tool.name: tool for tool in await pool.get_tools(server_config)}
+        start = time.monotonic()
+        await asyncio.gather(*(tools["slow"].ainvoke({}) for _ in range(3)))
+        return time.monotonic() - start
+
+    assert run_with_pool(test, max_concurrency=1) >= 0.9
+
+
+def test_agents_of_replaced_tools_are_released(server_config, tmp_path):
+    script = tmp_path / "server.py"
+    released = []
+
+    async def test(pool):
+        tools = await pool.get_tools(server_config, "test")
+        await asyncio.sleep(0.05)
+        await pool.check_servers()
+        # the server comes back with another tool list
+        script.write_text(SERVER.replace("Wait a bit.", "Wait a little."))
+        new_tools = await pool.get_tools(server_config, "test")
+        assert new_tools is not tools
+        assert released == [tools]
+        return new_tools
+
+    with patch("src.tools.mcp_pool.release_agents", released.append):
+        new_tools = run_with_pool(test, idle_timeout=0.01)
+    # the tools of a closed pool stop working
+    assert released[-1] == new_tools
@@ -0,0 +1,149 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import time
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.meta_search import (
+    MetaSearch,
+    SearchError,
+    fuse_results,
+    parse_results,
+)
+
+
+def page(url: str, title: str = "") -> dict:
+    return {"title": title or url, "url": url, "content": f"about {url}"}
+
+
+def test_parse_results_of_every_engine():
+    tavily = [
+        {"type": "page", "title": "A", "url": "https://a.com", "content": "a"},
+        {"type": "image", "image_url": "https://a.com/a.png"},
+    ]
+    pages, images = parse_results("tavily", (tavily, {"results": []}))
+    assert pages == [{"title": "A", "url": "https://a.com", "content": "a"}]
+    assert images == [{"type": "image", "image_url": "https://a.com/a.png"}]
+
+    brave = json.dumps([{"title": "B", "link": "https://b.com", "snippet": "b"}])
+    assert parse_results("brave_search", brave)[0] == [
+        {"title": "B", "url": "https://b.com", "content": "b"}
+    ]
+
+    arxiv = (
+        "Published: 2024-01-01\nTitle: Deer Flow\nAuthors: A, B\nSummary: Agents.\n\n"
+        "Published: 2024-02-01\nTitle: Other\nAuthors: C\nSummary: More\nlines."
+    )
+    assert parse_results("arxiv", arxiv)[0] == [
+        {"title": "Deer Flow", "url": "", "content": "Agents."},
+        {"title": "Other", "url": "", "content": "More\nlines."},
+    ]
+    assert parse_results("arxiv", "No good Arxiv Result was found") == ([], [])
+
+    for engine, output in [
+        ("tavily", ("HTTPError('401 Unauthorized')", {})),
+        ("arxiv", "Arxiv exception: timeout"),
+    ]:
+        with pytest.raises(SearchError):
+            parse_results(engine, output)
+
+
+def test_fusion_ranks_agreed_pages_first_and_dedupes_urls():
+    fused = fuse_results(
+        {
+            "tavily": [page("https://a.com/x"), page("https://b.com/"), page("https://c.com/")],
+            "duckduckgo": [page("https://C.com/?utm_source=ddg"), page("https://b.com")],
+        },
+        max_results=3,
+    )  # fmt: skip
+    # rank 1 and 3 outweigh rank 2 twice
+    assert [result["url"] for result in fused] == [
+        "https://C.com/?utm_source=ddg",
+        "https://b.com/",
+        "https://a.com/x",
+    ]
+    assert fused[0]["engines"] == ["tavily", "duckduckgo"]
+    assert fused[0]["score"] == pytest.approx(1 / 63 + 1 / 61, abs=1e-6)
+    assert fused[1]["score"] == pytest.approx(1 / 62 + 1 / 62, abs=1e-6)
+
+
+class FakeEngine(BaseTool):
+    description: str = "A fake search engine."
+    delay: float = 0
+    output: object = None
+
+    def _run(self, query: str, run_manager=None):
+        time.sleep(self.delay)
+        return self._answer()
+
+    async def _arun(self, query: str, run_manager=None):
+        await asyncio.sleep(self.delay)
+        return self._answer()
+
+    def _answer(self):
+        if isinstance(self.output, Exception):
+            raise self.output
+        return self.output
+
+
+def engine(name: str, urls: list[str], delay: float = 0) -> FakeEngine:
+    output = json.dumps([{"title": u, "link": u, "snippet": u} for u in urls])
+    return FakeEngine(name=name, delay=delay, output=output)
+
+
+def search(tool: MetaSearch, mode: str):
+    if mode == "sync":
+        return tool.invoke("deer flow")
+    return asyncio.run(tool.ainvoke("deer flow"))
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+def test_meta_search_returns_once_a_quorum_answered(mode):
+    tool = MetaSearch(
+        engines={
+            "brave_search": engine("brave", ["https://a.com", "https://b.com"]),
+            "duckduckgo": engine("ddg", ["https://b.com"], delay=0.05),
+            "slow": engine("slow", ["https://slow.com"], delay=3),
+        },
+        quorum=2,
+        deadline=5,
+    )
+    start = time.perf_counter()
+    results = search(tool, mode)
+    assert time.perf_counter() - start < 1
+    assert [result["url"] for result in results] == ["https://b.com", "https://a.com"]
+
+
+def test_meta_search_returns_what_it_has_at_the_deadline(mode):
+    tool = MetaSearch(
+        engines={
+            "brave_search": engine("brave", ["https://a.com"]),
+            "slow": engine("slow", ["https://slow.com"], delay=3),
+        },
+        quorum=2,
+        deadline=0.2,
+    )
+    start = time.perf_counter()
+    results = search(tool, mode)
+    assert 0.15 < time.perf_counter() - start < 1
+    assert [result["engines"] for result in results] == [["brave_search"]]
+
+
+def test_meta_search_reports_when_all_engines_failed():
+    tool = MetaSearch(
+        engines={
+            "brave_search": FakeEngine(name="brave", output=RuntimeError("down")),
+            "arxiv": FakeEngine(name="arxiv", output="Arxiv exception: timeout"),
+        }
+    )
+    result = tool.invoke("deer flow")
+    assert result.startswith("Failed to search.")
+    assert "RuntimeError('down')" in result and "Arxiv exception" in result
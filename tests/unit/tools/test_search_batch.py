@@ -0,0 +1,101 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import time
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.search_batch import SearchBatchTool
+
+RESULTS = {
+    "deer flow": ["https://a.com/", "https://b.com/"],
+    "deer flow agents": ["https://b.com/?utm_source=x", "https://c.com/"],
+    "deer flow langgraph": ["https://d.com/"],
+}
+
+# queries which reached the search engine
+calls: list[str] = []
+
+
+class FakeSearch(BaseTool):
+    name: str = "brave_search"
+    description: str = "A fake search engine."
+    delay: float = 0.2
+
+    def _run(self, query: str, run_manager=None) -> str:
+        calls.append(query)
+        time.sleep(self.delay)
+        return self._answer(query)
+
+    async def _arun(self, query: str, run_manager=None) -> str:
+        calls.append(query)
+        await asyncio.sleep(self.delay)
+        return self._answer(query)
+
+    @staticmethod
+    def _answer(query: str) -> str:
+        if query not in RESULTS:
+            raise RuntimeError("rate limited")
+        return json.dumps(
+            [
+                {"title": url, "link": url, "snippet": f"{query} at {url}"}
+                for url in RESULTS[query]
+            ]
+        )
+
+
+@pytest.fixture(params=["sync", "async"])
+def search(request):
+    calls.clear()
+    tool = SearchBatchTool(search_tool=FakeSearch(), engine="brave_search")
+
+    def search(queries: list[str]):
+        if request.param == "sync":
+            return tool.invoke({"queries": queries})
+        return asyncio.run(tool.ainvoke({"queries": queries}))
+
+    return search
+
+
+def test_queries_are_searched_concurrently_and_merged(search):
+    start = time.perf_counter()
+    results = search(list(RESULTS) + ["Deer flow?"])
+    assert time.perf_counter() - start < 0.5
+    # the same query spelled differently is searched once
+    assert sorted(calls) == sorted(RESULTS)
+    # pages are deduplicated by url, those found by several queries first
+    assert [result["url"] for result in results] == [
+        "https://b.com/?utm_source=x",
+        "https://a.com/",
+        "https://d.com/",
+        "https://c.com/",
+    ]
+    assert results[0]["queries"] == ["deer flow", "deer flow agents"]
+    # with the fields of its best rank
+    assert results[0]["content"] == "deer flow agents at https://b.com/?utm_source=x"
+
+
+def test_failed_queries_are_reported_beside_the_results(search):
+    results = search(["deer flow", "unknown"])
+    assert [result.get("url") for result in results] == [
+        "https://a.com/",
+        "https://b.com/",
+        None,
+    ]
+    assert results[-1] == {
+        "type": "error",
+        "query": "unknown",
+        "error": "RuntimeError('rate limited')",
+    }
+
+
+def test_queries_are_capped():
+    calls.clear()
+    tool = SearchBatchTool(
+        search_tool=FakeSearch(delay=0), engine="brave_search", max_queries=2
+    )
+    tool.invoke({"queries": list(RESULTS)})
+    assert sorted(calls) == ["deer flow", "deer flow agents"]
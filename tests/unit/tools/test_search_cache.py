@@ -0,0 +1,165 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.search_cache import (
+    MemorySearchCacheStore,
+    SearchCache,
+    SQLiteSearchCacheStore,
+    close_search_cache,
+    create_cached_tool,
+    get_search_cache,
+    normalize_query,
+    search_cache_key,
+)
+
+
+def test_trivially_different_queries_share_a_key():
+    assert normalize_query('  "What is  DeerFlow?" ') == "what is deerflow"
+    assert normalize_query("ＤｅｅｒＦｌｏｗ！") == "deerflow"
+    key = search_cache_key("tavily", "What is DeerFlow?", {"max_results": 3})
+    assert key == search_cache_key("tavily", "what is deerflow", {"max_results": 3})
+    assert key != search_cache_key("tavily", "what is deerflow", {"max_results": 5})
+    assert key != search_cache_key(
+        "brave_search", "what is deerflow", {"max_results": 3}
+    )
+
+
+def test_memory_store_expires_and_evicts():
+    store = MemorySearchCacheStore(max_entries=2)
+    store.put("a", "result a", ttl=60)
+    store.put("b", "result b", ttl=60)
+    assert store.get("a") == "result a"
+    store.put("c", "result c", ttl=60)
+    # b was the least recently used
+    assert store.get("b") is None
+    assert len(store) == 2
+    store.put("d", "result d", ttl=0)
+    assert store.get("d") is None
+
+
+def test_sqlite_store_keeps_results_across_instances(tmp_path):
+    path = str(tmp_path / "search_cache.sqlite")
+    store = SQLiteSearchCacheStore(path, max_entries=2)
+    store.put("a", ("content", {"results": [1, 2]}), ttl=60)
+    store.put("b", "result b", ttl=0)
+    store.close()
+
+    store = SQLiteSearchCacheStore(path, max_entries=2)
+    assert store.get("a") == ("content", {"results": [1, 2]})
+    assert store.get("b") is None
+    store.put("c", "result c", ttl=60)
+    store.put("d", "result d", ttl=60)
+    assert len(store) == 2
+    assert store.get("a") is None
+
+
+def test_concurrent_identical_searches_are_coalesced():
+    cache = SearchCache(MemorySearchCacheStore(), ttl=60)
+    calls = []
+
+    def search():
+        calls.append(1)
+        time.sleep(0.1)
+        return "results"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.fetch("k", search)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["results"] * 5
+    assert len(calls) == 1
+    assert cache.fetch("k", search) == "results"
+    assert cache.stats() == {"hit": 1, "miss": 1, "coalesced": 4, "entries": 1}
+
+
+def test_failed_searches_are_not_cached():
+    cache = SearchCache(MemorySearchCacheStore(), ttl=60)
+
+    async def main():
+        async def search():
+            await asyncio.sleep(0.05)
+            return "HTTPError('429')", {}
+
+        results = await asyncio.gather(*(cache.afetch("k", search) for _ in range(3)))
+        assert results == [("HTTPError('429')", {})] * 3
+
+    asyncio.run(main())
+    assert cache.stats() == {"hit": 0, "miss": 1, "coalesced": 2, "entries": 0}
+
+
+# queries which reached the search API
+calls: list[str] = []
+
+
+class CountingSearch(BaseTool):
+    name: str = "web_search"
+    description: str = "Search the web."
+    max_results: int = 5
+    api_key: str = "secret"
+
+    def _run(self, query: str, run_manager=None) -> str:
+        calls.append(query)
+        return f"results of {query}"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SearchCache(MemorySearchCacheStore(), ttl=60)
+    monkeypatch.setattr("src.tools.search_cache.get_search_cache", lambda: cache)
+    calls.clear()
+    return cache
+
+
+def test_cached_tool_serves_repeated_searches(cache):
+    CachedSearch = create_cached_tool(CountingSearch, "counting")
+    assert CachedSearch.__name__ == "CachedCountingSearch"
+    assert create_cached_tool.__doc__
+    tool = CachedSearch()
+    assert tool.invoke({"query": "Deer flow"}) == "results of Deer flow"
+    assert tool.invoke({"query": "deer  flow?"}) == "results of Deer flow"
+    # the credentials are not part of the key, the other settings are
+    assert CachedSearch(api_key="other").invoke({"query": "deer flow"})
+    CachedSearch(max_results=3).invoke({"query": "deer flow"})
+    assert calls == ["Deer flow", "deer flow"]
+
+
+def test_cached_tool_without_async_search_is_looked_up_once(cache):
+    tool = create_cached_tool(CountingSearch, "counting")()
+
+    async def main():
+        return await asyncio.gather(
+            tool.ainvoke({"query": "deer"}), tool.ainvoke({"query": "Deer"})
+        )
+
+    assert asyncio.run(main()) == ["results of deer"] * 2
+    assert calls == ["deer"]
+    assert cache.stats() == {"hit": 0, "miss": 1, "coalesced": 1, "entries": 1}
+
+
+def test_closed_search_cache_is_built_again(tmp_path, monkeypatch):
+    path = str(tmp_path / "search_cache.sqlite")
+    monkeypatch.setattr(
+        "src.tools.search_cache.build_search_cache",
+        lambda: SearchCache(SQLiteSearchCacheStore(path), ttl=60),
+    )
+    close_search_cache()
+    cache = get_search_cache()
+    cache.store.put("k", "results", ttl=60)
+    close_search_cache()
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(cache.store)
+    assert get_search_cache().store.get("k") == "results"
+    close_search_cache()
@@ -0,0 +1,82 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.tools.tavily_search import http_session
+from src.tools.tavily_search.tavily_search_api_wrapper import (
+    EnhancedTavilySearchAPIWrapper,
+)
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    # keep-alive, so that reused connections show up as one client port
+    protocol_version = "HTTP/1.1"
+    ports: list[int] = []
+
+    def do_POST(self):
+        self.ports.append(self.client_address[1])
+        params = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps(
+            {"query": params["query"], "results": [], "images": []}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    SearchHandler.ports = []
+    monkeypatch.setattr(
+        "src.tools.tavily_search.tavily_search_api_wrapper.TAVILY_API_URL",
+        f"http://127.0.0.1:{server.server_port}",
+    )
+    yield SearchHandler.ports
+    asyncio.run(http_session.close_sessions())
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def wrapper(monkeypatch):
+    monkeypatch.setenv("TAVILY_API_KEY", "tvly-test")
+    return EnhancedTavilySearchAPIWrapper()
+
+
+def test_sync_searches_reuse_the_pooled_connection(api, wrapper):
+    for query in ("deer", "flow", "deer"):
+        assert wrapper.raw_results(query)["query"] == query
+    assert len(api) == 3
+    assert len(set(api)) == 1
+    assert http_session.get_session() is http_session.get_session()
+
+
+def test_async_searches_reuse_the_session_of_the_loop(api, wrapper):
+    async def main():
+        for query in ("deer", "flow", "deer"):
+            assert (await wrapper.raw_results_async(query))["query"] == query
+        session = http_session.get_async_session()
+        await http_session.close_sessions()
+        assert session.closed
+        # a new session is opened after a shutdown
+        assert not http_session.get_async_session().closed
+        await http_session.close_sessions()
+
+    asyncio.run(main())
+    assert len(api) == 3
+    assert len(set(api)) == 1
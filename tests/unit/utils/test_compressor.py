@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from pathlib import Path
+from unittest.mock import patch
+
+from src.utils.compressor import ExtractiveCompressor, compress_texts
+from src.utils.text_utils import estimate_tokens
+
+EXAMPLES = sorted(Path(__file__).parents[3].joinpath("examples").glob("*.md"))
+
+
+def test_documents_within_budget_are_unchanged():
+    documents = ["# Title\n\nShort finding.", "Another one."]
+    assert compress_texts(documents, 1000) == documents
+
+
+def test_compression_fits_budget_and_is_deterministic():
+    documents = [path.read_text(encoding="utf-8") for path in EXAMPLES]
+    compressed = compress_texts(documents, 3000, query="model context protocol")
+    assert len(compressed) == len(documents)
+    assert sum(estimate_tokens(document) for document in compressed) <= 3000
+    assert compressed == compress_texts(documents, 3000, query="model context protocol")
+
+
+def test_redundant_sentences_are_dropped_across_documents():
+    repeated = "Solar panel prices fell by half between 2015 and 2020."
+    documents = [
+        f"{repeated} Installations doubled in Europe.",
+        f"{repeated} Wind power grew steadily in Asia.",
+        "Unrelated filler text about weather. " * 40,
+    ]
+    compressed = ExtractiveCompressor(query_weight=0).compress(documents, 60)
+    assert " ".join(compressed).count(repeated) == 1
+
+
+def test_headings_and_references_are_kept():
+    documents = [
+        "## Battery Research\n\n"
+        + "Lithium batteries store energy efficiently. " * 3
+        + "Filler sentence number one is here. " * 30
+        + "\n\n- [Battery Source](https://example.com/battery)",
+        "- [Battery Source](https://example.com/battery)\n\n"
+        + "Sodium batteries are cheaper. " * 30,
+    ]
+    compressed = compress_texts(documents, 80, query="lithium batteries")
+    assert compressed[0].startswith("## Battery Research\n\n")
+    assert "Lithium batteries store energy efficiently." in compressed[0]
+    # a link is only kept once across the documents
+    assert " ".join(compressed).count("https://example.com/battery") == 1
+
+
+def test_textrank_only_ranks_the_best_candidates_of_large_inputs():
+    documents = [
+        " ".join(
+            f"Observation {d} notes that market {i % 17} grew in region {i % 23}."
+            for i in range(100)
+        )
+        for d in range(300)
+    ]
+    documents[150] += " Perovskite solar cells reached record efficiency."
+    compressor = ExtractiveCompressor(query_weight=0.8, max_candidates=500)
+    sizes = []
+    textrank = compressor._textrank
+
+    def recording_textrank(similarity):
+        sizes.append(similarity.shape)
+        return textrank(similarity)
+
+    with patch.object(compressor, "_textrank", recording_textrank):
+        compressed = compressor.compress(
+            documents, 500, query="perovskite solar efficiency"
+        )
+    # 30000 sentences, ranked in a 500 x 500 matrix
+    assert sizes == [(500, 500)]
+    assert sum(estimate_tokens(document) for document in compressed) <= 500
+    # the sentence about the query survives the pre-ranking
+    assert "Perovskite solar cells reached record efficiency." in compressed[150]
@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from itertools import combinations
+from pathlib import Path
+
+from src.utils.near_duplicates import NearDuplicateFilter, simhash
+
+EXAMPLES = sorted(Path(__file__).parents[3].joinpath("examples").glob("*.md"))
+
+
+def distance(a: str, b: str) -> int:
+    return bin(simhash(a) ^ simhash(b)).count("1")
+
+
+def mirror(text: str) -> str:
+    """The text as a mirror site shows it, within its own navigation."""
+    return f"Home | News | World Syndicated from our partners. {text} Share this story"
+
+
+def test_mirrors_are_close_and_other_pages_are_not():
+    texts = [path.read_text(encoding="utf-8") for path in EXAMPLES]
+    for text in texts:
+        assert distance(text, mirror(text)) <= 8
+        assert simhash(text) == simhash(text.upper())
+    assert min(distance(a, b) for a, b in combinations(texts, 2)) > 16
+    assert simhash("too short to tell apart") is None
+
+
+def test_filter_collapses_repeats_within_a_thread():
+    text = EXAMPLES[0].read_text(encoding="utf-8")
+    other = EXAMPLES[1].read_text(encoding="utf-8")
+    duplicate_filter = NearDuplicateFilter(max_distance=8)
+    assert duplicate_filter.check("t1", "https://a.com/news", text) is None
+    assert duplicate_filter.check("t1", "https://b.com/", other) is None
+    assert (
+        duplicate_filter.check("t1", "https://mirror.com/a", mirror(text))
+        == "https://a.com/news"
+    )
+    # the same page again, or in another thread, is up to the agent
+    assert duplicate_filter.check("t1", "https://a.com/news?utm_source=x", text) is None
+    assert duplicate_filter.check("t2", "https://mirror.com/a", mirror(text)) is None
+
+    assert duplicate_filter.stats("t1") == {
+        "checked": 4,
+        "duplicates": 1,
+        "duplicate_ratio": 0.25,
+    }
+    stats = duplicate_filter.stats()
+    assert stats["checked"] == 5
+    assert stats["duplicate_ratio"] == 0.2
+    assert set(stats["threads"]) == {"t1", "t2"}
+
+
+def test_oldest_pages_are_forgotten():
+    texts = [path.read_text(encoding="utf-8") for path in EXAMPLES[:3]]
+    duplicate_filter = NearDuplicateFilter(max_distance=8, max_pages=2)
+    for i, text in enumerate(texts):
+        duplicate_filter.check("t", f"https://{i}.com/", text)
+    assert duplicate_filter.check("t", "https://m.com/", mirror(texts[0])) is None
+    assert (
+        duplicate_filter.check("t", "https://m.com/2", mirror(texts[2]))
+        == "https://2.com/"
+    )